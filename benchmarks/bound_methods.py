@@ -0,0 +1,112 @@
+# encoding: utf8
+# -----------------------------------------------------------------------------
+# Project   : LambdaFactory
+# -----------------------------------------------------------------------------
+# Author    : Sebastien Pierre                               <sebastien@ffctn.com>
+# License   : Revised BSD License
+# -----------------------------------------------------------------------------
+# Creation  : 2026-10-19
+# Last mod  : 2026-10-19
+# -----------------------------------------------------------------------------
+
+"""Measures the allocations of methods given as values under Node.
+
+>   PYTHONPATH=dist python benchmarks/bound_methods.py [CALLS]
+
+The benchmark writes a class whose methods give one of its methods as a
+callback with the JavaScript writer, once binding the method on each access
+(the `CACHE_METHODS` writer option disabled) and once with the cached bound
+methods, and reports the bytes allocated and the time taken per call."""
+
+import os, sys, json, shutil, tempfile, subprocess
+from lambdafactory.main import Command
+
+RUNTIME_OOP = """
+module.exports = {Class:function(d){
+	var C=function(){if(d.properties){d.properties.call(this)};if(d.initialize){d.initialize.apply(this,arguments)}};
+	for (var k in (d.methods||{})){C.prototype[k]=d.methods[k]}
+	for (var k in (d.operations||{})){C[k]=d.operations[k]}
+	return C;
+}};
+"""
+
+DRIVER = """
+var m = require(process.argv[2]), calls = parseInt(process.argv[3]), res = {};
+var o = new m.Handler(), sink = new Array(1024), j = 0;
+// The callbacks are kept, like a UI library keeps its event handlers
+var xs = {forEach:function(f){sink[j++ & 1023] = f}};
+["callback", "each"].forEach(function(name){
+	for (var i=0;i<calls/10;i++){sink[i & 1023] = o[name](xs)}
+	global.gc();
+	var h = process.memoryUsage().heapUsed;
+	var t = process.hrtime.bigint();
+	for (var i=0;i<calls;i++){sink[i & 1023] = o[name](xs)}
+	t = Number(process.hrtime.bigint() - t);
+	res[name] = [(process.memoryUsage().heapUsed - h) / calls, t / calls];
+});
+console.log(JSON.stringify(res));
+"""
+
+def build( factory ):
+	"""Builds a program with a `Handler` class, whose `callback` method
+	returns its `handle` method and whose `each` method gives it to the
+	`forEach` method of its argument."""
+	F       = factory
+	program = F.createProgram()
+	module  = F.createModule("methods")
+	module.setSourcePath("methods.sjs")
+	program.addModule(module)
+	c = F.createClass("Handler")
+	c.setSlot("count", F._attr("count", None, F._number(0)))
+	handle = F.createMethod("handle", [F._param("x")])
+	handle.addOperation(F.assign(F.resolve(F._ref("count"), F._ref("self")), F.compute(F._op("+"), F.resolve(F._ref("count"), F._ref("self")), F._ref("x"))))
+	c.setSlot("handle", handle)
+	callback = F.createMethod("callback", [F._param("xs")])
+	callback.addOperation(F.returns(F._ref("handle")))
+	c.setSlot("callback", callback)
+	each = F.createMethod("each", [F._param("xs")])
+	each.addOperation(F.invoke(F.resolve(F._ref("forEach"), F._ref("xs")), F._ref("handle")))
+	c.setSlot("each", each)
+	module.setSlot("Handler", c)
+	return program
+
+def write( cache ):
+	"""Returns the JavaScript code for the benchmark module, with or without
+	caching the bound methods."""
+	command     = Command("lambdafactory")
+	environment = command.environment
+	program     = build(environment.getFactory())
+	environment.program = program
+	environment.options["umd"] = True
+	command.setupPasses("javascript", None, [])
+	environment.runPasses(program)
+	writer = command.getWriter("javascript")
+	writer.options["CACHE_METHODS"] = cache
+	return writer.run(program)
+
+def run( calls=200000 ):
+	path = tempfile.mkdtemp()
+	try:
+		os.makedirs(os.path.join(path, "node_modules"))
+		for name, content in (("node_modules/runtime.js", "module.exports = {};"), ("node_modules/runtime.oop.js", RUNTIME_OOP), ("driver.js", DRIVER)):
+			with open(os.path.join(path, name), "w") as f:
+				f.write(content)
+		results = {}
+		for mode, cache in (("bind", False), ("cached", True)):
+			module = os.path.join(path, mode + ".js")
+			with open(module, "w") as f:
+				f.write(str(write(cache)))
+			output = subprocess.check_output(["node", "--expose-gc", "--min-semi-space-size=64", "--max-semi-space-size=64", os.path.join(path, "driver.js"), module, str(calls)])
+			results[mode] = json.loads(output.decode("utf8"))
+		print("{0:10s} {1:>12s} {2:>12s} {3:>10s} {4:>10s}".format("method", "bytes/call", "cached", "ns/call", "cached"))
+		for name in results["bind"]:
+			a = results["bind"][name]
+			b = results["cached"][name]
+			print("{0:10s} {1:12.1f} {2:12.1f} {3:10.1f} {4:10.1f}".format(name, a[0], b[0], a[1], b[1]))
+	finally:
+		shutil.rmtree(path)
+
+if __name__ == "__main__":
+	run(*[int(_) for _ in sys.argv[1:]])
+
+# EOF - vim: ts=4 sw=4 noet
@@ -0,0 +1,102 @@
+# encoding: utf8
+# -----------------------------------------------------------------------------
+# Project   : LambdaFactory
+# -----------------------------------------------------------------------------
+# Author    : Sebastien Pierre                               <sebastien@ffctn.com>
+# License   : Revised BSD License
+# -----------------------------------------------------------------------------
+# Creation  : 2026-10-19
+# Last mod  : 2026-10-19
+# -----------------------------------------------------------------------------
+
+"""Compares UMD modules with a scope-hoisted bundle (`-D bundle`) under Node.
+
+>   PYTHONPATH=dist python benchmarks/bundle.py [MODULES] [FUNCTIONS] [CALLS]
+
+The benchmark writes a chain of modules, where each function calls the
+function of the same name in the next module, with the JavaScript writer,
+once as UMD modules (one file per module, loaded with `require`) and once
+as a single bundle. It reports the time taken to load the modules and to
+call the functions of the first module."""
+
+import os, sys, json, shutil, tempfile, subprocess
+from lambdafactory.main import Command
+
+DRIVER = """
+var t = process.hrtime.bigint();
+if (process.argv[2] == "bundle") {
+	global.window = global;
+	require("./bundle.js");
+	var m = window.m0;
+} else {
+	var m = require("m0");
+}
+var load = Number(process.hrtime.bigint() - t) / 1e6;
+var calls = parseInt(process.argv[3]), functions = parseInt(process.argv[4]), r = 0;
+t = process.hrtime.bigint();
+for (var i=0;i<calls;i++){r += m["f" + (i % functions)](i)}
+console.log(JSON.stringify([load, Number(process.hrtime.bigint() - t) / 1e6, r]));
+"""
+
+def build( factory, modules, functions ):
+	"""Builds a program of `modules` modules of `functions` functions, where
+	the functions of each module call the ones of the next module."""
+	F       = factory
+	program = F.createProgram()
+	for i in range(modules):
+		module = F.createModule("m{0}".format(i))
+		module.setSourcePath("m{0}.sjs".format(i))
+		program.addModule(module)
+		if i + 1 < modules:
+			module.addImportOperation(F.importModule("m{0}".format(i + 1), None))
+		for j in range(functions):
+			f = F.createFunction("f{0}".format(j), [F._param("x")])
+			if i + 1 < modules:
+				value = F.invoke(F.resolve(F._ref("f{0}".format(j)), F._ref("m{0}".format(i + 1))), F.compute(F._op("+"), F._ref("x"), F._number(1)))
+			else:
+				value = F._ref("x")
+			f.addOperation(F.returns(value))
+			module.setSlot(f.getName(), f)
+	return program
+
+def write( path, modules, functions, option ):
+	"""Writes the program in the given directory with the given module
+	type option."""
+	command     = Command("lambdafactory")
+	environment = command.environment
+	program     = build(environment.getFactory(), modules, functions)
+	environment.program = program
+	environment.options[option] = True
+	command.setupPasses("javascript", None, [])
+	environment.runPasses(program)
+	chunks = command.streamProgram(program, "javascript")
+	if option == "bundle":
+		with open(os.path.join(path, "bundle.js"), "w") as f:
+			f.write("\n".join(chunks))
+	else:
+		# Each module starts with a snip line giving its name
+		for text in chunks:
+			name = text.split("|", 1)[1].split("]", 1)[0]
+			with open(os.path.join(path, "node_modules", name + ".js"), "w") as f:
+				f.write(text)
+
+def run( modules=50, functions=20, calls=1000000 ):
+	print("{0:8s} {1:>10s} {2:>10s}".format("type", "load", "calls"))
+	for option in ("umd", "bundle"):
+		path = tempfile.mkdtemp()
+		try:
+			os.makedirs(os.path.join(path, "node_modules"))
+			for name, content in (("node_modules/runtime.js", "module.exports = {};"), ("node_modules/runtime.oop.js", "module.exports = {};"), ("driver.js", DRIVER)):
+				with open(os.path.join(path, name), "w") as f:
+					f.write(content)
+			write(path, modules, functions, option)
+			output = subprocess.check_output(["node", os.path.join(path, "driver.js"), option, str(calls), str(functions)], cwd=path)
+			load, elapsed, _ = json.loads(output.decode("utf8"))
+			print("{0:8s} {1:8.2f}ms {2:8.1f}ms".format(option, load, elapsed))
+		finally:
+			shutil.rmtree(path)
+
+if __name__ == "__main__":
+	run(*[int(_) for _ in sys.argv[1:]])
+
+# EOF - vim: ts=4 sw=4 noet
@@ -0,0 +1,85 @@
+# encoding: utf8
+# -----------------------------------------------------------------------------
+# Project   : LambdaFactory
+# -----------------------------------------------------------------------------
+# Author    : Sebastien Pierre                               <sebastien@ffctn.com>
+# License   : Revised BSD License
+# -----------------------------------------------------------------------------
+# Creation  : 2026-10-19
+# Last mod  : 2026-10-19
+# -----------------------------------------------------------------------------
+
+"""Measures the time taken by the dead code removal passes.
+
+>   PYTHONPATH=dist python benchmarks/dead_code.py [FUNCTIONS] [STEPS]
+
+The benchmark builds modules of increasing size (doubling the given number
+of functions at each step), where `main` reaches half of the functions
+through a tree of calls and the other half is never called. It reports the
+time taken by `CountReferences` and `RemoveDeadCode` (after the standard
+passes), and the size of the JavaScript output with and without the dead
+code."""
+
+import os, sys, time, tempfile
+from lambdafactory.main import Command
+import lambdafactory.passes as passes
+
+def build( factory, count ):
+	"""Builds a program with a `main` function that calls `count` live
+	functions, each calling the next two ones, and `count` dead functions
+	calling each other the same way."""
+	F       = factory
+	program = F.createProgram()
+	module  = F.createModule("app")
+	module.setSourcePath("app.sjs")
+	program.addModule(module)
+	main = F.createFunction("main", [F._param("x")])
+	main.addOperation(F.returns(F.invoke(F._ref("live0"), F._ref("x"))))
+	module.setSlot("main", main)
+	for prefix in ("live", "dead"):
+		for i in range(count):
+			f = F.createFunction("{0}{1}".format(prefix, i), [F._param("x")])
+			for j in (2 * i + 1, 2 * i + 2):
+				if j < count:
+					f.addOperation(F.invoke(F._ref("{0}{1}".format(prefix, j)), F.compute(F._op("+"), F._ref("x"), F._number(j))))
+			f.addOperation(F.returns(F._ref("x")))
+			module.setSlot(f.getName(), f)
+	return program
+
+def measure( count, entries ):
+	"""Returns the time taken by the dead code passes on a program of
+	`count` live and `count` dead functions, and the size of the
+	JavaScript output before and after."""
+	command     = Command("lambdafactory")
+	environment = command.environment
+	program     = build(environment.getFactory(), count)
+	environment.program = program
+	command.setupPasses("javascript", None, [])
+	environment.runPasses(program)
+	before  = len(command.writeProgram(program, "javascript"))
+	started = time.time()
+	for p in (passes.CountReferences(), passes.RemoveDeadCode()):
+		p.setEnvironment(environment)
+		p.setOptions({"entryPoints":entries})
+		p.run(program)
+	elapsed = time.time() - started
+	after   = len(command.writeProgram(program, "javascript"))
+	return elapsed, before, after
+
+def run( count=250, steps=4 ):
+	fd, entries = tempfile.mkstemp(suffix=".entrypoints")
+	with os.fdopen(fd, "w") as f:
+		f.write("app.main\n")
+	try:
+		print("{0:>10s} {1:>10s} {2:>12s} {3:>10s} {4:>10s}".format("functions", "time", "us/function", "size", "live size"))
+		for step in range(steps):
+			n = count * (2 ** step)
+			elapsed, before, after = measure(n, entries)
+			print("{0:10d} {1:9.3f}s {2:12.1f} {3:10d} {4:10d}".format(2 * n + 1, elapsed, elapsed * 1e6 / (2 * n + 1), before, after))
+	finally:
+		os.unlink(entries)
+
+if __name__ == "__main__":
+	run(*[int(_) for _ in sys.argv[1:]])
+
+# EOF - vim: ts=4 sw=4 noet
@@ -0,0 +1,56 @@
+# encoding: utf8
+# -----------------------------------------------------------------------------
+# Project   : LambdaFactory
+# -----------------------------------------------------------------------------
+# Author    : Sebastien Pierre                               <sebastien@ffctn.com>
+# License   : Revised BSD License
+# -----------------------------------------------------------------------------
+# Creation  : 2026-10-19
+# Last mod  : 2026-10-19
+# -----------------------------------------------------------------------------
+
+"""Measures how many program model elements per second the factory creates.
+
+>   PYTHONPATH=dist python benchmarks/factory_throughput.py [FUNCTIONS] [RUNS]
+
+The benchmark builds the same kind of functions as `model_memory.py`, using
+the factory in the same way as a parser would, and reports the best of the
+given number of runs."""
+
+import sys, time
+from lambdafactory.modelbase import Factory
+
+def build( factory, count ):
+	"""Builds a module with `count` functions and returns the number of
+	elements that were created."""
+	module = factory.createModule("benchmark")
+	nodes  = 1
+	for i in range(count):
+		f = factory.createFunction("f{0}".format(i), [factory._param("a"), factory._param("b")])
+		f.addOperation(factory.allocate(factory._slot("c"), factory.compute(factory._op("+"), factory._ref("a"), factory._number(i))))
+		f.addOperation(factory.invoke(factory.resolve(factory._ref("log"), factory._ref("console")), factory._ref("c"), factory._string("c")))
+		f.addOperation(factory.returns(factory._list(factory._ref("c"), factory._ref("b"), factory._number(0))))
+		module.setSlot(f.getName(), f)
+		# function + 2 params + (allocation, slot, computation, op, ref, number)
+		# + (invocation, resolution, 2 refs, 2 arguments, ref, string)
+		# + (termination, list, 2 refs, number)
+		nodes += 1 + 2 + 6 + 8 + 5
+	return nodes
+
+def run( count=10000, runs=5 ):
+	best  = None
+	nodes = 0
+	for _ in range(runs):
+		factory = Factory()
+		started = time.time()
+		nodes   = build(factory, count)
+		elapsed = time.time() - started
+		best    = elapsed if best is None else min(best, elapsed)
+	print("elements       : {0}".format(nodes))
+	print("best time      : {0:.3f}s".format(best))
+	print("elements/s     : {0:.0f}".format(nodes / best))
+
+if __name__ == "__main__":
+	run(*[int(_) for _ in sys.argv[1:]])
+
+# EOF - vim: ts=4 sw=4 noet
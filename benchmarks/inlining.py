@@ -0,0 +1,113 @@
+# encoding: utf8
+# -----------------------------------------------------------------------------
+# Project   : LambdaFactory
+# -----------------------------------------------------------------------------
+# Author    : Sebastien Pierre                               <sebastien@ffctn.com>
+# License   : Revised BSD License
+# -----------------------------------------------------------------------------
+# Creation  : 2026-10-19
+# Last mod  : 2026-10-19
+# -----------------------------------------------------------------------------
+
+"""Measures the speedup of the `Inlining` pass on small helper functions.
+
+>   PYTHONPATH=dist python benchmarks/inlining.py [CALLS]
+
+The benchmark writes a module of functions that combine small helpers with
+the Python and JavaScript writers, once with the standard passes and once
+with `-P std,Inlining`, and reports the time taken by the given number of
+calls to each function, with Python and with `node`."""
+
+import os, sys, json, time, shutil, tempfile, subprocess, importlib
+from lambdafactory.main import Command
+
+FUNCTIONS = ("norm", "lerp", "clamped")
+
+DRIVER = """
+var m = require(process.argv[2]), calls = parseInt(process.argv[3]), res = {};
+%s.forEach(function(name){
+	var f = m[name], s = 0;
+	for (var i=0;i<calls/10;i++){s += f(i, 2)}
+	var t = process.hrtime.bigint();
+	for (var i=0;i<calls;i++){s += f(i, 2)}
+	res[name] = Number(process.hrtime.bigint() - t) / 1e6;
+});
+console.log(JSON.stringify(res));
+""" % (json.dumps(FUNCTIONS))
+
+def build( factory ):
+	"""Builds a program with a module of helpers (`add`, `mul`, `square`,
+	`clamp`) and of the functions that use them."""
+	F       = factory
+	program = F.createProgram()
+	module  = F.createModule("helpers")
+	module.setSourcePath("helpers.sjs")
+	program.addModule(module)
+	r, n    = F._ref, F._number
+	op      = lambda o, a, b: F.compute(F._op(o), a, b)
+	call    = lambda name, *args: F.invoke(r(name), *args)
+	def function( name, params, value ):
+		f = F.createFunction(name, [F._param(_) for _ in params])
+		f.addOperation(F.returns(value))
+		module.setSlot(name, f)
+	function("add",     ["a", "b"], op("+", r("a"), r("b")))
+	function("mul",     ["a", "b"], op("*", r("a"), r("b")))
+	function("square",  ["a"],      op("*", r("a"), r("a")))
+	function("min",     ["a", "b"], op("-", r("a"), op("*", op("-", r("a"), r("b")), op(">", r("a"), r("b")))))
+	function("clamp",   ["a", "b"], call("min", r("a"), r("b")))
+	function("norm",    ["x", "y"], call("add", call("square", r("x")), call("square", r("y"))))
+	function("lerp",    ["x", "y"], call("add", r("x"), call("mul", op("-", r("y"), r("x")), n(0.5))))
+	function("clamped", ["x", "y"], call("clamp", call("add", r("x"), r("y")), n(1000)))
+	return program
+
+def write( language, passes ):
+	"""Returns the code for the benchmark module, written in the given
+	language after the given passes."""
+	command     = Command("lambdafactory")
+	environment = command.environment
+	program     = build(environment.getFactory())
+	environment.program = program
+	if language == "javascript":
+		environment.options["umd"] = True
+	command.setupPasses(language, passes, [])
+	environment.runPasses(program)
+	return command.writeProgram(program, language)
+
+def run( calls=1000000 ):
+	path = tempfile.mkdtemp()
+	try:
+		os.makedirs(os.path.join(path, "node_modules"))
+		for name, content in (("node_modules/runtime.js", "module.exports = {};"), ("node_modules/runtime.oop.js", "module.exports = {};"), ("driver.js", DRIVER)):
+			with open(os.path.join(path, name), "w") as f:
+				f.write(content)
+		sys.path.insert(0, path)
+		results = {}
+		for mode, passes in (("calls", None), ("inlined", ["std", "Inlining"])):
+			with open(os.path.join(path, mode + ".py"), "w") as f:
+				f.write(write("python", passes))
+			module  = importlib.import_module(mode)
+			results[("python", mode)] = timings = {}
+			for name in FUNCTIONS:
+				f = getattr(module, name)
+				started = time.time()
+				for i in range(calls):
+					f(i, 2)
+				timings[name] = (time.time() - started) * 1000.0
+			script = os.path.join(path, mode + ".js")
+			with open(script, "w") as f:
+				f.write(write("javascript", passes))
+			output = subprocess.check_output(["node", os.path.join(path, "driver.js"), script, str(calls)])
+			results[("javascript", mode)] = json.loads(output.decode("utf8"))
+		print("{0:12s} {1:10s} {2:>12s} {3:>12s} {4:>8s}".format("language", "function", "calls", "inlined", "speedup"))
+		for language in ("python", "javascript"):
+			for name in FUNCTIONS:
+				a = results[(language, "calls")][name]
+				b = results[(language, "inlined")][name]
+				print("{0:12s} {1:10s} {2:10.1f}ms {3:10.1f}ms {4:7.1f}x".format(language, name, a, b, a / b))
+	finally:
+		shutil.rmtree(path)
+
+if __name__ == "__main__":
+	run(*[int(_) for _ in sys.argv[1:]])
+
+# EOF - vim: ts=4 sw=4 noet
@@ -0,0 +1,163 @@
+# encoding: utf8
+# -----------------------------------------------------------------------------
+# Project   : LambdaFactory
+# -----------------------------------------------------------------------------
+# Author    : Sebastien Pierre                               <sebastien@ffctn.com>
+# License   : Revised BSD License
+# -----------------------------------------------------------------------------
+# Creation  : 2026-10-19
+# Last mod  : 2026-10-19
+# -----------------------------------------------------------------------------
+
+"""Measures the interning of `typecast` types.
+
+>   PYTHONPATH=dist python benchmarks/interned_types.py [FUNCTIONS] [COMPARISONS]
+
+The benchmark builds a module of `FUNCTIONS` functions with a varying
+number of parameters and `FUNCTIONS/10` classes with attributes and methods,
+and types all of its elements, once the way `modeltypes.typeForValue` did
+before interning (cloning a template type for each value) and once with
+`modeltypes.typeForValue`, reporting the time taken, the memory allocated
+and the number of distinct type objects created.
+
+It then times the given number of `isLike` and `isSubtypeOf` comparisons
+between two nested array and process types, once with fresh (not interned)
+types and once with interned types, which are the same object and whose
+comparisons are memoized."""
+
+import sys, time, tracemalloc
+from lambdafactory.main import Command
+from lambdafactory import typecast, modeltypes, interfaces
+
+def build( factory, functions ):
+	"""Builds a program with a module of `functions` functions, that take
+	from zero to three parameters, and `functions/10` classes with a number,
+	string, list and map attribute and five methods."""
+	F       = factory
+	program = F.createProgram()
+	module  = F.createModule("functions")
+	module.setSourcePath("functions.sjs")
+	program.addModule(module)
+	for i in range(functions):
+		f = F.createFunction("f%d" % (i), [F._param("p%d" % (_)) for _ in range(i % 4)])
+		f.addOperation(F.returns(F._number(i)))
+		module.setSlot(f.getName(), f)
+	for i in range(functions // 10):
+		c = F.createClass("C%d" % (i))
+		c.setSlot("number", F._attr("number", None, F._number(i)))
+		c.setSlot("string", F._attr("string", None, F._string("c%d" % (i))))
+		c.setSlot("list",   F._attr("list",   None, F._list()))
+		c.setSlot("map",    F._attr("map",    None, F._dict()))
+		for j in range(5):
+			m = F.createMethod("m%d" % (j), [F._param("p%d" % (_)) for _ in range(j % 3)])
+			m.addOperation(F.returns(F._number(j)))
+			c.setSlot(m.getName(), m)
+		module.setSlot(c.getName(), c)
+	return program
+
+def cloned( value, noneIs=modeltypes.Nothing ):
+	"""Returns the type of the given value the way `modeltypes.typeForValue`
+	did before types were interned: each value gets a clone of a template
+	type, or a new type for data values."""
+	M   = modeltypes
+	res = None
+	if value is None:
+		return noneIs
+	if hasattr(value, "_lf_type"): return value._lf_type
+	if isinstance(value, interfaces.IOperation) or isinstance(value, interfaces.IReference) or isinstance(value, interfaces.INumber):
+		res = M.Any
+	elif isinstance(value, interfaces.IModule):
+		res = M.Structure.Module.clone()
+	elif isinstance(value, interfaces.IClass):
+		res = M.Structure.Class.clone()
+		res.setName(value.getName())
+	elif isinstance(value, interfaces.IClosure):
+		res = typecast.Process()
+		for arg in value.getArguments():
+			res.add(cloned(arg, M.Any))
+		res.add(M.Any)
+	elif isinstance(value, interfaces.IArgument) or isinstance(value, interfaces.IParameter) or isinstance(value, interfaces.IAttribute):
+		res = cloned(value.getDefaultValue(), M.Any)
+	elif isinstance(value, interfaces.IList):
+		res = typecast.Array(M.Any)
+	elif isinstance(value, interfaces.IDict):
+		res = typecast.Map()
+	elif isinstance(value, interfaces.IString):
+		res = typecast.Array(M.Data.Char)
+	if res is None:
+		return
+	value._lf_type = res
+	if isinstance(res, typecast.Context):
+		for slot in value.getSlots():
+			res.set(slot[0], cloned(slot[1]))
+	return res
+
+def types( typeFor, value, found=None ):
+	"""Types the given value and its slots (recursively) with `typeFor`,
+	returning the distinct type objects found in the resulting types."""
+	found = {} if found is None else found
+	res   = typeFor(value)
+	if res is not None and id(res) not in found:
+		found[id(res)] = res
+		for element in (list(res._elements.values()) if isinstance(res, typecast.Map) else res._elements if isinstance(res, typecast.Process) else ()):
+			found.setdefault(id(element), element)
+	if isinstance(value, interfaces.IContext):
+		for slot in value.getSlots():
+			types(typeFor, slot[1], found)
+	return found
+
+def typing( factory, typeFor, functions ):
+	"""Returns the time taken to type a fresh program with `typeFor`, the
+	memory allocated by a second typing of another fresh program and the
+	number of distinct types created."""
+	program = build(factory, functions)
+	started = time.time()
+	for module in program.getModules():
+		types(typeFor, module)
+	elapsed = (time.time() - started) * 1000.0
+	program = build(factory, functions)
+	tracemalloc.start()
+	before  = tracemalloc.get_traced_memory()[0]
+	found   = {}
+	for module in program.getModules():
+		types(typeFor, module, found)
+	memory  = (tracemalloc.get_traced_memory()[0] - before) / 1024.0
+	tracemalloc.stop()
+	return elapsed, memory, len(found)
+
+def nested( make, depth ):
+	"""Returns a process type taking arrays nested `depth` times, created
+	with the given `make` function."""
+	res = modeltypes.Data.Number
+	for i in range(depth):
+		res = make(typecast.Array(res))
+	return make(typecast.Process(res, res, res))
+
+def compare( make, comparisons ):
+	"""Returns the time taken to create a pair of nested types with the
+	given `make` function, and the time taken by the comparisons between
+	them."""
+	started = time.time()
+	a, b    = nested(make, 8), nested(make, 8)
+	created = time.time()
+	for i in range(comparisons):
+		a.isLike(b) and a.isSubtypeOf(b)
+	return (created - started) * 1000.0, (time.time() - created) * 1000.0
+
+def run( functions=1000, comparisons=10000 ):
+	factory  = Command("lambdafactory").environment.getFactory()
+	before   = typing(factory, cloned, functions)
+	after    = typing(factory, modeltypes.typeForValue, functions)
+	print("{0:12s} {1:>12s} {2:>12s} {3:>8s}".format("typing", "cloned", "interned", "ratio"))
+	for i, (step, unit) in enumerate((("time", "ms"), ("memory", "KB"), ("types", ""))):
+		print("{0:12s} {1:10.1f}{3:2s} {2:10.1f}{3:2s} {4:7.1f}x".format(step, before[i], after[i], unit, before[i] / after[i]))
+	fresh    = compare(lambda _: _, comparisons)
+	interned = compare(typecast.intern, comparisons)
+	print("{0:12s} {1:>12s} {2:>12s} {3:>8s}".format("step", "fresh", "interned", "speedup"))
+	for i, step in enumerate(("creation", "comparison")):
+		print("{0:12s} {1:10.3f}ms {2:10.3f}ms {3:7.1f}x".format(step, fresh[i], interned[i], fresh[i] / interned[i]))
+
+if __name__ == "__main__":
+	run(*[int(_) for _ in sys.argv[1:]])
+
+# EOF - vim: ts=4 sw=4 noet
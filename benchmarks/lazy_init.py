@@ -0,0 +1,88 @@
+# encoding: utf8
+# -----------------------------------------------------------------------------
+# Project   : LambdaFactory
+# -----------------------------------------------------------------------------
+# Author    : Sebastien Pierre                               <sebastien@ffctn.com>
+# License   : Revised BSD License
+# -----------------------------------------------------------------------------
+# Creation  : 2026-10-19
+# Last mod  : 2026-10-19
+# -----------------------------------------------------------------------------
+
+"""Measures the start-up time saved by `-D lazy` under Node.
+
+>   PYTHONPATH=dist python benchmarks/lazy_init.py [MODULES] [USED] [ITEMS]
+
+The benchmark writes a bundle of modules whose init fills a table of the
+given number of items, where each module imports the first one, with the
+JavaScript writer, once initializing every module when loaded and once with
+the lazy initialization. It then reports the time taken to load the bundle,
+and to load it and use the given number of modules."""
+
+import os, sys, json, shutil, tempfile, subprocess
+from lambdafactory.main import Command
+from lambdafactory import interfaces
+
+DRIVER = """
+global.window = global;
+var t = process.hrtime.bigint();
+require("./bundle.js");
+var load = Number(process.hrtime.bigint() - t) / 1e6;
+for (var i=1;i<=parseInt(process.argv[2]);i++){window["m" + i].get()}
+console.log(JSON.stringify([load, Number(process.hrtime.bigint() - t) / 1e6]));
+"""
+
+def build( factory, modules, items ):
+	"""Builds a program of `modules` modules, whose init fills a table of
+	`items` items, and which all import the first module."""
+	F       = factory
+	program = F.createProgram()
+	for i in range(modules):
+		module = F.createModule("m{0}".format(i))
+		module.setSourcePath("m{0}.sjs".format(i))
+		program.addModule(module)
+		if i > 0:
+			module.addImportOperation(F.importModule("m0", None))
+		module.setSlot("TABLE", F._moduleattr("TABLE", None, F._dict()))
+		init = F.createFunction(interfaces.Constants.ModuleInit, [])
+		init.addOperation(F.iterate(F.enumerate(F._number(0), F._number(items)), F.createClosure([F._param("x")],
+			F.assign(F.access(F._ref("TABLE"), F.compute(F._op("+"), F._string("k"), F._ref("x"))), F.compute(F._op("*"), F._ref("x"), F._ref("x")))
+		)))
+		module.setSlot(init.getName(), init)
+		get = F.createFunction("get", [])
+		get.addOperation(F.returns(F.access(F._ref("TABLE"), F._string("k1"))))
+		module.setSlot(get.getName(), get)
+	return program
+
+def write( path, modules, items, options ):
+	"""Writes the bundle of the program in the given directory, with the
+	given environment options."""
+	command     = Command("lambdafactory")
+	environment = command.environment
+	program     = build(environment.getFactory(), modules, items)
+	environment.program = program
+	for name in ("bundle",) + options:
+		environment.options[name] = True
+	command.setupPasses("javascript", None, [])
+	environment.runPasses(program)
+	with open(os.path.join(path, "bundle.js"), "w") as f:
+		f.write(command.writeProgram(program, "javascript"))
+
+def run( modules=200, used=5, items=2000 ):
+	print("{0:8s} {1:>10s} {2:>12s}".format("init", "load", "load+used"))
+	for mode, options in (("eager", ()), ("lazy", ("lazy",))):
+		path = tempfile.mkdtemp()
+		try:
+			with open(os.path.join(path, "driver.js"), "w") as f:
+				f.write(DRIVER)
+			write(path, modules, items, options)
+			output = subprocess.check_output(["node", os.path.join(path, "driver.js"), str(used)], cwd=path)
+			load, used_time = json.loads(output.decode("utf8"))
+			print("{0:8s} {1:8.2f}ms {2:10.2f}ms".format(mode, load, used_time))
+		finally:
+			shutil.rmtree(path)
+
+if __name__ == "__main__":
+	run(*[int(_) for _ in sys.argv[1:]])
+
+# EOF - vim: ts=4 sw=4 noet
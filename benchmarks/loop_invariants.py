@@ -0,0 +1,128 @@
+# encoding: utf8
+# -----------------------------------------------------------------------------
+# Project   : LambdaFactory
+# -----------------------------------------------------------------------------
+# Author    : Sebastien Pierre                               <sebastien@ffctn.com>
+# License   : Revised BSD License
+# -----------------------------------------------------------------------------
+# Creation  : 2026-10-19
+# Last mod  : 2026-10-19
+# -----------------------------------------------------------------------------
+
+"""Measures the speedup of the `HoistLoopInvariants` pass on loops.
+
+>   PYTHONPATH=dist python benchmarks/loop_invariants.py [ITEMS] [CALLS]
+
+The benchmark writes a class whose methods loop over `ITEMS` values while
+resolving `self.conf.*` chains and module slots, with the Python and
+JavaScript writers, once with the standard passes and once with
+`-P std,HoistLoopInvariants`, and reports the time taken by the given
+number of calls to each method, with Python and with `node`."""
+
+import os, sys, json, time, types, shutil, tempfile, subprocess, importlib
+from lambdafactory.main import Command
+from bound_methods import RUNTIME_OOP
+
+METHODS = ("repeat", "iterate")
+
+DRIVER = """
+var m = require(process.argv[2]), items = parseInt(process.argv[3]), calls = parseInt(process.argv[4]), res = {};
+var o = new m.Counter(), xs = [];
+o.conf = {limit:items, scale:2, offset:1};
+for (var i=0;i<items;i++){xs.push(i)}
+%s.forEach(function(name){
+	for (var i=0;i<calls/10;i++){o[name](xs)}
+	var t = process.hrtime.bigint();
+	for (var i=0;i<calls;i++){o[name](xs)}
+	res[name] = Number(process.hrtime.bigint() - t) / 1e6;
+});
+console.log(JSON.stringify(res));
+""" % (json.dumps(METHODS))
+
+def build( factory ):
+	"""Builds a program with a `Counter` class, whose `repeat` method loops
+	while `i < self.conf.limit` and whose `iterate` method iterates over its
+	argument, both accumulating values scaled by `self.conf.scale`, shifted
+	by `self.conf.offset` and weighted by the `WEIGHT` module slot."""
+	F       = factory
+	program = F.createProgram()
+	module  = F.createModule("counters")
+	module.setSourcePath("counters.sjs")
+	program.addModule(module)
+	r, n    = F._ref, F._number
+	op      = lambda o, a, b: F.compute(F._op(o), a, b)
+	conf    = lambda name: F.resolve(r(name), F.resolve(r("conf"), r("self")))
+	term    = lambda x: op("*", op("+", op("*", x, conf("scale")), conf("offset")), r("WEIGHT"))
+	module.setSlot("WEIGHT", F._moduleattr("WEIGHT", None, n(3)))
+	c = F.createClass("Counter")
+	c.setSlot("conf", F._attr("conf", None, F._dict()))
+	repeat = F.createMethod("repeat", [F._param("xs")])
+	repeat.addOperation(F.allocate(F._slot("i"), n(0)))
+	repeat.addOperation(F.allocate(F._slot("t"), n(0)))
+	repeat.addOperation(F.repeat(op("<", r("i"), conf("limit")), F.createBlock(
+		F.assign(r("t"), op("+", r("t"), term(r("i")))),
+		F.assign(r("i"), op("+", r("i"), n(1))),
+	)))
+	repeat.addOperation(F.returns(r("t")))
+	c.setSlot("repeat", repeat)
+	iterate = F.createMethod("iterate", [F._param("xs")])
+	iterate.addOperation(F.allocate(F._slot("t"), n(0)))
+	iterate.addOperation(F.iterate(r("xs"), F.createClosure([F._param("x")], F.assign(r("t"), op("+", r("t"), term(r("x")))))))
+	iterate.addOperation(F.returns(r("t")))
+	c.setSlot("iterate", iterate)
+	module.setSlot("Counter", c)
+	return program
+
+def write( language, passes ):
+	"""Returns the code for the benchmark module, written in the given
+	language after the given passes."""
+	command     = Command("lambdafactory")
+	environment = command.environment
+	program     = build(environment.getFactory())
+	environment.program = program
+	if language == "javascript":
+		environment.options["umd"] = True
+	command.setupPasses(language, passes, [])
+	environment.runPasses(program)
+	return command.writeProgram(program, language)
+
+def run( items=1000, calls=1000 ):
+	path = tempfile.mkdtemp()
+	try:
+		os.makedirs(os.path.join(path, "node_modules"))
+		for name, content in (("node_modules/runtime.js", "module.exports = {};"), ("node_modules/runtime.oop.js", RUNTIME_OOP), ("driver.js", DRIVER)):
+			with open(os.path.join(path, name), "w") as f:
+				f.write(content)
+		sys.path.insert(0, path)
+		xs      = list(range(items))
+		results = {}
+		for mode, passes in (("plain", None), ("hoisted", ["std", "HoistLoopInvariants"])):
+			with open(os.path.join(path, mode + ".py"), "w") as f:
+				f.write(write("python", passes))
+			counter = importlib.import_module(mode).Counter()
+			counter.conf = types.SimpleNamespace(limit=items, scale=2, offset=1)
+			results[("python", mode)] = timings = {}
+			for name in METHODS:
+				method  = getattr(counter, name)
+				started = time.time()
+				for i in range(calls):
+					method(xs)
+				timings[name] = (time.time() - started) * 1000.0
+			script = os.path.join(path, mode + ".js")
+			with open(script, "w") as f:
+				f.write(write("javascript", passes))
+			output = subprocess.check_output(["node", os.path.join(path, "driver.js"), script, str(items), str(calls)])
+			results[("javascript", mode)] = json.loads(output.decode("utf8"))
+		print("{0:12s} {1:10s} {2:>12s} {3:>12s} {4:>8s}".format("language", "method", "plain", "hoisted", "speedup"))
+		for language in ("python", "javascript"):
+			for name in METHODS:
+				a = results[(language, "plain")][name]
+				b = results[(language, "hoisted")][name]
+				print("{0:12s} {1:10s} {2:10.1f}ms {3:10.1f}ms {4:7.1f}x".format(language, name, a, b, a / b))
+	finally:
+		shutil.rmtree(path)
+
+if __name__ == "__main__":
+	run(*[int(_) for _ in sys.argv[1:]])
+
+# EOF - vim: ts=4 sw=4 noet
@@ -0,0 +1,62 @@
+# encoding: utf8
+# -----------------------------------------------------------------------------
+# Project   : LambdaFactory
+# -----------------------------------------------------------------------------
+# Author    : Sebastien Pierre                               <sebastien@ffctn.com>
+# License   : Revised BSD License
+# -----------------------------------------------------------------------------
+# Creation  : 2026-10-19
+# Last mod  : 2026-10-19
+# -----------------------------------------------------------------------------
+
+"""Measures the memory footprint of program model elements using `tracemalloc`.
+
+Run it with the `dist` directory (or any other build of LambdaFactory) in the
+Python path:
+
+>   PYTHONPATH=dist python benchmarks/model_memory.py [FUNCTIONS]
+
+The benchmark creates a module with the given number of functions, each
+made of a typical mix of operations and values, and reports the number of
+bytes allocated per model element."""
+
+import sys, tracemalloc
+from lambdafactory.modelbase import Factory
+
+def build( factory, count ):
+	"""Builds a module with `count` functions, and returns the module along
+	with the number of elements that were created."""
+	module = factory.createModule("benchmark")
+	module.setSourcePath("benchmark.sjs")
+	nodes  = 1
+	for i in range(count):
+		f = factory.createFunction("f{0}".format(i), [factory._param("a"), factory._param("b")])
+		f.setSourcePath("benchmark.sjs")
+		f.setOffset(i * 10, i * 10 + 9)
+		f.addOperation(factory.allocate(factory._slot("c"), factory.compute(factory._op("+"), factory._ref("a"), factory._number(i))))
+		f.addOperation(factory.invoke(factory.resolve(factory._ref("log"), factory._ref("console")), factory._ref("c"), factory._string("c")))
+		f.addOperation(factory.returns(factory.compute(factory._op("*"), factory._ref("c"), factory._ref("b"))))
+		module.setSlot(f.getName(), f)
+		# function + 2 params + (allocation, slot, computation, op, ref, number)
+		# + (invocation, resolution, 2 refs, ref, string) + (termination,
+		# computation, op, 2 refs)
+		nodes += 1 + 2 + 6 + 6 + 5
+	return module, nodes
+
+def run( count=10000 ):
+	factory = Factory()
+	tracemalloc.start()
+	before = tracemalloc.take_snapshot()
+	module, nodes = build(factory, count)
+	after  = tracemalloc.take_snapshot()
+	tracemalloc.stop()
+	size   = sum(_.size_diff for _ in after.compare_to(before, "filename"))
+	print("elements       : {0}".format(nodes))
+	print("allocated      : {0:.1f}MB".format(size / 1024.0 / 1024.0))
+	print("bytes/element  : {0:.1f}".format(float(size) / nodes))
+	return module
+
+if __name__ == "__main__":
+	run(*[int(_) for _ in sys.argv[1:]])
+
+# EOF - vim: ts=4 sw=4 noet
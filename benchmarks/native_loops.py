@@ -0,0 +1,119 @@
+# encoding: utf8
+# -----------------------------------------------------------------------------
+# Project   : LambdaFactory
+# -----------------------------------------------------------------------------
+# Author    : Sebastien Pierre                               <sebastien@ffctn.com>
+# License   : Revised BSD License
+# -----------------------------------------------------------------------------
+# Creation  : 2026-10-19
+# Last mod  : 2026-10-19
+# -----------------------------------------------------------------------------
+
+"""Measures the speedup of native loops over runtime iterations under Node.
+
+>   PYTHONPATH=dist python benchmarks/native_loops.py [ITEMS] [CALLS]
+
+The benchmark writes a module of map, filter, reduce and iterate expressions
+over enumerations and list literals with the JavaScript writer, once with the
+native loops and once with `-D iterate` (which keeps the runtime functions),
+and runs both with `node`. The runtime functions are provided by a stand-in
+that dispatches on the type of the iterated value, like the actual runtime
+does."""
+
+import os, sys, json, shutil, tempfile, subprocess
+from lambdafactory.main import Command
+
+RUNTIME = """
+function each(v,f){
+	if (v instanceof Array) {for (var i=0;i<v.length;i++){f(v[i],i)}}
+	else if (v instanceof Object) {for (var k in v){f(v[k],k)}}
+}
+module.exports = {
+	module:function(n){return {}},
+	__range__:function(a,b){var r=[];for(var i=a;i<b;i++){r.push(i)};return r},
+	__map__:function(v,f){var r=[];each(v,function(x,i){r.push(f(x,i))});return r},
+	__filter__:function(v,f){var r=[];each(v,function(x,i){if(f(x,i)){r.push(x)}});return r},
+	__reduce__:function(v,f,r){var s=r===undefined;each(v,function(x,i){if(s){r=x;s=false}else{r=f(r,x,i)}});return r},
+	__iterate__:function(v,f){each(v,f)},
+	__access__:function(t,i){return typeof(i)!='number'?t[i]:i<0&&(typeof(t)=='string'||t instanceof Array)?t[t.length+i]:t[i]},
+};
+"""
+
+DRIVER = """
+var m = require(process.argv[2]), calls = parseInt(process.argv[3]), res = {};
+["mapped", "filtered", "reduced", "iterated", "literal"].forEach(function(name){
+	var f = m[name];
+	for (var i=0;i<calls/10;i++){f()}
+	var t = process.hrtime.bigint();
+	for (var i=0;i<calls;i++){f()}
+	res[name] = Number(process.hrtime.bigint() - t) / 1e6;
+});
+console.log(JSON.stringify(res));
+"""
+
+def build( factory, items ):
+	"""Builds a program with a module of functions that iterate over `items`
+	elements."""
+	F       = factory
+	program = F.createProgram()
+	module  = F.createModule("loops")
+	module.setSourcePath("loops.sjs")
+	program.addModule(module)
+	def function( name, *operations ):
+		f = F.createFunction(name, [])
+		for _ in operations: f.addOperation(_)
+		module.setSlot(name, f)
+	def closure( params, *operations ):
+		return F.createClosure([F._param(_) for _ in params], *operations)
+	values = lambda: F.enumerate(F._number(0), F._number(items))
+	op     = lambda o, a, b: F.compute(F._op(o), a, b)
+	function("mapped", F.returns(F.map(values(), closure(["x"], F.returns(op("*", F._ref("x"), F._number(2)))))))
+	function("filtered", F.returns(F.filter(values(), closure(["x"], F.returns(op(">", op("%", F._ref("x"), F._number(3)), F._number(0)))))))
+	function("reduced", F.returns(F.reduce(values(), closure(["a", "b"], F.returns(op("+", F._ref("a"), F._ref("b")))), F._number(0))))
+	function("iterated",
+		F.allocate(F._slot("t"), F._number(0)),
+		F.allocate(F._slot("_"), F.iterate(values(), closure(["x"], F.assign(F._ref("t"), op("+", F._ref("t"), F._ref("x")))))),
+		F.returns(F._ref("t"))
+	)
+	function("literal", F.returns(F.map(F._list(*[F._number(_) for _ in range(16)]), closure(["x", "i"], F.returns(op("+", F._ref("x"), F._ref("i")))))))
+	return program
+
+def write( items, options ):
+	"""Returns the JavaScript code for the benchmark module, written with
+	the given environment options."""
+	command     = Command("lambdafactory")
+	environment = command.environment
+	program     = build(environment.getFactory(), items)
+	environment.program = program
+	for name in ("umd",) + options:
+		environment.options[name] = True
+	command.setupPasses("javascript", None, [])
+	environment.runPasses(program)
+	return command.writeProgram(program, "javascript")
+
+def run( items=1000, calls=20000 ):
+	path = tempfile.mkdtemp()
+	try:
+		os.makedirs(os.path.join(path, "node_modules"))
+		for name, content in (("runtime.js", RUNTIME), ("runtime.oop.js", "module.exports = {};"), ("driver.js", DRIVER)):
+			with open(os.path.join(path, "node_modules" if name.startswith("runtime") else "", name), "w") as f:
+				f.write(content)
+		results = {}
+		for mode, options in (("runtime", ("iterate",)), ("native", ())):
+			module = os.path.join(path, mode + ".js")
+			with open(module, "w") as f:
+				f.write(write(items, options))
+			output = subprocess.check_output(["node", os.path.join(path, "driver.js"), module, str(calls)])
+			results[mode] = json.loads(output.decode("utf8"))
+		print("{0:10s} {1:>12s} {2:>12s} {3:>8s}".format("function", "runtime", "native", "speedup"))
+		for name in results["runtime"]:
+			a = results["runtime"][name]
+			b = results["native"][name]
+			print("{0:10s} {1:10.1f}ms {2:10.1f}ms {3:7.1f}x".format(name, a, b, a / b))
+	finally:
+		shutil.rmtree(path)
+
+if __name__ == "__main__":
+	run(*[int(_) for _ in sys.argv[1:]])
+
+# EOF - vim: ts=4 sw=4 noet
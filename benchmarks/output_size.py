@@ -0,0 +1,59 @@
+# encoding: utf8
+# -----------------------------------------------------------------------------
+# Project   : LambdaFactory
+# -----------------------------------------------------------------------------
+# Author    : Sebastien Pierre                               <sebastien@ffctn.com>
+# License   : Revised BSD License
+# -----------------------------------------------------------------------------
+# Creation  : 2026-10-19
+# Last mod  : 2026-10-19
+# -----------------------------------------------------------------------------
+
+"""Compares the size of the JavaScript output with and without `-D minify`.
+
+>   PYTHONPATH=dist python benchmarks/output_size.py [FUNCTIONS]
+
+The benchmark writes the synthetic module of `writer_throughput.py` with the
+JavaScript and ECMAScript writers, for each module type, and reports the raw
+and gzipped sizes of the regular and minified outputs."""
+
+import sys, gzip
+from lambdafactory.main import Command
+from writer_throughput import build
+
+LANGUAGES = ("javascript", "ecmascript")
+MODULES   = ("vanilla", "umd")
+
+def write( language, count, options ):
+	"""Returns the code for a program of `count` functions written in the
+	given language with the given environment options."""
+	command     = Command("lambdafactory")
+	environment = command.environment
+	program, _  = build(environment.getFactory(), count)
+	environment.program = program
+	for name in options:
+		environment.options[name] = True
+	command.setupPasses(language, None, [])
+	environment.runPasses(program)
+	return command.writeProgram(program, language).encode("utf8")
+
+def run( count=1000 ):
+	print("{0:12s} {1:8s} {2:>10s} {3:>10s} {4:>7s} {5:>10s} {6:>10s} {7:>7s}".format(
+		"language", "module", "size", "minified", "ratio", "gzip", "minified", "ratio"))
+	for language in LANGUAGES:
+		for module in MODULES:
+			options  = (module,) if module != "vanilla" else ()
+			regular  = write(language, count, options)
+			minified = write(language, count, options + ("minify",))
+			regular_gz  = len(gzip.compress(regular))
+			minified_gz = len(gzip.compress(minified))
+			print("{0:12s} {1:8s} {2:10d} {3:10d} {4:6.1f}% {5:10d} {6:10d} {7:6.1f}%".format(
+				language, module,
+				len(regular), len(minified), 100.0 * len(minified) / len(regular),
+				regular_gz, minified_gz, 100.0 * minified_gz / regular_gz,
+			))
+
+if __name__ == "__main__":
+	run(*[int(_) for _ in sys.argv[1:]])
+
+# EOF - vim: ts=4 sw=4 noet
@@ -0,0 +1,123 @@
+# encoding: utf8
+# -----------------------------------------------------------------------------
+# Project   : LambdaFactory
+# -----------------------------------------------------------------------------
+# Author    : Sebastien Pierre                               <sebastien@ffctn.com>
+# License   : Revised BSD License
+# -----------------------------------------------------------------------------
+# Creation  : 2026-10-19
+# Last mod  : 2026-10-19
+# -----------------------------------------------------------------------------
+
+"""Measures the speedup of the `Typer` pass on loops under Node.
+
+>   PYTHONPATH=dist python benchmarks/typed_loops.py [ITEMS] [CALLS]
+
+The benchmark writes a module of functions that iterate over and index
+local arrays and enumerations with the JavaScript writer, once with the
+standard passes and once with `-P std,Typer`, and runs both with `node`.
+The runtime functions are provided by the stand-in of the `native_loops`
+benchmark."""
+
+import os, sys, json, shutil, tempfile, subprocess
+from lambdafactory.main import Command
+from native_loops import RUNTIME
+
+FUNCTIONS = ("iterated", "indexed", "counted", "mapped")
+ROUNDS    = 10
+
+DRIVER = """
+var m = require(process.argv[2]), calls = parseInt(process.argv[3]), res = {};
+%s.forEach(function(name){
+	var f = m[name];
+	for (var i=0;i<calls/10;i++){f()}
+	var t = process.hrtime.bigint();
+	for (var i=0;i<calls;i++){f()}
+	res[name] = Number(process.hrtime.bigint() - t) / 1e6;
+});
+console.log(JSON.stringify(res));
+""" % (json.dumps(FUNCTIONS))
+
+def build( factory, items ):
+	"""Builds a program with a module of functions that allocate an array
+	of `items` elements and then iterate over it (or over an enumeration of
+	the same length) `ROUNDS` times."""
+	F       = factory
+	program = F.createProgram()
+	module  = F.createModule("typed")
+	module.setSourcePath("typed.sjs")
+	program.addModule(module)
+	r, n    = F._ref, F._number
+	op      = lambda o, a, b: F.compute(F._op(o), a, b)
+	def function( name, *operations ):
+		f = F.createFunction(name, [])
+		for _ in operations: f.addOperation(_)
+		module.setSlot(name, f)
+	def closure( params, *operations ):
+		return F.createClosure([F._param(_) for _ in params], *operations)
+	values = lambda: F.allocate(F._slot("xs"), F.map(F.enumerate(n(0), n(items)), closure(["x"], F.returns(op("*", r("x"), n(2))))))
+	total  = lambda: F.allocate(F._slot("t"), n(0))
+	add    = lambda value: F.assign(r("t"), op("+", r("t"), value))
+	rounds = lambda *operations: F.iterate(F.enumerate(n(0), n(ROUNDS)), closure(["_"], *operations))
+	function("iterated", values(), total(),
+		rounds(F.iterate(r("xs"), closure(["x"], add(r("x"))))),
+		F.returns(r("t"))
+	)
+	function("indexed", values(), total(),
+		rounds(
+			F.allocate(F._slot("i"), n(0)),
+			F.repeat(op("<", r("i"), F.resolve(r("length"), r("xs"))), F.createBlock(
+				add(F.access(r("xs"), r("i"))),
+				F.assign(r("i"), op("+", r("i"), n(1))),
+			)),
+		),
+		F.returns(r("t"))
+	)
+	function("counted", values(), total(),
+		rounds(F.iterate(F.enumerate(n(0), F.resolve(r("length"), r("xs"))), closure(["i"], add(F.access(r("xs"), r("i")))))),
+		F.returns(r("t"))
+	)
+	function("mapped", values(), total(),
+		rounds(add(F.resolve(r("length"), F.map(r("xs"), closure(["x"], F.returns(op("+", r("x"), n(1)))))))),
+		F.returns(r("t"))
+	)
+	return program
+
+def write( items, passes ):
+	"""Returns the JavaScript code for the benchmark module, written after
+	the given passes."""
+	command     = Command("lambdafactory")
+	environment = command.environment
+	program     = build(environment.getFactory(), items)
+	environment.program = program
+	environment.options["umd"] = True
+	command.setupPasses("javascript", passes, [])
+	environment.runPasses(program)
+	return command.writeProgram(program, "javascript")
+
+def run( items=1000, calls=5000 ):
+	path = tempfile.mkdtemp()
+	try:
+		os.makedirs(os.path.join(path, "node_modules"))
+		for name, content in (("runtime.js", RUNTIME), ("runtime.oop.js", "module.exports = {};"), ("driver.js", DRIVER)):
+			with open(os.path.join(path, "node_modules" if name.startswith("runtime") else "", name), "w") as f:
+				f.write(content)
+		results = {}
+		for mode, passes in (("plain", None), ("typed", ["std", "Typer"])):
+			module = os.path.join(path, mode + ".js")
+			with open(module, "w") as f:
+				f.write(write(items, passes))
+			output = subprocess.check_output(["node", os.path.join(path, "driver.js"), module, str(calls)])
+			results[mode] = json.loads(output.decode("utf8"))
+		print("{0:10s} {1:>12s} {2:>12s} {3:>8s}".format("function", "plain", "typed", "speedup"))
+		for name in FUNCTIONS:
+			a = results["plain"][name]
+			b = results["typed"][name]
+			print("{0:10s} {1:10.1f}ms {2:10.1f}ms {3:7.1f}x".format(name, a, b, a / b))
+	finally:
+		shutil.rmtree(path)
+
+if __name__ == "__main__":
+	run(*[int(_) for _ in sys.argv[1:]])
+
+# EOF - vim: ts=4 sw=4 noet
@@ -0,0 +1,79 @@
+# encoding: utf8
+# -----------------------------------------------------------------------------
+# Project   : LambdaFactory
+# -----------------------------------------------------------------------------
+# Author    : Sebastien Pierre                               <sebastien@ffctn.com>
+# License   : Revised BSD License
+# -----------------------------------------------------------------------------
+# Creation  : 2026-10-19
+# Last mod  : 2026-10-19
+# -----------------------------------------------------------------------------
+
+"""Measures how many program model elements per second the writers emit.
+
+>   PYTHONPATH=dist python benchmarks/writer_throughput.py [FUNCTIONS] [STEPS] [RUNS]
+
+The benchmark writes synthetic modules of increasing size (doubling the
+given number of functions at each step) with the JavaScript, ECMAScript and
+Python writers, after the default passes, and reports the best of the given
+number of runs for each size."""
+
+import sys, time
+from lambdafactory.main import Command
+
+LANGUAGES = ("javascript", "ecmascript", "python")
+
+def build( factory, count ):
+	"""Builds a program with a module of `count` functions, and returns the
+	program along with the number of elements that were created."""
+	program = factory.createProgram()
+	module  = factory.createModule("benchmark")
+	module.setSourcePath("benchmark.sjs")
+	program.addModule(module)
+	nodes   = 2
+	for i in range(count):
+		f = factory.createFunction("f{0}".format(i), [factory._param("a"), factory._param("b")])
+		f.addOperation(factory.allocate(factory._slot("c"), factory.compute(factory._op("+"), factory._ref("a"), factory._number(i))))
+		c = factory.createClosure([factory._param("x")])
+		c.addOperation(factory.invoke(factory.resolve(factory._ref("log"), factory._ref("console")), factory._ref("x"), factory._string("c")))
+		f.addOperation(factory.iterate(factory._ref("b"), c))
+		f.addOperation(factory.select(
+			factory.rule(factory.compute(factory._op(">"), factory._ref("c"), factory._number(0)), factory.createBlock(factory.returns(factory._ref("c")))),
+			factory.rule(factory._number(1), factory.createBlock(factory.returns(factory._list(factory._ref("a"), factory._number(0))))),
+		))
+		module.setSlot(f.getName(), f)
+		# function + 2 params + (allocation, slot, computation, op, ref, number)
+		# + (iteration, ref, closure, param, invocation, resolution, 2 refs,
+		# ref, string) + (selection, 2 rules, computation, op, ref, number,
+		# 2 blocks, 2 terminations, ref, number, list, ref, number)
+		nodes += 1 + 2 + 6 + 10 + 15
+	return program, nodes
+
+def measure( language, count, runs ):
+	"""Returns the number of elements and the best time taken to write a
+	program of `count` functions in the given language."""
+	command     = Command("lambdafactory")
+	environment = command.environment
+	program, nodes = build(environment.getFactory(), count)
+	environment.program = program
+	command.setupPasses(language, None, [])
+	environment.runPasses(program)
+	best = None
+	for _ in range(runs):
+		started = time.time()
+		command.writeProgram(program, language)
+		elapsed = time.time() - started
+		best    = elapsed if best is None else min(best, elapsed)
+	return nodes, best
+
+def run( count=500, steps=4, runs=3 ):
+	print("{0:12s} {1:>10s} {2:>10s} {3:>12s}".format("language", "elements", "time", "elements/s"))
+	for language in LANGUAGES:
+		for step in range(steps):
+			nodes, best = measure(language, count * (2 ** step), runs)
+			print("{0:12s} {1:10d} {2:9.3f}s {3:12.0f}".format(language, nodes, best, nodes / best))
+
+if __name__ == "__main__":
+	run(*[int(_) for _ in sys.argv[1:]])
+
+# EOF - vim: ts=4 sw=4 noet
@@ -218,6 +218,120 @@ class Cache:
 				return False
 	
 
+class ModuleGraph:
+	""" The graph of the imports between the modules of a program, where each
+	 module points to the modules of the program that it imports.
+	
+	 The strongly connected components of the graph are the groups of modules
+	 that import each other (directly or not). They are given in topological
+	 order, so that the modules come after the modules they import, except
+	 within a component, where the modules are in program order. Any component
+	 of more than one module is an import cycle."""
+	def __init__ (self, program):
+		self.modules = []
+		self.dependencies = {}
+		self.components = None
+		context=PassContext()
+		by_name={}
+		for module in program.getModules():
+			self.modules.append(module)
+			by_name[module.getName()] = module
+		for module in self.modules:
+			imported=[]
+			for name in context.getImportedModules(module):
+				dependency=by_name.get(name)
+				if ((dependency and (dependency is not module)) and (dependency not in imported)):
+					imported.append(dependency)
+			self.dependencies[module.getName()] = imported
+	
+	def getModules(self):
+		return self.modules
+	
+	def getDependencies(self, module):
+		""" Returns the modules of the program imported by the given module."""
+		return self.dependencies.get(module.getName(), [])
+	
+	def getComponents(self):
+		""" Returns the strongly connected components of the graph as lists of
+		 modules, the components of the imported modules coming first. This
+		 uses Tarjan's algorithm, walking the modules in program order."""
+		if (self.components is None):
+			index    = {}
+			lowlink  = {}
+			stack    = []
+			stacked  = set()
+			found    = []
+			position = dict((_.getName(), i) for i, _ in enumerate(self.modules))
+			for root in self.modules:
+				if root.getName() in index: continue
+				# The walk is iterative, as import chains can be deep
+				walk = [(root, iter(self.getDependencies(root)))]
+				index[root.getName()] = lowlink[root.getName()] = len(index)
+				stack.append(root) ; stacked.add(root.getName())
+				while walk:
+					module, dependencies = walk[-1]
+					name = module.getName()
+					dependency = next(dependencies, None)
+					if dependency is None:
+						walk.pop()
+						if walk:
+							parent = walk[-1][0].getName()
+							lowlink[parent] = min(lowlink[parent], lowlink[name])
+						if lowlink[name] == index[name]:
+							component = []
+							while True:
+								m = stack.pop() ; stacked.discard(m.getName())
+								component.append(m)
+								if m is module: break
+							found.append(sorted(component, key=lambda _:position[_.getName()]))
+					elif dependency.getName() not in index:
+						index[dependency.getName()] = lowlink[dependency.getName()] = len(index)
+						stack.append(dependency) ; stacked.add(dependency.getName())
+						walk.append((dependency, iter(self.getDependencies(dependency))))
+					elif dependency.getName() in stacked:
+						lowlink[name] = min(lowlink[name], index[dependency.getName()])
+			self.components = found
+		return self.components
+	
+	def getOrder(self):
+		""" Returns the modules in topological order, so that modules come after
+		 the modules they import (see `getComponents`)."""
+		order=[]
+		for component in self.getComponents():
+			order.extend(component)
+		return order
+	
+	def getCycles(self):
+		""" Returns the import cycles as paths of module names, starting and ending
+		 with the same module, one for each component of more than one module."""
+		cycles=[]
+		for component in self.getComponents():
+			if (len(component) > 1):
+				cycles.append(self.getCyclePath(component))
+		return cycles
+	
+	def getCyclePath(self, component):
+		""" Returns the shortest path of imports from the first module of the
+		 given component back to itself."""
+		start=component[0]
+		previous={}
+		queue=[start]
+		while queue:
+			module=queue.pop(0)
+			for dependency in self.getDependencies(module):
+				if (dependency is start):
+					path=[start.getName()]
+					while (module is not start):
+						path.insert(1, module.getName())
+						module = previous[module.getName()]
+					path.append(start.getName())
+					return path
+				elif ((dependency in component) and (dependency.getName() not in previous)):
+					previous[dependency.getName()] = module
+					queue.append(dependency)
+		return None
+	
+
 class Environment:
 	"""
 	 Passes
@@ -275,6 +389,12 @@ class Environment:
 	def getFactory(self):
 		return self.factory
 	
+	def getModuleGraph(self, program=None):
+		""" Returns the `ModuleGraph` of the imports between the modules of the
+		 given program (the environment's program by default)."""
+		if program is None: program = None
+		return ModuleGraph((program or self.program))
+	
 	def importDynamicModule(self, moduleName):
 		return self.importModule(moduleName)
 	
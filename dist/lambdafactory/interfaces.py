@@ -17,6 +17,7 @@ class Constants:
 class IAnnotation:
 	""" An annotation is some information that is not used for the actual
 	 program, but annotates/gives meta-information about is elements."""
+	__slots__ = []
 	def getContent(self):
 		""" Returns the content of this annotation."""
 		raise Exception("Abstract method IAnnotation.getContent not implemented in: " + str(self))
@@ -32,15 +33,16 @@ class IAnnotation:
 
 class IComment(IAnnotation):
 	""" A comment is an annotation that can occur anywhere in a source file."""
-	pass
+	__slots__ = []
 
 class IDocumentation(IAnnotation):
 	""" Documentation is often attached to various language elements.
 	 Documentation can be found in coments (as in Java), or be directly embedded
 	 as values (as in Python)."""
-	pass
+	__slots__ = []
 
 class ISyntactic:
+	__slots__ = []
 	def getOffset(self):
 		raise Exception("Abstract method ISyntactic.getOffset not implemented in: " + str(self))
 	
@@ -64,6 +66,7 @@ class IDataFlow:
 	 While 'DataFlow' and 'Context' may appear very similar, they are not the
 	 same: contexts are elements that keep track of declared slots, while the
 	 dataflow make use of the context to weave the elements togeher."""
+	__slots__ = []
 	def declareArgument(self, name, value):
 		raise Exception("Abstract method IDataFlow.declareArgument not implemented in: " + str(self))
 	
@@ -147,6 +150,7 @@ class IDataFlow:
 	
 
 class IDataFlowSlot:
+	__slots__ = []
 	def addOperation(self):
 		raise Exception("Abstract method IDataFlowSlot.addOperation not implemented in: " + str(self))
 	
@@ -173,10 +177,11 @@ class IDataFlowSlot:
 class IDataFlowOwner:
 	""" DataFlow owners are elements that have their own dataflow. IContext are
 	 typical examples of elements that are dataflow owners"""
-	pass
+	__slots__ = []
 
 class IElement:
 	""" The core @protocol for every element."""
+	__slots__ = []
 	def getAbstractType(self):
 		""" Returns the abstract type for this element"""
 		raise Exception("Abstract method IElement.getAbstractType not implemented in: " + str(self))
@@ -242,7 +247,7 @@ class IElement:
 class IConstruct:
 	""" A construct is a high level programming element that allows to create a
 	 structure and hierarchy in the program."""
-	pass
+	__slots__ = []
 
 class IAssignable:
 	""" Assignable elements are elements that can be bound to slots. In many
@@ -252,7 +257,7 @@ class IAssignable:
 	 >     Object my_package = java.lang.Object
 	
 	 while in some other languages (like JavaScript), you could do that."""
-	pass
+	__slots__ = []
 
 class IReferencable(IAssignable):
 	""" A referencable is an element that can be referenced either by id (it is
@@ -261,6 +266,7 @@ class IReferencable(IAssignable):
 	 Types are good examples of referencables: they have an *absolute name* (like
 	 `Data.List`), but can also be bound to slots within contexts which give them
 	 "local names" (like `List := Data.List`)"""
+	__slots__ = []
 	def getName(self):
 		""" Returns the local name for this referencable element"""
 		raise Exception("Abstract method IReferencable.getName not implemented in: " + str(self))
@@ -273,6 +279,7 @@ class IReferencable(IAssignable):
 class IEvaluable:
 	""" An evaluable is an element that can produce a value. Evaluable elements
 	 then have associated type information."""
+	__slots__ = []
 	def getResultAbstractType(self):
 		""" Returns the abstract type of the result of the evaluation of this
 		 evaluable"""
@@ -288,10 +295,11 @@ class IInstanciable:
 	""" Instanciable is a property of some elements that allows them to be
 	 instanciated. Conceptually, an instanciation could be considered as a
 	 specific kind of invocation."""
-	pass
+	__slots__ = []
 
 class IInvocable:
 	""" An invocable can be used in an invocation operation."""
+	__slots__ = []
 	def getArguments(self):
 		""" Returns a list of arguments (which are names associated with optional
 		 type information."""
@@ -302,6 +310,7 @@ class IAbstractable:
 	""" An abstractable element is an element that is allow to have
 	 no underlying implementation.  Abstract element are typically interfaces,
 	 methods, functions, operations, and sometimes modules and @protocoles."""
+	__slots__ = []
 	def isAbstract(self):
 		""" Tells wether the given abstractable is abstract or not."""
 		raise Exception("Abstract method IAbstractable.isAbstract not implemented in: " + str(self))
@@ -316,6 +325,7 @@ class IImplicitAllocation:
 	 a new implicity slot with the given value. This is useful for operations
 	 that need to create a temporary reference to be used many times without
 	 re-evaluating the expression, such as selections/matches."""
+	__slots__ = []
 	def setImplicitValue(self, evaluable):
 		raise Exception("Abstract method IImplicitAllocation.setImplicitValue not implemented in: " + str(self))
 	
@@ -324,6 +334,7 @@ class IImplicitAllocation:
 	
 
 class IType(IReferencable):
+	__slots__ = []
 	def getName(self):
 		raise Exception("Abstract method IType.getName not implemented in: " + str(self))
 	
@@ -350,9 +361,10 @@ class IType(IReferencable):
 	
 
 class ITypeConstraint:
-	pass
+	__slots__ = []
 
 class ISlotConstraint(ITypeConstraint):
+	__slots__ = []
 	def getName(self):
 		raise Exception("Abstract method ISlotConstraint.getName not implemented in: " + str(self))
 	
@@ -367,6 +379,7 @@ class ISlotConstraint(ITypeConstraint):
 	
 
 class IEnumerationType(IType):
+	__slots__ = []
 	def addSymbol(self, name):
 		raise Exception("Abstract method IEnumerationType.addSymbol not implemented in: " + str(self))
 	
@@ -375,29 +388,31 @@ class IEnumerationType(IType):
 	
 
 class ISymbolType(IType, IEvaluable):
-	pass
+	__slots__ = []
 
 class IValue(IElement, IEvaluable):
 	""" A value represents an atomic element of the language, like a number, a
 	 string, or a name (that can resolved by the language, acts as key for data
 	 structures, etc.)."""
-	pass
+	__slots__ = []
 
 class ILiteral(IValue):
 	""" A literal is a value that does not need a context to be evaluated. The
 	 evaluation is direct."""
+	__slots__ = []
 	def getActualValue(self):
 		""" Returns the (implementation language) value for this literal"""
 		raise Exception("Abstract method ILiteral.getActualValue not implemented in: " + str(self))
 	
 
 class INumber(ILiteral):
-	pass
+	__slots__ = []
 
 class IString(ILiteral):
-	pass
+	__slots__ = []
 
 class IList(IValue):
+	__slots__ = []
 	def addValue(self, value):
 		""" Adds a value to this list."""
 		raise Exception("Abstract method IList.addValue not implemented in: " + str(self))
@@ -409,6 +424,7 @@ class IList(IValue):
 
 class ITuple(IList):
 	""" A tuple is a list with a fixed arity and optionally a name map"""
+	__slots__ = []
 	def setNames(self, names):
 		raise Exception("Abstract method ITuple.setNames not implemented in: " + str(self))
 	
@@ -430,6 +446,7 @@ class ITuple(IList):
 class IDict(IValue):
 	""" A dictionary is a binding of key to values. It may or may not be ordered,
 	 depending on the implementation/model semantics."""
+	__slots__ = []
 	def setValue(self, key, value):
 		"""	Sets the value to be associated to the given key (which must be an
 			evaluable)."""
@@ -443,6 +460,7 @@ class IDict(IValue):
 class IReference(IValue, IReferencable):
 	"""	A reference is a name that can be converted into a value using a
 		resolution operation (for instance)."""
+	__slots__ = []
 	def getReferenceName(self):
 		"""	Returns the name which this reference contains. The name is used by
 			the resolution operation to actually resolve a value from the name."""
@@ -450,20 +468,21 @@ class IReference(IValue, IReferencable):
 	
 
 class ITypeReference(IValue, IReferencable):
-	pass
+	__slots__ = []
 
 class IAbsoluteReference(IReference):
 	""" An absolute reference is a specific kind of reference that does not
 	 necessarily resolve in the current context, but will rather use the program
 	 root context as a starting point."""
-	pass
+	__slots__ = []
 
 class IAnonymousReference(IReference):
 	""" A reference which name is randomly generate and is guaranteed not to clash
 	 with the scope."""
-	pass
+	__slots__ = []
 
 class IImplicitReference(IReference):
+	__slots__ = []
 	def getElement(self):
 		raise Exception("Abstract method IImplicitReference.getElement not implemented in: " + str(self))
 	
@@ -472,6 +491,7 @@ class IImplicitReference(IReference):
 	
 
 class IOperator(IReference):
+	__slots__ = []
 	def setPriority(self, priority):
 		"""	Sets the priority for this operator"""
 		raise Exception("Abstract method IOperator.setPriority not implemented in: " + str(self))
@@ -483,6 +503,7 @@ class IOperator(IReference):
 
 class ISlot(IReferencable):
 	""" An argument is a reference with additional type information."""
+	__slots__ = []
 	def getTypeDescription(self):
 		"""	Returns type information (constraints) that are associated to this
 			argument."""
@@ -496,6 +517,7 @@ class IParameter(ISlot):
 	 invocation. When it is is _variable_, it means it references the
 	 rest of the arguments lists. When it is _keywords_, it will reference
 	 the named arguments of the rest of the arguments list."""
+	__slots__ = []
 	def isOptional(self):
 		"""	Tells if the argument is optional or not."""
 		raise Exception("Abstract method IParameter.isOptional not implemented in: " + str(self))
@@ -539,6 +561,7 @@ class IArgument(IElement, ISlot, IEvaluable):
 	 with a name and extra information, such as wether they
 	 are passed as a list of arguments (Pythons's `*args`)
 	 or as a map of arguments (Python's `**args`)."""
+	__slots__ = []
 	def isByName(self):
 		raise Exception("Abstract method IArgument.isByName not implemented in: " + str(self))
 	
@@ -567,6 +590,7 @@ class IArgument(IElement, ISlot, IEvaluable):
 	
 
 class IAttribute(ISlot):
+	__slots__ = []
 	def setDefaultValue(self):
 		"""	Sets the @methodault value for this attribute"""
 		raise Exception("Abstract method IAttribute.setDefaultValue not implemented in: " + str(self))
@@ -577,18 +601,19 @@ class IAttribute(ISlot):
 	
 
 class IModuleAttribute(IAttribute):
-	pass
+	__slots__ = []
 
 class IClassAttribute(IAttribute):
-	pass
+	__slots__ = []
 
 class IEvent(IClassAttribute):
-	pass
+	__slots__ = []
 
 class IContext(IElement, IDataFlowOwner):
 	"""	A context is an element that has slots, which bind evaluable elements
 		(aka values) to names. Slots should be ordered, preserving the order in
 		which they were added."""
+	__slots__ = []
 	def setSlot(self, name, evaluable):
 		"""	Binds the given evaluable to the named slot. If there is already a slot
 			with the same name, then 'getSlot(name)' should return the evaluable
@@ -627,6 +652,7 @@ class IContext(IElement, IDataFlowOwner):
 	
 
 class IClass(IContext, IReferencable, IConstruct):
+	__slots__ = []
 	def getInheritedSlots(self):
 		"""	gives the list of inherited slots"""
 		raise Exception("Abstract method IClass.getInheritedSlots not implemented in: " + str(self))
@@ -682,22 +708,23 @@ class IClass(IContext, IReferencable, IConstruct):
 
 class IAbstractClass(IClass, IAbstractable):
 	"""	An abstract @protocol is a @protocol that has at least one abstract element."""
-	pass
+	__slots__ = []
 
 class IInterface(IAbstractClass):
 	"""	An interface is an abstract @protocol that only has abstract elements."""
-	pass
+	__slots__ = []
 
 class ISingleton(IClass):
 	"""	A *singleton* is an anonymous class with only one instance."""
-	pass
+	__slots__ = []
 
 class ITrait(IClass):
 	"""	A *trait* is a specific type of class that is intended to be mixed-in."""
-	pass
+	__slots__ = []
 
 class IModule(IContext, IReferencable, IAssignable, IConstruct):
 	""" Note that a module 'getName' function returns the module absolute name"""
+	__slots__ = []
 	def isImported(self):
 		""" A stub module is a module that does not have any bound implementation.
 		 Stub modules are typically used by Programs when adding a module such
@@ -735,6 +762,7 @@ class IModule(IContext, IReferencable, IAssignable, IConstruct):
 class IProgram(IContext):
 	"""	The program is the core context and entry point for almost every
 		operation offered by LambdaFactory."""
+	__slots__ = []
 	def addModule(self, module, offset):
 		""" Adds a module to this program. The module will be registered in
 		 the global module catalogue."""
@@ -760,6 +788,7 @@ class IProgram(IContext):
 
 class IProcess(IElement):
 	"""	A process is a sequence of operations."""
+	__slots__ = []
 	def addOperation(self, operation):
 		"""	Adds the given operation as a child of this process."""
 		raise Exception("Abstract method IProcess.addOperation not implemented in: " + str(self))
@@ -776,13 +805,14 @@ class IGroup(IProcess):
 	
 	 Groups should generally not have their own context, as opposed to blocks
 	 which generally have a context of their own."""
-	pass
+	__slots__ = []
 
 class IBlock(IGroup, IAssignable):
 	"""	A block is a specific type of (sub) process."""
-	pass
+	__slots__ = []
 
 class IWithBlock(IBlock):
+	__slots__ = []
 	def getContext(self):
 		raise Exception("Abstract method IWithBlock.getContext not implemented in: " + str(self))
 	
@@ -791,6 +821,7 @@ class IWithBlock(IBlock):
 	
 
 class IClosure(IProcess, IContext, IReferencable, IAbstractable, IConstruct):
+	__slots__ = []
 	def getParameters(self):
 		raise Exception("Abstract method IClosure.getParameters not implemented in: " + str(self))
 	
@@ -807,6 +838,7 @@ class IClosure(IProcess, IContext, IReferencable, IAbstractable, IConstruct):
 	
 
 class IFunction(IClosure):
+	__slots__ = []
 	def getName(self):
 		"""	Returns this @protocol name. It can be `None` if the @protocol is anonymous."""
 		raise Exception("Abstract method IFunction.getName not implemented in: " + str(self))
@@ -824,33 +856,34 @@ class IFunction(IClosure):
 	
 
 class IMethod(IFunction):
-	pass
+	__slots__ = []
 
 class IAttributeMethod(IMethod):
-	pass
+	__slots__ = []
 
 class IAccessor(IAttributeMethod):
-	pass
+	__slots__ = []
 
 class IMutator(IAttributeMethod):
-	pass
+	__slots__ = []
 
 class IConstructor(IMethod):
-	pass
+	__slots__ = []
 
 class IDestructor(IMethod):
-	pass
+	__slots__ = []
 
 class IInstanceMethod(IMethod):
-	pass
+	__slots__ = []
 
 class IClassMethod(IMethod):
-	pass
+	__slots__ = []
 
 class IInitializer(IFunction):
-	pass
+	__slots__ = []
 
 class IOperation(IElement):
+	__slots__ = []
 	def addOpArgument(self, argument):
 		"""	Adds an argument to this operation. This should do checking of
 			arguments (by expected internal type and number)."""
@@ -876,12 +909,13 @@ class IOperation(IElement):
 	
 
 class INOP(IOperation):
-	pass
+	__slots__ = []
 
 class IImportOperation(IOperation):
-	pass
+	__slots__ = []
 
 class IImportSymbolOperation(IImportOperation):
+	__slots__ = []
 	ARGS = [IEvaluable, IEvaluable, IEvaluable]
 	ARG_NAMES = [u'ImportedElement', u'ImportOrigin', u'Alias']
 	def getImportedElement(self):
@@ -911,6 +945,7 @@ class IImportSymbolOperation(IImportOperation):
 	
 
 class IImportSymbolsOperation(IImportOperation):
+	__slots__ = []
 	ARGS = [[IEvaluable], IEvaluable]
 	ARG_NAMES = [u'ImportedElements', u'ImportOrigin']
 	def getImportedElements(self):
@@ -923,6 +958,7 @@ class IImportSymbolsOperation(IImportOperation):
 	
 
 class IImportModuleOperation(IImportOperation):
+	__slots__ = []
 	ARGS = [IEvaluable, IEvaluable]
 	ARG_NAMES = [u'ImportedModuleName', u'Alias']
 	def getImportedModuleName(self):
@@ -934,6 +970,7 @@ class IImportModuleOperation(IImportOperation):
 	
 
 class IImportModulesOperation(IImportOperation):
+	__slots__ = []
 	ARGS = [[IEvaluable]]
 	ARG_NAMES = [u'ImportedModuleNames']
 	def getImportedModuleNames(self):
@@ -947,6 +984,7 @@ class IImportModulesOperation(IImportOperation):
 
 class IEvaluation(IOperation):
 	""" An operation that simply returns its value, evaluating it if necessary."""
+	__slots__ = []
 	ARGS = [IEvaluable, IEvaluable]
 	ARG_NAMES = [u'Evaluable']
 	def getEvaluable(self):
@@ -960,6 +998,7 @@ class IEvaluation(IOperation):
 	
 
 class IAssignment(IOperation, IEvaluable):
+	__slots__ = []
 	ARGS = [IEvaluable, IEvaluable]
 	def getTarget(self):
 		"""	Returns this assignation target reference, which can be an evaluable
@@ -972,6 +1011,7 @@ class IAssignment(IOperation, IEvaluable):
 	
 
 class IAllocation(IOperation, IEvaluable):
+	__slots__ = []
 	ARGS = [ISlot, IEvaluable]
 	def getSlotToAllocate(self):
 		"""	Returns slot to be allocated by this operation."""
@@ -987,6 +1027,7 @@ class IAllocation(IOperation, IEvaluable):
 
 class IResolution(IOperation, IEvaluable, IReferencable):
 	"""	A resolution resolves a reference into a value."""
+	__slots__ = []
 	ARGS = [IReferencable, IEvaluable]
 	def getReference(self):
 		"""	Returns the reference to be resolved."""
@@ -998,9 +1039,10 @@ class IResolution(IOperation, IEvaluable, IReferencable):
 	
 
 class IDecomposition(IResolution):
-	pass
+	__slots__ = []
 
 class IBinaryOperation(IOperation, IEvaluable):
+	__slots__ = []
 	def getOperand(self):
 		"""	Returns the left operand of this computation."""
 		return self.getLeftOperand()
@@ -1027,6 +1069,7 @@ class IBinaryOperation(IOperation, IEvaluable):
 	
 
 class IComputation(IBinaryOperation, IEvaluable):
+	__slots__ = []
 	ARGS = [IOperator, IEvaluable, IEvaluable]
 	def getOperator(self):
 		"""	Gets the operator for this computation"""
@@ -1057,6 +1100,7 @@ class IComputation(IBinaryOperation, IEvaluable):
 	
 
 class IInvocation(IOperation, IEvaluable):
+	__slots__ = []
 	ARGS = [IEvaluable, [IEvaluable]]
 	def isByPositionOnly(self):
 		""" Tells if this invocation is only by position. Otherwise, some arguments
@@ -1074,6 +1118,7 @@ class IInvocation(IOperation, IEvaluable):
 	
 
 class IEventOperation(IOperation, IEvaluable):
+	__slots__ = []
 	ARGS = [IEvaluable, IEvaluable, [IEvaluable]]
 	def getTarget(self):
 		"""	Returns the invocation target reference."""
@@ -1089,18 +1134,19 @@ class IEventOperation(IOperation, IEvaluable):
 	
 
 class IEventTrigger(IEventOperation):
-	pass
+	__slots__ = []
 
 class IEventBind(IEventOperation):
-	pass
+	__slots__ = []
 
 class IEventBindOnce(IEventOperation):
-	pass
+	__slots__ = []
 
 class IEventUnbind(IEventOperation):
-	pass
+	__slots__ = []
 
 class IInstanciation(IOperation, IEvaluable):
+	__slots__ = []
 	ARGS = [IEvaluable, [IEvaluable]]
 	def getInstanciable(self):
 		"""	Returns the instanciable used in this operation."""
@@ -1112,12 +1158,14 @@ class IInstanciation(IOperation, IEvaluable):
 	
 
 class ISubsetOperation(IOperation, IEvaluable):
+	__slots__ = []
 	def getTarget(self):
 		"""	Returns the operation target."""
 		return self.getOpArgument(0)
 	
 
 class IAccessOperation(ISubsetOperation):
+	__slots__ = []
 	ARGS = [IEvaluable, IEvaluable]
 	def getIndex(self):
 		"""	Returns evaluable that will return the access index"""
@@ -1125,6 +1173,7 @@ class IAccessOperation(ISubsetOperation):
 	
 
 class ISliceOperation(ISubsetOperation):
+	__slots__ = []
 	ARGS = [IEvaluable, IEvaluable, IEvaluable]
 	def getSliceStart(self):
 		"""	Returns evaluable that will return the slice start"""
@@ -1137,6 +1186,7 @@ class ISliceOperation(ISubsetOperation):
 
 class IMatchOperation(IOperation):
 	"""	A match operation is the binding of an expression and a process."""
+	__slots__ = []
 	def getPredicate(self):
 		"""	Returns the evaluable that acts as a predicate for this operation."""
 		return self.getOpArgument(0)
@@ -1150,6 +1200,7 @@ class IMatchExpressionOperation(IMatchOperation):
 		This is typically used in conditional expressions like in C:
 	
 		>	int a = ( b==2 ? 1 : 2 )"""
+	__slots__ = []
 	ARGS = [IEvaluable, IEvaluable]
 	def getExpression(self):
 		"""	Returns the process that will be executed if the rule matches."""
@@ -1162,6 +1213,7 @@ class IMatchExpressionOperation(IMatchOperation):
 class IMatchProcessOperation(IMatchOperation):
 	"""	A match process is a predicate associate to a process, which is typically
 		used for implementing 'if', 'else', etc."""
+	__slots__ = []
 	ARGS = [IEvaluable, IProcess]
 	def getProcess(self):
 		"""	Returns the process that will be executed if the rule matches."""
@@ -1175,6 +1227,7 @@ class ISelection(IOperation, IImplicitAllocation):
 	"""	Selections are the abstract objects behind `if`, `select` or
 		pattern-matching operations. Each selection has match operations as
 		arguments, which bind a subprocess to a predicate expression."""
+	__slots__ = []
 	ARGS = [[IMatchOperation], IEvaluable]
 	def addRule(self, evaluable):
 		"""	Adds a rule to this operation."""
@@ -1186,6 +1239,7 @@ class ISelection(IOperation, IImplicitAllocation):
 	
 
 class IChain(IOperation):
+	__slots__ = []
 	ARGS = [IOperator, IEvaluable, [IOperation]]
 	def setOperator(self, value):
 		raise Exception("Abstract method IChain.setOperator not implemented in: " + str(self))
@@ -1210,6 +1264,7 @@ class IChain(IOperation):
 	
 
 class ITypeIdentification(IOperation):
+	__slots__ = []
 	ARGS = [IEvaluable, IType]
 	def setTarget(self, value):
 		raise Exception("Abstract method ITypeIdentification.setTarget not implemented in: " + str(self))
@@ -1227,6 +1282,7 @@ class ITypeIdentification(IOperation):
 class IIteration(IBinaryOperation):
 	"""	An iteration is the multiple application of a process given a set of
 		values produced by an iterator."""
+	__slots__ = []
 	ARGS = [IEvaluable, IEvaluable]
 	def getIterator(self):
 		"""	Returns this iteration iterator."""
@@ -1242,12 +1298,14 @@ class IIteration(IBinaryOperation):
 
 class IMapIteration(IIteration):
 	""" An iteration that is evaluable and that will produce a map of the iterator"""
+	__slots__ = []
 	def getIterationType(self):
 		return 1
 	
 
 class IFilterIteration(IIteration):
 	""" An iteration that is evaluable and that will produce a filtered map of the iterator"""
+	__slots__ = []
 	ARGS = [IEvaluable, IEvaluable, IEvaluable]
 	def getPredicate(self):
 		return self.getOpArgument(1)
@@ -1261,6 +1319,7 @@ class IFilterIteration(IIteration):
 
 class IReduceIteration(IIteration):
 	""" An iteration that is evaluable and that will produce a filtered map of the iterator"""
+	__slots__ = []
 	ARGS = [IEvaluable, IEvaluable, IEvaluable]
 	def getInitialValue(self):
 		return self.getOpArgument(2)
@@ -1276,6 +1335,7 @@ class IReduceIteration(IIteration):
 class IEnumeration(IBinaryOperation):
 	"""	An enumeration produces values between a start and an end value, with the
 		given step."""
+	__slots__ = []
 	ARGS = [IEvaluable, IEvaluable, IEvaluable]
 	def getStart(self):
 		"""	Returns this enumeration start."""
@@ -1297,6 +1357,7 @@ class IEnumeration(IBinaryOperation):
 class IInterpolation(IBinaryOperation):
 	"""	An interpolation will transform the given string using
 		the given arguments. The semantics are left to the backend."""
+	__slots__ = []
 	ARGS = [IString, IEvaluable]
 	def getString(self):
 		return self.getOpArgument(0)
@@ -1314,6 +1375,7 @@ class IInterpolation(IBinaryOperation):
 class IRepetition(IOperation):
 	"""	A repetition is the repetitive execution of a process according to a
 		predicate expression which can be modified by the process."""
+	__slots__ = []
 	ARGS = [IEvaluable, IProcess]
 	def getCondition(self):
 		"""	Gets the expression that is the condition for this repetition."""
@@ -1324,6 +1386,7 @@ class IRepetition(IOperation):
 	
 
 class ITermination(IOperation):
+	__slots__ = []
 	ARGS = [IEvaluable]
 	def getReturnedEvaluable(self):
 		"""	Returns the termination return evaluable."""
@@ -1332,16 +1395,19 @@ class ITermination(IOperation):
 
 class IInterruption(IOperation):
 	"""	An interruption can be be used to halt the process."""
-	pass
+	__slots__ = []
 
 class IBreaking(IInterruption):
+	__slots__ = []
 	ARGS = []
 
 class IContinue(IInterruption):
+	__slots__ = []
 	ARGS = []
 
 class IExcept(IInterruption):
 	"""	An interruption that raises some value"""
+	__slots__ = []
 	ARGS = [IEvaluable]
 	def getValue(self):
 		"""	Returns the termination return evaluable."""
@@ -1351,6 +1417,7 @@ class IExcept(IInterruption):
 class IInterception(IOperation):
 	"""	An interception allows to intercept interruptions that propagage from an
 		enclosed process to parent contexts."""
+	__slots__ = []
 	ARGS = [IProcess, IProcess, IProcess]
 	def setProcess(self, process):
 		"""	Sets the process from which interruptions will be intercepted."""
@@ -1381,6 +1448,7 @@ class IEmbed(IOperation):
 	"""	An embedded operation represents a bit of verbatim code written in
 		a different language. This allows for embedding code written specifically
 		in a target language (which may happen for optimizing stuff, for instance)."""
+	__slots__ = []
 	ARGS = []
 	def getLanguage(self):
 		"""	Returns the language in which the emebedded code is written."""
@@ -1403,5 +1471,5 @@ class IEmbedTemplate(IEmbed):
 	"""	The 'EmbedTemplate' is embedded ('Embed') that contains template
 		expressions. It's up to the model writer to know how to expand the template
 		to convert it to the target language."""
-	pass
+	__slots__ = []
 
@@ -11,7 +11,7 @@
 
 import lambdafactory.interfaces as interfaces
 import lambdafactory.reporter   as reporter
-from   lambdafactory.languages.javascript.writer import Writer as JavaScriptWriter
+from   lambdafactory.languages.javascript.writer import Writer as JavaScriptWriter, MODULE_ES
 import types, json
 
 # FIXME: It's kind of odd to have to do push/pop context
@@ -40,6 +40,10 @@ model:
 
 class Writer(JavaScriptWriter):
 
+	# Functions are written without name scopes (see `_onFunctionBody`), so the
+	# local names can't be mangled when minifying.
+	MANGLES = False
+
 	def __init__( self ):
 		JavaScriptWriter.__init__(self)
 		self.jsInit = "__init__"
@@ -379,7 +383,7 @@ class Writer(JavaScriptWriter):
 		if not isinstance(i, interfaces.IReference): t = "(" + t + ")"
 		return "new %s(%s)" % (
 			t,
-			", ".join(self.write(_) for _ in element.getArguments())
+			self._join(", ", (self.write(_) for _ in element.getArguments()))
 		)
 
 
@@ -389,6 +393,16 @@ class Writer(JavaScriptWriter):
 
 	def _onFunctionBody( self, element, body=None, bindSelf=True, operations=None ):
 		"""Writes the body of a function."""
+		if bindSelf and element and self._moduleType == MODULE_ES and isinstance(element.getParent(), interfaces.IModule):
+			# ES modules only bind the module's namespace when the function
+			# uses it, as bundlers would otherwise retain all the exports.
+			count = self._selfReferences
+			lines = list(self._onFunctionBody(element, body, False, operations))
+			if self._selfReferences != count:
+				yield self._runtimeSelfBinding(element)
+			for _ in lines:
+				yield _
+			return
 		# Adds the `const self = this`
 		if bindSelf: yield self._runtimeSelfBinding(element)
 		for _ in self._writeImplicitAllocations(element):
@@ -495,21 +509,21 @@ class Writer(JavaScriptWriter):
 			# We have a direct super invocation, which means we're invoking the
 			# super constructor
 			return "super({0})".format(
-				", ".join(map(self.write, element.getArguments())),
+				self._join(", ", map(self.write, element.getArguments())),
 			)
 		else:
 			# Otherwise we're invoking a method from the super, which
 			# is a simple call forwarding
 			return "{0}({1})".format(
 				self.write(element.getTarget()),
-				", ".join(map(self.write, element.getArguments())),
+				self._join(", ", map(self.write, element.getArguments())),
 			)
 
 	def _runtimeInvocation( self, element ):
 		args = element.getArguments()
 		return "{0}({1})".format(
 			self.write(element.getTarget()),
-			", ".join(self.write(_) for _ in args)
+			self._join(", ", (self.write(_) for _ in args))
 		)
 
 MAIN_CLASS = Writer
@@ -53,6 +53,11 @@ class Writer(AbstractWriter):
 			res += list(self.write(_))
 		return self._format(res)
 
+	def stream( self, program, processes=0 ):
+		# The externs start with a program-wide file overview, so they are
+		# written in one go.
+		yield self.run(program)
+
 	def onModule( self, element ):
 		"""Writes a Module element."""
 		name = self.getName(element)
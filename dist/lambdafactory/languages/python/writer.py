@@ -66,8 +66,16 @@ class Writer(AbstractWriter):
 		if name == interfaces.Constants.MainFunction: name = "main"
 		return name
 
+	def isDeadCode( self, element ):
+		"""Tells if the element is dead code or not."""
+		if not element or not element.getAnnotation("deadcode"):
+			return False
+		else:
+			return True
+
 	def onModule( self, moduleElement):
 		"""Writes a Module element."""
+		if self.isDeadCode(moduleElement): return []
 		main = False
 		code = [
 			"#" + SNIP % ("%s.py" % (self.getAbsoluteName(moduleElement).replace(".", "/"))),
@@ -87,6 +95,8 @@ class Writer(AbstractWriter):
 		imports.extend(moduleElement.getImportOperations())
 		for name, value, accessor, mutator in moduleElement.getSlots():
 			# TODO: Sort values according to their dependencies
+			# Slots that `RemoveDeadCode` found unreachable are not written
+			if self.isDeadCode(value): continue
 			if name == interfaces.Constants.ModuleInit:
 				module_init = value.getOperations()
 			else:
@@ -547,7 +557,7 @@ class Writer(AbstractWriter):
 
 	def onList( self, element ):
 		"""Writes a list element."""
-		return '[%s]' % (", ".join([
+		return '[%s]' % (self._join(", ", [
 			self.write(e) for e in element.getValues()
 		]))
 
@@ -559,7 +569,7 @@ class Writer(AbstractWriter):
 			return "(%s)" % (self.write(key))
 
 	def onDict( self, element ):
-		return '{%s}' % (", ".join([
+		return '{%s}' % (self._join(", ", [
 			"%s:%s" % ( self._writeDictKey(k),self.write(v))
 			for k,v in element.getItems()
 			])
@@ -714,7 +724,7 @@ class Writer(AbstractWriter):
 			self.inInvocation = False
 			return "%s%s)" % (
 				t,
-				", ".join(map(self.write, invocation.getArguments()))
+				self._join(", ", map(self.write, invocation.getArguments()))
 				)
 
 	def onArgument( self, argument ):
@@ -732,7 +742,7 @@ class Writer(AbstractWriter):
 		"""Writes an invocation operation."""
 		return "%s(%s)" % (
 			self.write(operation.getInstanciable()),
-			", ".join(map(self.write, operation.getArguments()))
+			self._join(", ", map(self.write, operation.getArguments()))
 		)
 
 	def _writeSelectionInExpression( self, selection ):
@@ -855,6 +865,10 @@ class Writer(AbstractWriter):
 		"""Writes a break operation."""
 		return "break"
 
+	def onContinue( self, continues ):
+		"""Writes a continue operation."""
+		return "continue"
+
 	def onExcept( self, exception ):
 		"""Writes a except operation."""
 		return "raise " + self.write(exception.getValue())
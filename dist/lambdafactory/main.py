@@ -4,11 +4,12 @@
 """ Command-line interface and main module for LambdaFactory"""
 import sys
 __module__ = sys.modules[__name__]
-import os, sys, optparse, tempfile
+import os, sys, json, optparse, tempfile
 from lambdafactory.environment import Environment
 from lambdafactory.splitter import FileSplitter
 import lambdafactory.passes as passes
 import lambdafactory.resolution as resolution
+import lambdafactory.typer as typer
 from io import BytesIO, TextIOBase
 import sys
 __module_name__ = 'lambdafactory.main'
@@ -26,6 +27,17 @@ def ensureOutput (value, output=None):
 		if isinstance(value,bytes): return str(value)
 		return value.encode("utf8") if isinstance(value, unicode) else value
 
+def writeChunks (chunks, output):
+	""" Writes the given chunks of program text to the given output, separated
+	 by newlines, as each chunk becomes available."""
+	self=__module__
+	first=True
+	for chunk in chunks:
+		if (not first):
+			output.write(ensureOutput(u'\n', output))
+		output.write(ensureOutput(chunk, output))
+		first = False
+
 
 class Command:
 	OPT_LANG = u'Specifies the target language (js, java, pnuts, actionscript)'
@@ -48,6 +60,8 @@ class Command:
 	OPT_PREPROC = u'Applies the given preprocessor to the source'
 	OPT_IGNORES = u'Does not try to resolve the given modules'
 	OPT_PASSES = u'Specifies the passes used in the compilation process. Passes are identified by the class name which is expected to be found in either lambdafactory.passes or lambdafactory.resolution modules, or is given as an absolute class name.'
+	OPT_JOBS = u'Number of processes used to write the modules of the program'
+	EXTENSIONS = {'javascript':u'.js', 'ecmascript':u'.js', 'python':u'.py'}
 	def __init__ (self, programName=None):
 		self.programName = None
 		self.environment = None
@@ -113,6 +127,8 @@ class Command:
 			help=self.OPT_PASSES)
 		option_parser.add_option("-V", None, action="store", dest="version",
 			help=self.OPT_VERSION)
+		option_parser.add_option("-j", "--jobs", action="store", type="int", dest="jobs", default=0,
+			help=self.OPT_JOBS)
 		options, args = option_parser.parse_args(args=arguments)
 		language=options.lang
 		program=self.environment.program
@@ -191,22 +207,24 @@ class Command:
 				f.write(ensureOutput(json_documentation, f))
 				f.close()
 		elif options.compile:
-			program_source=self.writeProgram(program, language, options.runtime, options.includeSource)
+			program_chunks=self.streamProgram(program, language, options.runtime, options.includeSource, options.jobs)
 			if (not options.output):
-				output.write(ensureOutput(program_source, output))
+				writeChunks(program_chunks, output)
 				output.write(ensureOutput(u'\n', output))
+			elif (os.path.isdir(options.output) and self.environment.getPass(u'CodeSplitting')):
+				self.splitProgram(program, language, options.output, options.jobs)
 			elif os.path.isdir(options.output):
 				splitter=FileSplitter(options.output)
-				splitter.fromString(program_source)
+				splitter.fromChunks(program_chunks)
 			elif True:
 				f=open(options.output, u'wb')
-				f.write(ensureOutput(program_source, f))
+				writeChunks(program_chunks, f)
 				f.close()
 		elif options.run:
-			program_source=self.writeProgram(program, language, True, options.includeSource)
+			program_chunks=self.streamProgram(program, language, True, options.includeSource, options.jobs)
 			file_and_path=tempfile.mkstemp()
 			f=open(file_and_path[0], u'wb')
-			f.write(ensureOutput(program_source, f))
+			writeChunks(program_chunks, f)
 			f.close()
 			args_str=u' '.join(args[1:])
 			interpreter=None
@@ -236,6 +254,8 @@ class Command:
 	
 	def transformProgram(self, program):
 		self.environment.runPasses(program)
+		for cycle in self.environment.getModuleGraph(program).getCycles():
+			self.environment.report.warning(u'Import cycle between modules: {0}'.format(u' -> '.join(cycle)), program.getModule(cycle[0]))
 	
 	def guessLanguage(self, sourcePath):
 		for name_and_value in self.environment.languages.items():
@@ -257,15 +277,60 @@ class Command:
 			self.environment.report.error(u'Language not defined: {0}'.format(name))
 			return None
 	
-	def writeProgram(self, program, inLanguage, includeRuntime=None, includeSource=None):
+	def writeProgram(self, program, inLanguage, includeRuntime=None, includeSource=None, processes=None):
+		""" Writes the given program in the given language. With more than one
+		 process, the modules are written in parallel (see `AbstractWriter.stream`)."""
 		if includeRuntime is None: includeRuntime = False
 		if includeSource is None: includeSource = False
+		if processes is None: processes = 0
 		writer=self.getWriter(inLanguage)
-		if writer:
+		if (not writer):
+			return u''
+		elif (processes > 1):
+			return u'\n'.join(writer.stream(program, processes))
+		elif True:
 			program_source=writer.run(program)
 			return program_source
+	
+	def streamProgram(self, program, inLanguage, includeRuntime=None, includeSource=None, processes=None):
+		""" Like `writeProgram`, but returns an iterator on the text of each
+		 written module instead of the whole program text."""
+		if includeRuntime is None: includeRuntime = False
+		if includeSource is None: includeSource = False
+		if processes is None: processes = 0
+		writer=self.getWriter(inLanguage)
+		if writer:
+			return writer.stream(program, processes)
 		elif True:
-			return u''
+			return []
+	
+	def splitProgram(self, program, inLanguage, outputDir, processes=None):
+		""" Writes each chunk computed by the `CodeSplitting` pass to its own file
+		 in the given output directory, along with a `manifest.json` file that
+		 lists the chunks loaded by each entry point and the dependencies of
+		 each chunk. Returns the manifest.
+		
+		 When there is no chunk (no entry point was given or none resolves), a
+		 warning is reported and the program is written to the output directory
+		 as without the pass (see `FileSplitter.fromChunks`), returning `None`."""
+		if processes is None: processes = 0
+		splitting=self.environment.getPass(u'CodeSplitting')
+		if (not splitting.chunks):
+			self.environment.report.warning(u'No entry point to split the program, writing it without splitting', program)
+			FileSplitter(outputDir).fromChunks(self.streamProgram(program, inLanguage, False, False, processes))
+			return None
+		extension=(self.__class__.EXTENSIONS.get(self.environment.normalizeLanguage(inLanguage)) or u'')
+		manifest=splitting.getManifest(extension)
+		splitter=FileSplitter(outputDir)
+		for i in range(len(splitting.chunks)):
+			path=manifest[u'chunks'][splitting.chunks[i][u'name']][u'path']
+			marked=splitting.markChunk(program, i)
+			splitter.toFile(path, self.streamProgram(program, inLanguage, False, False, processes))
+			splitting.unmarkChunk(marked)
+		f=open(os.path.join(outputDir, u'manifest.json'), u'w')
+		f.write(json.dumps(manifest))
+		f.close()
+		return manifest
 	
 	def createEnvironment(self):
 		self.environment = Environment()
@@ -303,6 +368,8 @@ class Command:
 						pass_class = getattr(passes, the_pass)
 					elif hasattr(resolution, the_pass):
 						pass_class = getattr(resolution, the_pass)
+					elif hasattr(typer, the_pass):
+						pass_class = getattr(typer, the_pass)
 					elif True:
 						self.environment.report.error(u'LambdaFactory standard pass not found:', the_pass)
 						assert(None)
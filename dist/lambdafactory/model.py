@@ -9,6 +9,7 @@ import sys
 __module__ = sys.modules[__name__]
 from lambdafactory.interfaces import *
 import pprint, sys
+from collections import OrderedDict
 import lambdafactory.modeltypes as modeltypes
 __module_name__ = 'lambdafactory.model'
 IS_PYTHON3 = (sys.version_info.major >= 3)
@@ -34,6 +35,8 @@ ERR_MODULE_ADDED_TWICE = u'ERR_MODULE_ADDED_TWICE'
 ERR_ABSTRACT_PROCESS_NO_OPERATIONS = u'ERR_ABSTRACT_PROCESS_NO_OPERATIONS'
 ERR_NOT_AN_OPERATION = u'ERR_NOT_AN_OPERATION'
 ERR_CLOSURE_ARGUMENT_NOT_SLOT = u'ERR_CLOSURE_ARGUMENT_NOT_SLOT'
+NO_LOCATION = tuple([-1, -1, -1])
+SOURCE_PATHS = {}
 class DataFlowSlot(IDataFlowSlot):
 	def __init__ (self, name, value, origin, slotType):
 		self.name = None
@@ -71,6 +74,9 @@ class DataFlowSlot(IDataFlowSlot):
 	def getAbstractType(self):
 		return self.abstractType
 	
+	def setAbstractType(self, abstractType):
+		self.abstractType = abstractType
+	
 	def addOperation(self, operation):
 		""" Adds an operation made to this dataflow slot."""
 		self.operations.append(operation)
@@ -119,6 +125,7 @@ class DataFlow(IDataFlow):
 		self.sources = []
 		self.destinations = []
 		self.slots = []
+		self.slotsByName = {}
 		self.children = []
 		if parent is None: parent = None
 		self.element = element
@@ -152,6 +159,7 @@ class DataFlow(IDataFlow):
 			previous_slot=self.getSlot(name)
 			if previous_slot:
 				self.slots.remove(previous_slot)
+				self.slotsByName.pop(name)
 		return self.addSlot(self._slot(name, value, origin, slotType))
 	
 	def addSource(self, dataflow):
@@ -173,6 +181,8 @@ class DataFlow(IDataFlow):
 	
 	def addSlot(self, slot):
 		self.slots.append(slot)
+		if (slot.getName() not in self.slotsByName):
+			self.slotsByName[slot.getName()] = slot
 		slot.setDataFlow(self)
 		return slot
 	
@@ -219,10 +229,7 @@ class DataFlow(IDataFlow):
 		return self._getAvailableSlots().keys()
 	
 	def hasSlot(self, name):
-		for slot in self.slots:
-			if (slot.getName() == name):
-				return slot
-		return False
+		return (self.slotsByName.get(name) or False)
 	
 	def getSlot(self, name):
 		return self.hasSlot(name)
@@ -362,18 +369,35 @@ class Element:
 	
 	 Property defined in this class may not be relevant to every subclass, but at
 	 least they provide a common infrastructure and limit the number of
-	 subclasses."""
+	 subclasses.
+	
+	 Elements are created in large numbers, so the whole hierarchy declares
+	 `__slots__`: subclasses must list the properties they add in their own
+	 `__slots__`. The annotations list and its index by name are only
+	 allocated when the first annotation is added.
+	
+	 Absolute names are cached per element. As they depend on the names and
+	 parents of all the ancestors, any call to `setName` or `setParent`
+	 replaces the shared `NAMING_EPOCH` token, which invalidates all the
+	 cached names at once. The token is only replaced when some names were
+	 cached with it, so that building a program is not slowed down."""
 	COUNT = 0
+	NAMING_EPOCH = object()
+	NAMING_USED = False
+	__slots__ = [u'id', u'name', u'source', u'annotations', u'abstractType', u'resultAbtractType', u'sourceLocation', u'dataflow', u'parent', u'_lf_type', u'_absoluteName', u'_absoluteNameEpoch', u'_annotationsIndex']
 	def __init__ (self, name=None):
 		self.id = None
 		self.name = None
 		self.source = None
-		self.annotations = []
+		self.annotations = None
 		self.abstractType = None
 		self.resultAbtractType = None
-		self.sourceLocation = [-1, -1, -1]
+		self.sourceLocation = NO_LOCATION
 		self.dataflow = None
 		self.parent = None
+		self._absoluteName = None
+		self._absoluteNameEpoch = None
+		self._annotationsIndex = None
 		if name is None: name = None
 		self.name = name
 		self.id = self.__class__.COUNT
@@ -381,11 +405,33 @@ class Element:
 	
 	def setName(self, name):
 		self.name = name
+		self._invalidateNames()
 	
 	def getName(self):
 		return self.name
 	
+	def _invalidateNames(self):
+		""" Invalidates the absolute names cached by all the elements."""
+		if Element.NAMING_USED:
+			Element.NAMING_EPOCH = object()
+			Element.NAMING_USED  = False
+	
+	def getNamingEpoch(self):
+		""" Returns the token identifying the current naming epoch. Names derived
+		 from the program model can be cached for as long as the token stays
+		 the same."""
+		Element.NAMING_USED = True
+		return Element.NAMING_EPOCH
+	
 	def getAbsoluteName(self):
+		""" Returns the absolute name of this element, as returned by
+		 `_getAbsoluteName`, caching it until the next `setName` or `setParent`."""
+		if self._absoluteNameEpoch is not Element.NAMING_EPOCH:
+			self._absoluteName      = self._getAbsoluteName()
+			self._absoluteNameEpoch = self.getNamingEpoch()
+		return self._absoluteName
+	
+	def _getAbsoluteName(self):
 		name=self.getName()
 		if name:
 			if self.parent:
@@ -410,14 +456,19 @@ class Element:
 			return False
 	
 	def setParent(self, parent):
+		if (parent != self.parent):
+			self._invalidateNames()
 		self.parent = parent
 	
 	def unsetParent(self):
+		if self.parent:
+			self._invalidateNames()
 		self.parent = None
 		return self
 	
 	def setSourcePath(self, path):
-		self.sourceLocation[2] = path
+		path = SOURCE_PATHS.setdefault(path, path)
+		self.sourceLocation = tuple([self.sourceLocation[0], self.sourceLocation[1], path])
 		return self
 	
 	def getSourcePath(self):
@@ -427,8 +478,7 @@ class Element:
 		return [self.sourceLocation[0], self.sourceLocation[1]]
 	
 	def setOffset(self, start, end):
-		self.sourceLocation[0] = start
-		self.sourceLocation[1] = end
+		self.sourceLocation = tuple([start, end, self.sourceLocation[2]])
 		return self
 	
 	def getOffsets(self):
@@ -445,6 +495,7 @@ class Element:
 	
 	def detach(self):
 		if self.parent:
+			self._invalidateNames()
 			self.parent = None
 		return self
 	
@@ -459,46 +510,63 @@ class Element:
 		if (not annotation):
 			return None
 		if (type(annotation) in [tuple, list]):
-			map(self.addAnnotation , annotation)
+			for _ in annotation:
+				self.addAnnotation(_)
 		elif isString(annotation):
 			self.addAnnotation(Annotation(annotation, value))
 		elif True:
 			assert(isinstance(annotation, IAnnotation))
-			self.annotations.append(annotation)
+			self._indexAnnotation(annotation)
 			annotation.setParent(self)
 		return self
 	
+	def _indexAnnotation(self, annotation):
+		""" Appends the given annotation to the annotations list, which keeps
+		 them in insertion order, and registers it in the annotations index,
+		 which maps annotation names to the list of annotations with that name."""
+		if (self.annotations is None):
+			self.annotations = []
+			self._annotationsIndex = {}
+		self.annotations.append(annotation)
+		name=annotation.getName()
+		if (name in self._annotationsIndex):
+			self._annotationsIndex[name].append(annotation)
+		elif True:
+			self._annotationsIndex[name] = [annotation]
+		return annotation
+	
 	def getAnnotations(self, withName=None):
+		""" Returns the annotations with the given name, or all the annotations
+		 in insertion order when no name is given. The returned list must not
+		 be modified."""
 		if withName is None: withName = None
+		if not self.annotations: return []
 		if not withName: return self.annotations
-		return [a for a in self.annotations if a.getName() == withName]
+		return self._annotationsIndex.get(withName) or []
 	
 	def hasAnnotation(self, withName):
-		annotations=self.getAnnotations(withName)
-		return (len(annotations) > 0)
+		return bool(self.annotations) and withName in self._annotationsIndex
 	
 	def removeAnnotation(self, withName):
-		new_annotations=[]
-		for annotation in self.annotations:
-			if (annotation.getName() != withName):
-				new_annotations.append(annotation)
-		self.annotations = new_annotations
+		if (self.annotations and (withName in self._annotationsIndex)):
+			self._annotationsIndex.pop(withName)
+			self.annotations = [_ for _ in self.annotations if (_.getName() != withName)]
 	
 	def setAnnotation(self, name, content):
 		annotation=self.getAnnotation(name)
 		if (not annotation):
 			annotation = Annotation(name, content)
-			self.annotations.append(annotation)
+			self._indexAnnotation(annotation)
 		elif True:
 			annotation.setContent(content)
 		return self
 	
 	def getAnnotation(self, withName):
-		annotations=self.getAnnotations(withName)
-		if annotations:
-			return annotations[0]
-		elif True:
-			return None
+		if self.annotations:
+			named=self._annotationsIndex.get(withName)
+			if named:
+				return named[0]
+		return None
 	
 	def setDocumentation(self, documentation):
 		self.addAnnotation(documentation)
@@ -546,17 +614,17 @@ class Element:
 		copy = self.__class__(*arguments)
 		copy.name = self.name
 		copy.source = self.source
-		for annotation in self.annotations:
+		for annotation in self.getAnnotations():
 			copy.addAnnotation(annotation.copy().detach())
 		copy.abstractType = self.abstractType
 		copy.resultAbtractType = self.resultAbtractType
 		copy.sourceLocation = self.sourceLocation
-		if self.dataflow:
-			copy.dataflow = self.dataflow.clone().attach(copy)
+		copy.dataflow = self.dataflow
 		return copy
 	
 
 class Type(Element, IType):
+	__slots__ = [u'parameters', u'constraints', u'parents']
 	def __init__ (self, name=None, parameters=None):
 		self.parameters = None
 		self.constraints = []
@@ -616,6 +684,7 @@ class SlotConstraint(ISlotConstraint):
 	
 
 class EnumerationType(Type, IEnumerationType):
+	__slots__ = [u'symbols']
 	def __init__ (self, name=None, parameters=None):
 		self.parameters = None
 		self.symbols = []
@@ -642,9 +711,10 @@ class EnumerationType(Type, IEnumerationType):
 	
 
 class SymbolType(Type, ISymbolType):
-	pass
+	__slots__ = []
 
 class Annotation(Element, IAnnotation):
+	__slots__ = [u'content']
 	def __init__ (self, name=None, content=None):
 		self.content = None
 		if name is None: name = None
@@ -668,6 +738,7 @@ class Annotation(Element, IAnnotation):
 	
 
 class Comment(Annotation, IComment):
+	__slots__ = []
 	def __init__ (self, content=None):
 		if content is None: content = None
 		Annotation.__init__(self, u'comment', content)
@@ -675,6 +746,7 @@ class Comment(Annotation, IComment):
 	pass
 
 class Documentation(Annotation, IDocumentation):
+	__slots__ = []
 	def __init__ (self, content=None):
 		if content is None: content = None
 		Annotation.__init__(self, u'documentation', content)
@@ -682,19 +754,22 @@ class Documentation(Annotation, IDocumentation):
 	pass
 
 class Context(Element, IContext):
+	""" Contexts store their slots in an ordered dictionary that maps each slot
+	 name to a `[name, value, accessor, mutator]` list. Setting an existing
+	 slot moves it to the end, as it used to be with the list of slots."""
+	__slots__ = [u'slots', u'abstract']
 	def __init__ (self, name=None):
-		self.slots = []
-		self.slotIndex = {}
+		self.slots = None
 		self.parent = None
 		self.abstract = False
 		if name is None: name = None
 		Element.__init__(self, name)
+		self.slots = OrderedDict()
 	
 	def copy(self):
 		res=Element._copy(self)
 		res.name = self.name
-		res.slots = ([] + self.slots)
-		res.slotIndex.update(self.slotIndex)
+		res.slots = OrderedDict(self.slots)
 		res.parent = self.parent
 		res.abstract = self.abstract
 		return res
@@ -727,18 +802,12 @@ class Context(Element, IContext):
 			raise ERR_SLOT_VALUE_NOT_ASSIGNABLE
 		if ((assignParent and isinstance(evaluable, IContext)) or hasattr(evaluable, u'setParent')):
 			evaluable.setParent(self)
-		if (self.slotIndex.get(name) is None):
-			self.slots.append([name, evaluable, None, None])
-			self.slotIndex[name] = (len(self.slots) - 1)
+		slot=self.slots.pop(name, None)
+		if (slot is None):
+			self.slots[name] = [name, evaluable, None, None]
 		elif True:
-			slot=self.slots[self.slotIndex[name]]
 			slot[1] = evaluable
-			self.slots.remove(slot)
-			self.slots.append(slot)
-			i=0
-			while (i < len(self.slots)):
-				self.slotIndex[self.slots[i][0]] = i
-				i = (i + 1)
+			self.slots[name] = slot
 	
 	def setAccessor(self, name, accessor):
 		self.ensureSlot(name)
@@ -767,37 +836,34 @@ class Context(Element, IContext):
 			self.setSlot(name, None)
 	
 	def hasSlot(self, name):
-		for slot in self.slots:
-			if (slot[0] == name):
-				return True
-		return False
+		return (name in self.slots)
 	
 	def getSlot(self, name):
-		return self._getRawSlot()[1]
+		return self._getRawSlot(name)[1]
 	
 	def _getRawSlot(self, name):
-		i=(len(self.slots) - 1)
-		for slot in self.slots:
-			if (slot[0] == name):
-				return slot
-		raise ERR_SLOT_NOT_FOUND
+		slot=self.slots.get(name)
+		if (slot is None):
+			raise ERR_SLOT_NOT_FOUND
+		return slot
 	
 	def getSlots(self):
-		return self.slots
+		""" Returns the `[name, value, accessor, mutator]` slots in order. This is
+		 a view on the slots, and not a copy."""
+		return self.slots.values()
 	
 	def getSlotNames(self):
-		res=[]
-		for slot in self.slots:
-			res.append(slot[0])
-		return res
+		return list(self.slots.keys())
 	
 	def setParent(self, context):
+		if (context != self.parent):
+			self._invalidateNames()
 		self.parent = context
 	
 	def getParent(self):
 		return self.parent
 	
-	def getAbsoluteName(self):
+	def _getAbsoluteName(self):
 		if self.name:
 			p=self.parent
 			while (p and p.hasTransientScope()):
@@ -815,6 +881,7 @@ class Context(Element, IContext):
 	
 
 class Class(Context, IClass, IReferencable, IAssignable):
+	__slots__ = [u'parentClasses']
 	def __init__ (self, name=None, parentClasses=None):
 		self.parentClasses = []
 		if name is None: name = None
@@ -899,15 +966,16 @@ class Class(Context, IClass, IReferencable, IAssignable):
 	
 
 class Interface(Class, IInterface):
-	pass
+	__slots__ = []
 
 class Singleton(Class, ISingleton):
-	pass
+	__slots__ = []
 
 class Trait(Class, ITrait):
-	pass
+	__slots__ = []
 
 class Module(Context, IModule):
+	__slots__ = [u'importOperations', u'imported']
 	def __init__ (self, name=None):
 		self.importOperations = []
 		self.imported = False
@@ -949,7 +1017,7 @@ class Module(Context, IModule):
 		for op in module.getImportOperations():
 			op.detach()
 			self.addImportOperation(op)
-		for an in module.annotations:
+		for an in module.getAnnotations():
 			an.detach()
 			self.addAnnotation(an)
 		for slot in module.getSlots():
@@ -973,6 +1041,7 @@ class Module(Context, IModule):
 	
 
 class Program(Context, IProgram):
+	__slots__ = [u'factory', u'modules']
 	def __init__ (self, name=None):
 		self.factory = None
 		self.modules = []
@@ -1036,6 +1105,7 @@ class Program(Context, IProgram):
 	
 
 class Process(Context):
+	__slots__ = [u'operations']
 	def __init__ (self, name=None):
 		self.operations = []
 		if name is None: name = None
@@ -1065,12 +1135,13 @@ class Process(Context):
 	
 
 class Group(Process, IGroup):
-	pass
+	__slots__ = []
 
 class Block(Group, IBlock):
-	pass
+	__slots__ = []
 
 class WithBlock(Group, IWithBlock):
+	__slots__ = [u'context']
 	def __init__ (self, context):
 		self.context = None
 		Group.__init__(self)
@@ -1084,6 +1155,7 @@ class WithBlock(Group, IWithBlock):
 	
 
 class Callable(Process):
+	__slots__ = [u'parameters', u'returnTypeDescription']
 	def __init__ (self, parameters, name=None):
 		self.parameters = None
 		self.returnTypeDescription = None
@@ -1151,13 +1223,14 @@ class Callable(Process):
 	
 
 class Closure(Callable, IClosure):
-	pass
+	__slots__ = []
 
 class Function(Callable, IFunction):
+	__slots__ = []
 	def __init__ (self, name, parameters):
 		Callable.__init__(self, parameters, name)
 	
-	def getAbsoluteName(self):
+	def _getAbsoluteName(self):
 		if self.getParent():
 			return ((self.getParent().getAbsoluteName() + u'.') + self.name)
 		elif True:
@@ -1165,40 +1238,44 @@ class Function(Callable, IFunction):
 	
 
 class Method(Function, IMethod):
-	pass
+	__slots__ = []
 
 class Accessor(Method, IAccessor):
-	pass
+	__slots__ = []
 
 class Mutator(Method, IMutator):
-	pass
+	__slots__ = []
 
 class Initializer(Function, IInitializer):
+	__slots__ = []
 	def __init__ (self, parameters):
 		Function.__init__(self, Constants.Init, parameters)
 	
 	pass
 
 class Constructor(Method, IConstructor):
+	__slots__ = []
 	def __init__ (self, parameters):
 		Method.__init__(self, Constants.Constructor, parameters)
 	
 	pass
 
 class Destructor(Method, IDestructor):
+	__slots__ = []
 	def __init__ (self):
 		Method.__init__(self, Constants.Destructor, [])
 	
 	pass
 
 class ClassMethod(Method, IClassMethod):
-	pass
+	__slots__ = []
 
 class InstanceMethod(Method, IInstanceMethod):
-	pass
+	__slots__ = []
 
 class Operation(Element, IOperation):
 	ARGS = None
+	__slots__ = [u'opArguments']
 	def __init__ (self, *arguments):
 		self.opArguments = []
 		Element.__init__(self)
@@ -1262,9 +1339,10 @@ class Operation(Element, IOperation):
 	
 
 class NOP(Operation, INOP):
-	pass
+	__slots__ = []
 
 class Assignment(Operation, IAssignment):
+	__slots__ = []
 	def getTarget(self):
 		return self.getOpArgument(0)
 	
@@ -1273,6 +1351,7 @@ class Assignment(Operation, IAssignment):
 	
 
 class Allocation(Operation, IAllocation):
+	__slots__ = []
 	def getSlotToAllocate(self):
 		return self.getOpArgument(0)
 	
@@ -1288,6 +1367,7 @@ class Allocation(Operation, IAllocation):
 	
 
 class Resolution(Operation, IResolution):
+	__slots__ = []
 	def getReference(self):
 		return self.getOpArgument(0)
 	
@@ -1296,18 +1376,21 @@ class Resolution(Operation, IResolution):
 	
 
 class Decomposition(Resolution, IDecomposition):
+	__slots__ = []
 	def __init__ (self, *arguments):
 		Resolution.__init__(self, *arguments)
 	
 	pass
 
 class Computation(Operation, IComputation):
+	__slots__ = []
 	def __init__ (self, *arguments):
 		Operation.__init__(self, *arguments)
 	
 	pass
 
 class Invocation(Operation, IInvocation):
+	__slots__ = []
 	def isByPositionOnly(self):
 		for arg in self.getOpArgument(1):
 			if (arg.isByName() or arg.isAsMap()):
@@ -1316,6 +1399,7 @@ class Invocation(Operation, IInvocation):
 	
 
 class EventOperation(Operation, IEventOperation):
+	__slots__ = []
 	def __init__ (self, t, event, arguments):
 		Operation.__init__(self)
 		self.setOpArguments([t, event, arguments])
@@ -1323,21 +1407,22 @@ class EventOperation(Operation, IEventOperation):
 	pass
 
 class EventTrigger(EventOperation, IEventTrigger):
-	pass
+	__slots__ = []
 
 class EventBind(EventOperation, IEventBind):
-	pass
+	__slots__ = []
 
 class EventBindOnce(EventOperation, IEventBindOnce):
-	pass
+	__slots__ = []
 
 class EventUnbind(EventOperation, IEventUnbind):
-	pass
+	__slots__ = []
 
 class Instanciation(Operation, IInstanciation):
-	pass
+	__slots__ = []
 
 class Selection(Operation, ISelection):
+	__slots__ = []
 	def __init__ (self):
 		Operation.__init__(self)
 		self.opArguments = [[], None]
@@ -1373,6 +1458,7 @@ class Selection(Operation, ISelection):
 	
 
 class Chain(Operation, IChain):
+	__slots__ = []
 	def _ensureOpArguments(self):
 		a=self.getOpArguments()
 		if (not a):
@@ -1413,6 +1499,7 @@ class Chain(Operation, IChain):
 	
 
 class TypeIdentification(Operation, ITypeIdentification):
+	__slots__ = []
 	def setTarget(self, value):
 		_ensureOpArguments()
 		self.setOpArgument(0, value)
@@ -1431,21 +1518,22 @@ class TypeIdentification(Operation, ITypeIdentification):
 	
 
 class Evaluation(Operation, IEvaluation):
-	pass
+	__slots__ = []
 
 class AccessOperation(Operation, IAccessOperation):
-	pass
+	__slots__ = []
 
 class SliceOperation(Operation, ISliceOperation):
-	pass
+	__slots__ = []
 
 class MatchProcessOperation(Operation, IMatchProcessOperation):
-	pass
+	__slots__ = []
 
 class MatchExpressionOperation(Operation, IMatchExpressionOperation):
-	pass
+	__slots__ = []
 
 class Iteration(Operation, IIteration):
+	__slots__ = []
 	def isRangeIteration(self):
 		iterator=self.getIterator()
 		if (((isinstance(iterator, IEnumeration) and isinstance(iterator.getStart(), INumber)) and isinstance(iterator.getEnd(), INumber)) and (isinstance(iterator.getStep(), INumber) or (not iterator.getStep()))):
@@ -1455,16 +1543,19 @@ class Iteration(Operation, IIteration):
 	
 
 class MapIteration(Iteration, IMapIteration):
+	__slots__ = []
 	def getIterationType(self):
 		return 1
 	
 
 class FilterIteration(Iteration, IFilterIteration):
+	__slots__ = []
 	def getIterationType(self):
 		return 2
 	
 
 class ReduceIteration(Iteration, IReduceIteration):
+	__slots__ = [u'direction']
 	def __init__ (self, *arguments):
 		self.direction = 1
 		Operation.__init__(self)
@@ -1486,29 +1577,31 @@ class ReduceIteration(Iteration, IReduceIteration):
 	
 
 class Interpolation(Operation, IInterpolation):
-	pass
+	__slots__ = []
 
 class Enumeration(Operation, IEnumeration):
-	pass
+	__slots__ = []
 
 class Repetition(Operation, IRepetition):
-	pass
+	__slots__ = []
 
 class Termination(Operation, ITermination):
+	__slots__ = []
 	def getReturnedEvaluable(self):
 		return self.getOpArgument(0)
 	
 
 class Breaking(Operation, IBreaking):
-	pass
+	__slots__ = []
 
 class Continue(Operation, IContinue):
-	pass
+	__slots__ = []
 
 class Except(Operation, IExcept):
-	pass
+	__slots__ = []
 
 class Interception(Operation, IInterception):
+	__slots__ = []
 	def __init__ (self, tryProcess, catchProcess=None, finallyProcess=None):
 		if catchProcess is None: catchProcess = None
 		if finallyProcess is None: finallyProcess = None
@@ -1517,36 +1610,42 @@ class Interception(Operation, IInterception):
 	pass
 
 class ImportOperation(Operation, IImportOperation):
+	__slots__ = []
 	def __init__ (self, *arguments):
 		Operation.__init__(self, *arguments)
 	
 	pass
 
 class ImportSymbolOperation(Operation, IImportSymbolOperation):
+	__slots__ = []
 	def __init__ (self, *arguments):
 		Operation.__init__(self, *arguments)
 	
 	pass
 
 class ImportSymbolsOperation(Operation, IImportSymbolsOperation):
+	__slots__ = []
 	def __init__ (self, *arguments):
 		Operation.__init__(self, *arguments)
 	
 	pass
 
 class ImportModuleOperation(Operation, IImportModuleOperation):
+	__slots__ = []
 	def __init__ (self, *arguments):
 		Operation.__init__(self, *arguments)
 	
 	pass
 
 class ImportModulesOperation(Operation, IImportModulesOperation):
+	__slots__ = []
 	def __init__ (self, *arguments):
 		Operation.__init__(self, *arguments)
 	
 	pass
 
 class Embed(Operation, IEmbed):
+	__slots__ = [u'language', u'code']
 	def __init__ (self, lang=None, code=None):
 		self.language = None
 		self.code = None
@@ -1570,12 +1669,13 @@ class Embed(Operation, IEmbed):
 	
 
 class EmbedTemplate(Embed, IEmbedTemplate):
-	pass
+	__slots__ = []
 
 class Value(Element, IValue, IEvaluable, IAssignable):
-	pass
+	__slots__ = []
 
 class Literal(Value, ILiteral):
+	__slots__ = [u'actualValue']
 	def __init__ (self, actualValue=None):
 		self.actualValue = None
 		if actualValue is None: actualValue = None
@@ -1595,12 +1695,13 @@ class Literal(Value, ILiteral):
 	
 
 class Number(Literal, INumber):
-	pass
+	__slots__ = []
 
 class String(Literal, IString):
-	pass
+	__slots__ = []
 
 class List(Value, IList):
+	__slots__ = [u'values']
 	def __init__ (self):
 		self.values = []
 		Value.__init__(self)
@@ -1626,6 +1727,7 @@ class List(Value, IList):
 	
 
 class Tuple(List, ITuple):
+	__slots__ = [u'names']
 	def __init__ (self):
 		self.names = []
 		List.__init__(self)
@@ -1647,6 +1749,7 @@ class Tuple(List, ITuple):
 	
 
 class Dict(Value, IDict):
+	__slots__ = [u'items']
 	def __init__ (self):
 		self.items = []
 		Value.__init__(self)
@@ -1663,6 +1766,7 @@ class Dict(Value, IDict):
 	
 
 class Reference(Value, IReference):
+	__slots__ = [u'referenceName']
 	def __init__ (self, name):
 		self.referenceName = None
 		Value.__init__(self)
@@ -1688,6 +1792,7 @@ class Reference(Value, IReference):
 	
 
 class AbsoluteReference(Reference, IAbsoluteReference):
+	__slots__ = []
 	def __init__ (self, name):
 		self.referenceName = None
 		Reference.__init__(self, name)
@@ -1695,6 +1800,7 @@ class AbsoluteReference(Reference, IAbsoluteReference):
 	pass
 
 class TypeReference(Reference, ITypeReference):
+	__slots__ = [u'parameters']
 	def __init__ (self, name, parameters=None):
 		self.parameters = None
 		if parameters is None: parameters = None
@@ -1709,6 +1815,7 @@ class TypeReference(Reference, ITypeReference):
 	
 
 class ImplicitReference(Reference, IImplicitReference):
+	__slots__ = [u'element']
 	def __init__ (self, element):
 		self.element = None
 		Reference.__init__(self, None)
@@ -1723,6 +1830,7 @@ class ImplicitReference(Reference, IImplicitReference):
 	
 
 class Operator(Reference, IOperator):
+	__slots__ = [u'priority']
 	def __init__ (self, operator, priority):
 		self.priority = 0
 		Reference.__init__(self, operator)
@@ -1740,6 +1848,7 @@ class Operator(Reference, IOperator):
 	
 
 class Slot(Element, ISlot):
+	__slots__ = [u'defaultValue', u'typeDescription']
 	def __init__ (self, name, typeDescription):
 		self.defaultValue = None
 		self.typeDescription = None
@@ -1761,6 +1870,7 @@ class Slot(Element, ISlot):
 	
 
 class Parameter(Slot, IParameter):
+	__slots__ = [u'rest', u'keywordRest', u'optional']
 	def __init__ (self, name, typeDescription):
 		self.rest = False
 		self.keywordRest = False
@@ -1795,6 +1905,7 @@ class Parameter(Slot, IParameter):
 	
 
 class Argument(Element, IArgument):
+	__slots__ = [u'value', u'_asList', u'_asMap']
 	def __init__ (self, name=None, value=None):
 		self.name = None
 		self.value = None
@@ -1814,6 +1925,7 @@ class Argument(Element, IArgument):
 	
 	def setByName(self, n):
 		self.name = n
+		self._invalidateNames()
 	
 	def getValue(self):
 		return self.value
@@ -1847,13 +1959,17 @@ class Argument(Element, IArgument):
 	def copy(self):
 		ref_copy=Element._copy(self)
 		ref_copy.name = self.name
-		ref_copy.setValue(self.value)
+		if (self.value and isinstance(self.value, IElement)):
+			ref_copy.setValue(self.value.copy().detach())
+		elif True:
+			ref_copy.setValue(self.value)
 		ref_copy._asList = self._asList
 		ref_copy._asMap = self._asMap
 		return ref_copy
 	
 
 class Attribute(Slot, IAttribute):
+	__slots__ = []
 	def __init__ (self, name, typeDescription, value=None):
 		if value is None: value = None
 		Slot.__init__(self, name, typeDescription)
@@ -1862,11 +1978,11 @@ class Attribute(Slot, IAttribute):
 	pass
 
 class ClassAttribute(Attribute, IClassAttribute):
-	pass
+	__slots__ = []
 
 class Event(ClassAttribute, IEvent):
-	pass
+	__slots__ = []
 
 class ModuleAttribute(Attribute, IModuleAttribute):
-	pass
+	__slots__ = []
 
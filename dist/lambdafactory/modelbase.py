@@ -20,6 +20,28 @@ from . import interfaces
 
 ANONYMOUS_SLOTS_INDEX = 0
 
+# The names of the model classes that the factory instanciates. They are
+# looked up in the factory module once, when the factory is created.
+IMPLEMENTATIONS = (
+	"DataFlow", "DataFlowSlot", "Program", "Interface", "Block", "WithBlock",
+	"Closure", "Function", "InstanceMethod", "Initializer", "Accessor",
+	"Mutator", "Constructor", "Destructor", "ClassMethod", "Class", "Trait",
+	"Singleton", "Module", "ImportSymbolOperation", "ImportSymbolsOperation",
+	"ImportModuleOperation", "ImportModulesOperation", "Type", "SlotConstraint",
+	"EnumerationType", "SymbolType", "Evaluation", "Allocation", "Assignment",
+	"Computation", "EventTrigger", "EventBind", "EventBindOnce", "EventUnbind",
+	"Invocation", "Instanciation", "Resolution", "Decomposition", "Selection",
+	"Chain", "TypeIdentification", "MatchProcessOperation",
+	"MatchExpressionOperation", "Iteration", "MapIteration", "FilterIteration",
+	"ReduceIteration", "Repetition", "AccessOperation", "SliceOperation",
+	"Enumeration", "Interpolation", "Termination", "Breaking", "Continue",
+	"NOP", "Except", "Interception", "Embed", "EmbedTemplate", "Comment",
+	"Documentation", "Annotation", "ImplicitReference", "Reference",
+	"AbsoluteReference", "TypeReference", "AnonymousReference", "Slot",
+	"Parameter", "Argument", "Attribute", "Event", "ClassAttribute",
+	"ModuleAttribute", "Operator", "Number", "String", "List", "Tuple", "Dict"
+)
+
 def assertImplements(v,i):
 	return True
 
@@ -43,11 +65,17 @@ class Factory:
 
 	For instance, if you define a module with classes like `Value`, `Literal`,
 	`Invocation`, `Function`, etc. you just have to give this module to the
-	factory constructor and it will be used to generate the given element."""
+	factory constructor and it will be used to generate the given element.
+
+	The implementation classes are bound once, when the factory is created,
+	so that creating an element does not need to look up the module."""
 
 
 	def __init__( self, module=model ):
 		self._module = module
+		self._implementations = {}
+		for name in IMPLEMENTATIONS:
+			self._implementations[name] = self._resolveImplementation(name)
 		self.MainFunction  = model.Constants.MainFunction
 		self.CurrentModule = model.Constants.CurrentModule
 		self.Constructor   = model.Constants.Constructor
@@ -63,128 +91,144 @@ class Factory:
 		else:
 			return name
 
-	def _getImplementation( self, name ):
+	def _resolveImplementation( self, name ):
+		"""Returns the class implementing the given name in the factory module.
+		When the module does not implement it, the returned function raises
+		a `ModelException` when invoked."""
 		if not hasattr(self._module, name ):
-			raise ModelException("Module %s does not implement: %s" % \
-			(self._module, name))
+			def not_implemented( *args ):
+				raise ModelException("Module %s does not implement: %s" % \
+				(self._module, name))
+			return not_implemented
 		else:
 			return getattr(self._module, name)
 
+	def _getImplementation( self, name ):
+		impl = self._implementations.get(name)
+		if impl is None:
+			impl = self._implementations[name] = self._resolveImplementation(name)
+		return impl
+
 	def createDataFlow( self, element, parent=None ):
-		return self._getImplementation("DataFlow")(element, parent)
+		return self._implementations["DataFlow"](element, parent)
 
 	def createDataFlowSlot( self, name, value, origin, slotType ):
-		return self._getImplementation("DataFlowSlot")(name,value,origin,slotType)
+		return self._implementations["DataFlowSlot"](name,value,origin,slotType)
 
 	def createProgram( self ):
-		p = self._getImplementation("Program")()
+		p = self._implementations["Program"]()
 		p.setFactory(self)
 		return p
 
 	def createInterface( self ):
-		return self._getImplementation("Interface")()
+		return self._implementations["Interface"]()
 
 	def createBlock( self, *operations ):
-		r = self._getImplementation("Block")()
-		if operations: list(map(r.addOperation, operations))
+		return self.createBlockFrom(operations)
+
+	def createBlockFrom( self, operations ):
+		"""Creates a block with the operations from the given iterable."""
+		r = self._implementations["Block"]()
+		for o in operations: r.addOperation(o)
 		return r
 
 	def withBlock( self, context, *operations ):
-		r = self._getImplementation("WithBlock")(context)
-		if operations: list(map(r.addOperation, operations))
+		r = self._implementations["WithBlock"](context)
+		for o in operations: r.addOperation(o)
+		return r
 
 	def createClosure( self, parameters, *operations ):
-		r = self._getImplementation("Closure")(parameters)
-		if operations: list(map(r.addOperation, operations))
+		r = self._implementations["Closure"](parameters)
+		for o in operations: r.addOperation(o)
 		return r
 
 	def createFunction( self, name, parameters=None ):
 		# FIXME: Implement optional parameters for all of that
 		name = self._processName(name)
-		return self._getImplementation("Function")(name, parameters)
+		return self._implementations["Function"](name, parameters)
 
 	def createMethod( self, name, parameters=None ):
 		name = self._processName(name)
-		return self._getImplementation("InstanceMethod")(name, parameters)
+		return self._implementations["InstanceMethod"](name, parameters)
 
 	def createInitializer( self, parameters=None ):
-		return self._getImplementation("Initializer")(parameters)
+		return self._implementations["Initializer"](parameters)
 
 	def createAccessor( self, name, parameters=None ):
 		name = self._processName(name)
-		return self._getImplementation("Accessor")(name, parameters)
+		return self._implementations["Accessor"](name, parameters)
 
 	def createMutator( self, name, parameters=None ):
 		name = self._processName(name)
-		return self._getImplementation("Mutator")(name, parameters)
+		return self._implementations["Mutator"](name, parameters)
 
 	def createConstructor( self, name=None, parameters=None ):
 		if parameters is None: parameters = name
-		return self._getImplementation("Constructor")(parameters)
+		return self._implementations["Constructor"](parameters)
 
 	def createDestructor( self ):
-		return self._getImplementation("Destructor")()
+		return self._implementations["Destructor"]()
 
 	def createClassMethod( self, name, parameters=() ):
 		name = self._processName(name)
-		return self._getImplementation("ClassMethod")(name, parameters)
+		return self._implementations["ClassMethod"](name, parameters)
 
 	def createClass( self, name, inherited=() ):
 		name = self._processName(name)
-		return self._getImplementation("Class")(name, inherited)
+		return self._implementations["Class"](name, inherited)
 
 	def createTrait( self, name, inherited=() ):
 		name = self._processName(name)
-		return self._getImplementation("Trait")(name, inherited)
+		return self._implementations["Trait"](name, inherited)
 
 	def createSingleton( self, name, inherited=() ):
 		name = self._processName(name)
-		return self._getImplementation("Singleton")(name, inherited)
+		return self._implementations["Singleton"](name, inherited)
 
 	def createInterface( self, name, inherited=() ):
-		return self._getImplementation("Interface")(name, inherited)
+		return self._implementations["Interface"](name, inherited)
 
 	def createModule( self, name ):
-		return self._getImplementation("Module")(name)
+		return self._implementations["Module"](name)
 
 	def importSymbol( self, name, origin, alias ):
-		return self._getImplementation("ImportSymbolOperation")(name, origin, alias)
+		return self._implementations["ImportSymbolOperation"](name, origin, alias)
 
 	def importSymbols( self, names, origin ):
-		return self._getImplementation("ImportSymbolsOperation")(names, origin)
+		return self._implementations["ImportSymbolsOperation"](names, origin)
 
 	def importModule( self, name, alias ):
-		return self._getImplementation("ImportModuleOperation")(name, alias)
+		return self._implementations["ImportModuleOperation"](name, alias)
 
 	def importModules( self, names ):
-		return self._getImplementation("ImportModulesOperation")(names)
+		return self._implementations["ImportModulesOperation"](names)
 
 	def type( self, name, parameters=None ):
-		return self._getImplementation("Type")(name, parameters)
+		return self._implementations["Type"](name, parameters)
 
 	def typeSlot( self, name, type=None ):
-		return self._getImplementation("SlotConstraint")(name, type)
+		return self._implementations["SlotConstraint"](name, type)
 
 	def enum( self, name, parameters=None ):
-		return self._getImplementation("EnumerationType")(name, parameters)
+		return self._implementations["EnumerationType"](name, parameters)
 
 	def symbol( self, name ):
-		return self._getImplementation("SymbolType")(name)
+		return self._implementations["SymbolType"](name)
 
 	def evaluate( self, evaluable ):
 		if type(evaluable) in (str, str): evaluable = self._ref(evaluable)
-		return self._getImplementation("Evaluation")(evaluable)
+		return self._implementations["Evaluation"](evaluable)
 
 	def allocate( self, slot, value=None ):
 		if type(slot) in (str, str): slot = self._slot(slot)
-		return self._getImplementation("Allocation")(slot, value)
+		return self._implementations["Allocation"](slot, value)
 
 	def assign( self, name, evaluable ):
 		if type(name) in (str, str): name = self._ref(name)
-		return self._getImplementation("Assignment")(name, evaluable)
+		return self._implementations["Assignment"](name, evaluable)
 
 	def compute( self, operatorName, leftOperand, rightOperand=None ):
-		return self._getImplementation("Computation")(operatorName, leftOperand, rightOperand)
+		return self._implementations["Computation"](operatorName, leftOperand, rightOperand)
 
 	# FIXME: ADD APPLICATION, which only takes values. Invocation takes
 	# parameters that can be named.
@@ -194,160 +238,154 @@ class Factory:
 		return self.invoke_args(evaluable, arguments)
 
 	def triggerEvent( self, scope, name, arguments ):
-		arguments = list(map(self._ensureArg,arguments or []))
-		return self._getImplementation("EventTrigger")(scope, name, arguments)
+		return self._implementations["EventTrigger"](scope, name, self._argsFrom(arguments or ()))
 
 	def bindEvent( self, scope, name, arguments ):
-		arguments = list(map(self._ensureArg,arguments or []))
-		return self._getImplementation("EventBind")(scope, name, arguments)
+		return self._implementations["EventBind"](scope, name, self._argsFrom(arguments or ()))
 
 	def bindEventOnce( self, scope, name, arguments ):
-		arguments = list(map(self._ensureArg,arguments or []))
-		return self._getImplementation("EventBindOnce")(scope, name, arguments)
+		return self._implementations["EventBindOnce"](scope, name, self._argsFrom(arguments or ()))
 
 	def unbindEvent( self, scope, name, arguments ):
-		arguments = list(map(self._ensureArg,arguments or []))
-		return self._getImplementation("EventUnbind")(scope, name, arguments)
+		return self._implementations["EventUnbind"](scope, name, self._argsFrom(arguments or ()))
 
 	def invoke_args( self, evaluable, arguments ):
-		arguments = list(map(self._ensureArg,arguments))
 		# FIXME: Arguments should not be a list, they should be wrapped in an
 		# arguments object that supports copy () and detach () properly
-		return self._getImplementation("Invocation")(evaluable, arguments)
+		return self._implementations["Invocation"](evaluable, self._argsFrom(arguments))
 
 	def instanciate( self, evaluable, *arguments ):
 		# FIXME: Same remark as for invoke_args?
-		arguments = list(map(self._ensureArg,arguments))
-		return self._getImplementation("Instanciation")(evaluable, arguments)
+		return self._implementations["Instanciation"](evaluable, self._argsFrom(arguments))
 
 	def resolve( self, reference, context=None ):
 		if type(reference) in (str, str): reference = self._ref(reference)
-		return self._getImplementation("Resolution")(reference, context)
+		return self._implementations["Resolution"](reference, context)
 
 	def decompose( self, reference, context=None ):
 		if type(reference) in (str, str): reference = self._ref(reference)
-		return self._getImplementation("Decomposition")(reference, context)
+		return self._implementations["Decomposition"](reference, context)
 
 	def select( self, *rules ):
-		s = self._getImplementation("Selection")()
-		if rules: list(map(s.addRule, rules))
+		s = self._implementations["Selection"]()
+		for r in rules: s.addRule(r)
 		return s
 
 	def chain( self, operator, target, *groups ):
-		s = self._getImplementation("Chain")()
+		s = self._implementations["Chain"]()
 		s.setOperator(operator)
 		s.setTarget(target)
-		if groups: list(map(s.addGroup, groups))
+		for g in groups: s.addGroup(g)
 		return s
 
 	def typeof( self, expression, type ):
-		return self._getImplementation("TypeIdentification")(expression, type)
+		return self._implementations["TypeIdentification"](expression, type)
 
 	def rule( self, evaluable, process ):
 		"""Alias for matchProcess"""
 		return self.matchProcess(evaluable, process)
 
 	def matchProcess( self, evaluable, process ):
-		return self._getImplementation("MatchProcessOperation")(evaluable, process)
+		return self._implementations["MatchProcessOperation"](evaluable, process)
 
 	def matchExpression( self, evaluable, expression ):
-		return self._getImplementation("MatchExpressionOperation")(evaluable, expression)
+		return self._implementations["MatchExpressionOperation"](evaluable, expression)
 
 	def iterate( self, evaluable, process ):
-		return self._getImplementation("Iteration")(evaluable, process)
+		return self._implementations["Iteration"](evaluable, process)
 
 	def map( self, evaluable, process ):
-		return self._getImplementation("MapIteration")(evaluable, process)
+		return self._implementations["MapIteration"](evaluable, process)
 
 	def filter( self, evaluable, condition, process=None ):
-		return self._getImplementation("FilterIteration")(evaluable, condition, process)
+		return self._implementations["FilterIteration"](evaluable, condition, process)
 
 	def reduce( self, evaluable, condition, process=None ):
-		return self._getImplementation("ReduceIteration")(evaluable, condition, process)
+		return self._implementations["ReduceIteration"](evaluable, condition, process)
 
 	def repeat( self, condition, process ):
-		return self._getImplementation("Repetition")(condition, process)
+		return self._implementations["Repetition"](condition, process)
 
 	def access( self, target, _index ):
-		return self._getImplementation("AccessOperation")(target, _index)
+		return self._implementations["AccessOperation"](target, _index)
 
 	def slice( self, target, _start, _end=None ):
 		_start = F._number(_start) if type(_start) in (int, float) else _start
 		_end   = F._number(_end)   if type(_end)   in (int, float) else _end
-		return self._getImplementation("SliceOperation")(target, _start, _end)
+		return self._implementations["SliceOperation"](target, _start, _end)
 
 	def enumerate( self, start, end, step=None ):
-		return self._getImplementation("Enumeration")(start, end, step)
+		return self._implementations["Enumeration"](start, end, step)
 
 	def interpolate( self, text, args ):
-		return self._getImplementation("Interpolation")(text, args)
+		return self._implementations["Interpolation"](text, args)
 
 	def returns( self, evaluable ):
-		return self._getImplementation("Termination")(evaluable)
+		return self._implementations["Termination"](evaluable)
 
 	def breaks( self ):
-		return self._getImplementation("Breaking")()
+		return self._implementations["Breaking"]()
 
 	def continues( self ):
-		return self._getImplementation("Continue")()
+		return self._implementations["Continue"]()
 
 	def nop( self ):
-		return self._getImplementation("NOP")()
+		return self._implementations["NOP"]()
 
 	def exception( self, exception ):
-		return self._getImplementation("Except")(exception)
+		return self._implementations["Except"](exception)
 
 	def intercept( self, tryProcess, catchProcess=None, finallyProcess=None ):
-		return self._getImplementation("Interception")(tryProcess, catchProcess, finallyProcess)
+		return self._implementations["Interception"](tryProcess, catchProcess, finallyProcess)
 
 	def embed(self, lang, code):
-		return self._getImplementation("Embed")(lang,code)
+		return self._implementations["Embed"](lang,code)
 
 	def embedTemplate(self, lang, code):
-		return self._getImplementation("EmbedTemplate")(lang,code)
+		return self._implementations["EmbedTemplate"](lang,code)
 
 	def comment( self, content ):
-		return self._getImplementation("Comment")(content)
+		return self._implementations["Comment"](content)
 
 	def doc( self, content ):
-		return self._getImplementation("Documentation")(content)
+		return self._implementations["Documentation"](content)
 
 	def annotation( self, name, content=None ):
-		return self._getImplementation("Annotation")(name, content)
+		return self._implementations["Annotation"](name, content)
 
 	def _implicitref( self, element=None ):
-		return self._getImplementation("ImplicitReference")(element)
+		return self._implementations["ImplicitReference"](element)
 
 	# FIXME: RENAME TO SYMBOL
 	def _ref( self, name ):
-		return self._getImplementation("Reference")(name)
+		return self._implementations["Reference"](name)
 
 	def _absref( self, name ):
-		return self._getImplementation("AbsoluteReference")(name)
+		return self._implementations["AbsoluteReference"](name)
 
 	def _typeref( self, name, parameters=None ):
-		return self._getImplementation("TypeReference")(name, parameters)
+		return self._implementations["TypeReference"](name, parameters)
 
 	def _symbol(self, name):
 		return self._absref(name)
 
 	def _anonref(self):
-		return self._getImplementation("AnonymousReference")()
+		return self._implementations["AnonymousReference"]()
 
 	def _slot( self, name=None, typeinfo=None ):
 		global ANONYMOUS_SLOTS_INDEX
 		if not name:
 			name = "__anonymous" + str(ANONYMOUS_SLOTS_INDEX)
 			ANONYMOUS_SLOTS_INDEX += 1
-		return self._getImplementation("Slot")(name, typeinfo)
+		return self._implementations["Slot"](name, typeinfo)
 
 	def _param( self, name, typeinfo=None, optional=False ):
-		arg = self._getImplementation("Parameter")(name, typeinfo)
+		arg = self._implementations["Parameter"](name, typeinfo)
 		arg.setOptional(optional)
 		return arg
 
 	def _arg( self, name=None, value=None, asList=False, asMap=False ):
-		param = self._getImplementation("Argument")(name,value)
+		param = self._implementations["Argument"](name,value)
 		if asList: param.setAsList()
 		if asMap:  param.setAsMap()
 		return param
@@ -356,7 +394,13 @@ class Factory:
 		if isinstance(value, interfaces.IArgument):
 			return value
 		else:
-			return self._arg(None, value)
+			return self._implementations["Argument"](None, value)
+
+	def _argsFrom( self, values ):
+		"""Returns a list of arguments from the given iterable, wrapping the
+		values that are not already `IArgument`s."""
+		argument = self._implementations["Argument"]
+		return [_ if isinstance(_, interfaces.IArgument) else argument(None, _) for _ in values]
 
 	def _ensureParam( self, value ):
 		if isinstance(value, interfaces.IParameter):
@@ -365,43 +409,49 @@ class Factory:
 			return self._param(None, value)
 
 	def _attr( self, name, typeinfo=None, value=None):
-		return self._getImplementation("Attribute")(name, typeinfo, value)
+		return self._implementations["Attribute"](name, typeinfo, value)
 
 	def _event( self, name, typeinfo=None, value=None):
-		return self._getImplementation("Event")(name, typeinfo, value)
+		return self._implementations["Event"](name, typeinfo, value)
 
 	def _classattr( self, name, typeinfo=None, value=None):
-		return self._getImplementation("ClassAttribute")(name, typeinfo, value)
+		return self._implementations["ClassAttribute"](name, typeinfo, value)
 
 	def _moduleattr( self, name, typeinfo=None, value=None):
-		return self._getImplementation("ModuleAttribute")(name, typeinfo, value)
+		return self._implementations["ModuleAttribute"](name, typeinfo, value)
 
 	def _op( self, symbol, priority=0 ):
-		return self._getImplementation("Operator")(symbol, priority)
+		return self._implementations["Operator"](symbol, priority)
 
 	def _number( self, number ):
-		return self._getImplementation("Number")(number)
+		return self._implementations["Number"](number)
 
 	def _string( self, value ):
-		return self._getImplementation("String")(value)
+		return self._implementations["String"](value)
 
 	def _list( self, *args ):
-		r = self._getImplementation("List")()
 		if len(args) == 1 and type(args[0]) in (list,tuple):
-			list(map(lambda a:r.addValue(a), args[0]))
-		else:
-			list(map(lambda a:r.addValue(a), args))
+			args = args[0]
+		return self._listFrom(args)
+
+	def _listFrom( self, values ):
+		"""Creates a list with the values from the given iterable."""
+		r = self._implementations["List"]()
+		for v in values: r.addValue(v)
 		return r
 
 	def _tuple( self, *args ):
-		r = self._getImplementation("Tuple")()
 		if len(args) == 1 and type(args[0]) in (list,tuple):
-			list(map(lambda a:r.addValue(a), args[0]))
-		else:
-			list(map(lambda a:r.addValue(a), args))
+			args = args[0]
+		return self._tupleFrom(args)
+
+	def _tupleFrom( self, values ):
+		"""Creates a tuple with the values from the given iterable."""
+		r = self._implementations["Tuple"]()
+		for v in values: r.addValue(v)
 		return r
 
 	def _dict( self ):
-		return self._getImplementation("Dict")()
+		return self._implementations["Dict"]()
 
 # EOF
@@ -37,13 +37,16 @@ Any                            = typecast.Any
 Rest                           = typecast.Rest
 Unresolved                     = typecast.Unresolved
 
-Data.Char                      = typecast.Cell(typecast.bits(8))
-Data.Integer                   = typecast.Cell(typecast.bits(32))
-Data.UnsignedInteger           = typecast.Cell(typecast.bits(32))
-Data.Long                      = typecast.Cell(typecast.bits(64))
-Data.Float                     = typecast.Cell(typecast.bits(32))
-Data.Double                    = typecast.Cell(typecast.bits(64))
-Data.String                    = typecast.Array(Data.Char)
+Data.Char                      = typecast.intern(typecast.Cell(typecast.bits(8),  "Char"))
+Data.Integer                   = typecast.intern(typecast.Cell(typecast.bits(32), "Integer"))
+Data.UnsignedInteger           = typecast.intern(typecast.Cell(typecast.bits(32), "UnsignedInteger"))
+Data.Long                      = typecast.intern(typecast.Cell(typecast.bits(64), "Long"))
+Data.Float                     = typecast.intern(typecast.Cell(typecast.bits(32), "Float"))
+Data.Double                    = typecast.intern(typecast.Cell(typecast.bits(64), "Double"))
+Data.Number                    = typecast.intern(typecast.Cell(typecast.bits(64), "Number"))
+Data.String                    = typecast.intern(typecast.Array(Data.Char, "String"))
+Data.List                      = typecast.intern(typecast.Array(Any))
+Data.Map                       = typecast.intern(typecast.Map())
 
 Operations.Operation           = typecast.Context("Operation")
 Operations.Computation         = Operations.Operation.subtype("Computation")
@@ -56,9 +59,9 @@ Structure.Module               = Structure.Context.subtype("Module")
 Structure.Class                = Structure.Context.subtype("Class")
 Structure.Interface            = Structure.Context.subtype("Interface")
 
-Behaviour.Closure              = typecast.Process()
-Behaviour.Function             = typecast.Process()
-Behaviour.Method               = typecast.Process()
+Behaviour.Closure              = typecast.intern(typecast.Process().subtype("Closure"))
+Behaviour.Function             = typecast.intern(Behaviour.Closure.subtype("Function"))
+Behaviour.Method               = typecast.intern(Behaviour.Function.subtype("Method"))
 
 Runtime.Instance               = typecast.Context()
 
@@ -66,65 +69,64 @@ def typeForValue( value, noneIs=Nothing ):
 	"""Associates a type with the given value. This basically creates a typecast
 	instance/subtype, using the types defined in this module, using the given
 	value which is a program element (implements interfaces defined in
-	LF 'interfaces' module)."""
+	LF 'interfaces' module).
+
+	Modules, classes, interfaces and closures are given their own type, which
+	has the value as concrete type, while the other types are interned (see
+	`typecast.intern`) and thus shared by all the values of the same type.
+	The processes of closures are subtypes of `Behaviour.Closure`,
+	`Behaviour.Function` or `Behaviour.Method`, and their arguments are
+	interned."""
 	res = None
 	if value is None:
 		return noneIs
 	if hasattr(value, "_lf_type"): return value._lf_type
 	if isinstance(value, interfaces.IOperation):
-		res = Operations.getType(value.__class__.__name__)
 		res = Any
 	elif isinstance(value, interfaces.IModule):
-		res = Structure.Module.clone()
+		res = Structure.Module.subtype(value.getName())
 	elif isinstance(value, interfaces.IClass):
-		res = Structure.Class.clone()
-		res.setName(value.getName())
+		res = Structure.Class.subtype(value.getName())
 	elif isinstance(value, interfaces.IInterface):
-		res = Structure.Interface.clone()
-		res.setName(value.getName())
-	elif isinstance(value, interfaces.IFunction):
-		res = Behaviour.Function.clone()
+		res = Structure.Interface.subtype(value.getName())
 	elif isinstance(value, interfaces.IClosure):
-		res = Behaviour.Closure.clone()
-	elif isinstance(value, interfaces.IArgument):
-		default = value.getDefaultValue()
-		if default is None: res = Any
-		else: res = typeForValue(default, Any)
-	elif isinstance(value, interfaces.IAttribute):
-		default = value.getDefaultValue()
-		if default is None: res = Any
-		else: res = typeForValue(default, Any)
+		# The result is Any by default
+		# FIXME: We should constrain the types at a later point
+		res = typecast.Process(*([typeForValue(_, Any) or Any for _ in value.getArguments()] + [Any]))
+		res.addParent(Behaviour.Method if isinstance(value, interfaces.IMethod) else Behaviour.Function if isinstance(value, interfaces.IFunction) else Behaviour.Closure)
+	elif isinstance(value, interfaces.IArgument) or isinstance(value, interfaces.IParameter) or isinstance(value, interfaces.IAttribute):
+		res = typeForValue(value.getDefaultValue(), Any)
 	elif isinstance(value, interfaces.IReference):
 		res = Any
 	elif isinstance(value, interfaces.IList):
-		list_interface = CATALOG.get("DataTypes.List")
-		res = typeForValue(list_interface)
+		res = typeFromCatalog("DataTypes.List") or Data.List
 	elif isinstance(value, interfaces.IDict):
-		map_interface = CATALOG.get("DataTypes.Map")
-		res = typeForValue(map_interface)
+		res = typeFromCatalog("DataTypes.Map") or Data.Map
 	elif isinstance(value, interfaces.IString):
-		map_interface = CATALOG.get("DataTypes.String")
-		res = typeForValue(map_interface)
+		res = typeFromCatalog("DataTypes.String") or Data.String
 	elif isinstance(value, interfaces.INumber):
-		res = Any
+		res = Data.Number
 	if res is None:
 		return
 		#raise Exception("No abstract type for Python value: %s" % (value))
-	# When the type is a context, we populate its slots
-	if isinstance(value, interfaces.IClosure):
-		# We add the arguments
-		for arg in value.getArguments():
-			res.add(typeForValue(arg))
-		# We add the return type (Any by default)
-		# FIXME: We should constrain the types at a later point
-		res.add(Any)
-	if isinstance(value, interfaces.IContext):
-		assert isinstance(res, typecast.Context) or isinstance(res, typecast.Process)
-		for slot, slot_value in value.getSlots():
-			res.set(slot, typeForValue(slot_value))
 	# We cache the abstract type
 	value._lf_type = res
-	res.setConcreteType(value)
+	if isinstance(res, typecast.Context) or isinstance(res, typecast.Process):
+		res.setConcreteType(value)
+	# When the type is a context, we populate its slots
+	if isinstance(res, typecast.Context):
+		for slot in value.getSlots():
+			slot_type = typeForValue(slot[1])
+			if slot_type and slot_type is not Nothing:
+				res.set(slot[0], slot_type)
 	return res
 
+def typeFromCatalog( name ):
+	"""Returns the type of the element with the given name in the catalog
+	populated by the typer, if any."""
+	if CATALOG and name in CATALOG.catalog:
+		return typeForValue(CATALOG.get(name))
+	else:
+		return None
+
 # EOF
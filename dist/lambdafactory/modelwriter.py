@@ -6,31 +6,53 @@ __module__ = sys.modules[__name__]
 import lambdafactory.interfaces as interfaces
 from lambdafactory.model import isString, ensureUnicode
 from lambdafactory.passes import Pass
-from lambdafactory.splitter import SNIP
-import string, types
+from lambdafactory.reporter import DefaultReporter
+from lambdafactory.splitter import SNIP, SNIP_START
+import string, types, multiprocessing
 __module_name__ = 'lambdafactory.modelwriter'
 PREFIX = u'\t'
-def _format (value, level=None):
-	""" Format helper operation. See @format"""
+PARALLEL_WRITER = None
+def _format (value, level=None, items=None):
+	""" Format helper operation, that adds the `(level, value)` items of the given
+	 value to the `items` list. See @format"""
 	self=__module__
 	if level is None: level = -1
+	if items is None: items = []
 	if type(value) in (list, tuple, types.GeneratorType):
-		res = []
 		for v in value:
 			if v is None: continue
-			res.extend(_format(v, level+1))
-		return res
-	else:
-		if value is None: return u""
-		assert isString(value), "Type not suitable for formatting: %s" % (value)
-		return [u"\n".join((max(0,level)*PREFIX)+ensureUnicode(v) for v in value.split("\n"))]
+			_format(v, level+1, items)
+	elif value is not None:
+		if value.__class__ is not Rope:
+			assert isString(value), "Type not suitable for formatting: %s" % (value)
+			value = ensureUnicode(value)
+		items.append((max(0,level), value))
+	return items
 
 
 def format (*values):
-	""" Formats a combination of string ang tuples. Strings are joined by
-	 newlines, and the content of the inner tuples gets indented"""
+	""" Formats a combination of strings, ropes and tuples as a rope. Strings are
+	 joined by newlines, and the content of the inner tuples gets indented"""
+	self=__module__
+	items = _format(values)
+	if len(items) == 1 and items[0][0] == 0 and items[0][1].__class__ is Rope:
+		return items[0][1]
+	return Rope(items)
+
+
+def join (separator, values):
+	""" Joins the given strings and ropes with the given separator. This returns
+	 a string when there are only strings, and an inline rope otherwise."""
 	self=__module__
-	return u"\n".join(_format(values))
+	values = list(values)
+	for value in values:
+		if value.__class__ is Rope:
+			items = []
+			for i, v in enumerate(values):
+				if i: items.append((0, separator))
+				items.append((0, v))
+			return Rope(items, True)
+	return separator.join(values)
 
 
 def _flatten (value, res):
@@ -57,8 +79,172 @@ def notEmpty (p):
 	return ((p and p) or None)
 
 
+def _writeParallelModule (index):
+	""" Writes the module at the given index in `PARALLEL_WRITER`. This is invoked
+	 in the forked worker processes of `AbstractWriter.stream`, and returns the
+	 text of the module along with the `(kind, message, element)` reports made
+	 while writing it, so that the parent process can report them."""
+	self=__module__
+	writer, modules = PARALLEL_WRITER
+	report  = writer.environment.report if writer.environment else DefaultReporter
+	reports = []
+	on_error, on_warning = report._onError, report._onWarning
+	report._onError   = [lambda message: reports.append(("error", message, None))]
+	report._onWarning = [lambda message, element: reports.append(("warning", message, str(element)))]
+	try:
+		writer.resetModuleState()
+		return writer.writeModule(modules[index]), reports
+	finally:
+		report._onError, report._onWarning = on_error, on_warning
+
+
+def _isLineComment (text):
+	""" Tells if the given text holds `//` line comments and empty lines only,
+	 where none of the comments is a SNIP line of the splitter."""
+	self=__module__
+	res = False
+	for line in text.split("\n"):
+		line = line.strip()
+		if not line:
+			continue
+		elif not line.startswith("//") or line[2:].lstrip().startswith(SNIP_START):
+			return False
+		res = True
+	return res
+
+
+class Rope:
+	""" A rope is a tree of output segments that is only serialized, and indented,
+	 once: when it is converted to a string. Writers return ropes (see @format)
+	 so that the code of nested elements is not split and re-indented at every
+	 level of nesting.
+	
+	 The items of a rope are `(level, value)` couples, where the value is either
+	 a string or a rope. Block ropes put each of their items on a new line,
+	 indented by the item's level, while inline ropes (created by adding a
+	 string to a rope, or by @join) concatenate their items. Ropes support the
+	 string operations that writers use on their output, other string methods
+	 being forwarded to the serialized text."""
+	__slots__ = [u'items', u'inline', u'_text']
+	def __init__ (self, items=None, inline=None):
+		self.items = None
+		self.inline = False
+		self._text = None
+		if inline is None: inline = False
+		self.items = (items or [])
+		self.inline = inline
+	
+	def _emit(self, out, level, opened):
+		""" Appends the serialized text of this rope to the `out` list, indented at
+		 the given `level`. When `opened` is true, the first line of the rope
+		 continues the last line of `out`."""
+		items = self.items
+		if not items:
+			if not opened: out.append(u"\n" + level * PREFIX)
+			return out
+		inline = self.inline
+		for indent, value in items:
+			if value.__class__ is Rope:
+				if opened and indent: out.append(indent * PREFIX)
+				value._emit(out, level + indent, opened)
+			else:
+				prefix = (level + indent) * PREFIX
+				if prefix and "\n" in value: value = value.replace("\n", "\n" + prefix)
+				out.append(indent * PREFIX + value if opened else u"\n" + prefix + value)
+			opened = inline
+		return out
+	
+	def _emitCompact(self, out, opened):
+		""" Like `_emit`, but without indentation and skipping the string items
+		 that start a line and only hold line comments (see `compact`), and the
+		 line breaks around the strings that start a line. Line breaks are
+		 appended as the `"\n"` items."""
+		items = self.items
+		if not items:
+			if not opened: out.append(u"\n")
+			return out
+		inline = self.inline
+		for indent, value in items:
+			if value.__class__ is Rope:
+				value._emitCompact(out, opened)
+			elif opened:
+				out.append(value)
+			elif not _isLineComment(value):
+				out.append(u"\n")
+				out.append(value.strip("\n"))
+			opened = inline
+		return out
+	
+	def compact(self):
+		""" Returns the text of this rope without indentation, empty lines and line
+		 comments, as used to minify the output. Only whole items are removed,
+		 and the strings are kept as they are, so that multi-line literals and
+		 embedded code are never altered. The splitter's SNIP lines are kept."""
+		res = []
+		for value in self._emitCompact([], True):
+			if value != u"\n" or (res and res[-1] != u"\n"):
+				res.append(value)
+		if res and res[0] == u"\n": res.pop(0)
+		if res and res[-1] == u"\n": res.pop()
+		return u"".join(res)
+	
+	def __str__(self):
+		if self._text is None:
+			self._text = u"".join(self._emit([], 0, True))
+		return self._text
+	
+	def __add__(self, other):
+		if not (isString(other) or other.__class__ is Rope): return NotImplemented
+		return Rope((self.items if self.inline else [(0, self)]) + [(0, other)], True)
+	
+	def __radd__(self, other):
+		if not isString(other): return NotImplemented
+		return Rope([(0, other)] + (self.items if self.inline else [(0, self)]), True)
+	
+	def __bool__(self):
+		for indent, value in self.items:
+			if indent or value: return True
+		return len(self.items) > 1 and not self.inline
+	
+	def __len__(self):
+		return len(str(self))
+	
+	def __eq__(self, other):
+		if isinstance(other, Rope):
+			other = str(other)
+		return (str(self) == other)
+	
+	def __ne__(self, other):
+		return (not (self == other))
+	
+	def __hash__(self):
+		return hash(str(self))
+	
+	def __getitem__(self, index):
+		return str(self)[index]
+	
+	def __contains__(self, value):
+		if isinstance(value, Rope):
+			value = str(value)
+		return (value in str(self))
+	
+	def __iter__(self):
+		return iter(str(self))
+	
+	def __format__(self, spec):
+		return str(self).__format__(spec)
+	
+	def __getattr__(self, name):
+		if name.startswith("_"): raise AttributeError(name)
+		return getattr(str(self), name)
+	
+	def __repr__(self):
+		return ((u'<Rope ' + repr(str(self))) + u'>')
+	
+
 class AbstractWriter(Pass):
 	HANDLES = [interfaces.IProgram, interfaces.ISingleton, interfaces.ITrait, interfaces.IClass, interfaces.IModule, interfaces.IAccessor, interfaces.IMutator, interfaces.IDestructor, interfaces.IConstructor, interfaces.IClassMethod, interfaces.IMethod, interfaces.IInitializer, interfaces.IFunction, interfaces.IClosure, interfaces.IWithBlock, interfaces.IBlock, interfaces.IModuleAttribute, interfaces.IClassAttribute, interfaces.IEnumerationType, interfaces.IType, interfaces.IEvent, interfaces.IAttribute, interfaces.IArgument, interfaces.IParameter, interfaces.IOperator, interfaces.IImplicitReference, interfaces.IReference, interfaces.INumber, interfaces.IString, interfaces.IList, interfaces.IDict, interfaces.IInterpolation, interfaces.IEnumeration, interfaces.IAllocation, interfaces.IAssignment, interfaces.IComputation, interfaces.IEventTrigger, interfaces.IEventBindOnce, interfaces.IEventBind, interfaces.IEventUnbind, interfaces.IInvocation, interfaces.IInstanciation, interfaces.IDecomposition, interfaces.IResolution, interfaces.IChain, interfaces.ISelection, interfaces.IRepetition, interfaces.IFilterIteration, interfaces.IMapIteration, interfaces.IReduceIteration, interfaces.IIteration, interfaces.IAccessOperation, interfaces.ISliceOperation, interfaces.ITypeIdentification, interfaces.IEvaluation, interfaces.ITermination, interfaces.INOP, interfaces.IBreaking, interfaces.IContinue, interfaces.IExcept, interfaces.IInterception, interfaces.IImportSymbolOperation, interfaces.IImportSymbolsOperation, interfaces.IImportModuleOperation, interfaces.IImportModulesOperation, interfaces.IEmbed]
+	DISPATCH = {}
 	def __init__ (self):
 		self._generatedSymbols = {}
 		Pass.__init__(self)
@@ -83,7 +269,7 @@ class AbstractWriter(Pass):
 	
 	def lines(self, value, prefix=None):
 		if prefix is None: prefix = u''
-		if isString(value):
+		if isString(value) or value.__class__ is Rope:
 			yield prefix + value
 		elif type(value) in (tuple, list, types.GeneratorType):
 			for _ in value:
@@ -97,46 +283,136 @@ class AbstractWriter(Pass):
 		if (element is None):
 			return u''
 		elif True:
-			if isString(element):
+			if (isString(element) or isinstance(element, Rope)):
 				return element
 			elif ((type(element) is list) or (type(element) is tuple)):
-				return u"\n".join(self.write(_) for _ in element)
+				return Rope([(0, self.write(_)) for _ in element])
 			elif element.hasAnnotation(u'shadow'):
 				return u''
 			elif True:
-				this_interfaces = self.HANDLES
-				for  the_interface in this_interfaces:
-					name = the_interface.__name__[1:]
-					if isinstance(element, the_interface):
-						if not hasattr(self, "on" + name ):
-							raise Exception("Writer does not define write method for: " + name + " in " + str(self))
-						else:
-							self.context.append(element)
-							result = getattr(self, "on" + name)(element)
-							self.context.pop()
-							# We support write rules returning generators
-							if type(result) is types.GeneratorType:
-								result = u"\n".join(_format(result, -2))
-							return result
-				raise Exception("Element implements unsupported interface: " + str(element))
+				# The handler is only looked up in HANDLES once per writer and
+				# element class.
+				key     = (self.__class__, element.__class__)
+				handler = self.DISPATCH.get(key)
+				if handler is None:
+					handler = self.DISPATCH[key] = self._resolveHandler(element)
+				context = self.context
+				context.append(element)
+				result = handler(self, element)
+				context.pop()
+				# We support write rules returning generators
+				if result.__class__ is types.GeneratorType:
+					result = Rope(_format(result, -2))
+				return result
+	
+	def _resolveHandler(self, element):
+		""" Returns the `onXXX` function of this writer's class that writes the given
+		 element, where `XXX` is the name of the first interface in `HANDLES`
+		 that the element implements."""
+		for interface in self.HANDLES:
+			if isinstance(element, interface):
+				name=interface.__name__[1:]
+				if (not hasattr(self, (u'on' + name))):
+					raise Exception(((((u'Writer does not define write method for: ' + name) + u' in ') + str(self)) + u''))
+				return getattr(self.__class__, (u'on' + name))
+		raise Exception((u'Element implements unsupported interface: ' + str(element)))
 	
 	def run(self, program):
 		self.program = program
-		return self.write(program)
+		result=self.write(program)
+		if isinstance(result, Rope):
+			return str(result)
+		elif True:
+			return result
+	
+	def stream(self, program, processes=None):
+		""" Writes the given program one module at a time, yielding the text of each
+		 module as soon as it is written. Joining the yielded texts with newlines
+		 gives the same output as `run`, without holding the whole program text
+		 in memory.
+		
+		 When more than one process is given (and the platform can fork), the
+		 modules are written by a pool of processes forked after the passes, so
+		 that they share the program model copy-on-write. The texts are still
+		 yielded in the order given by `getWrittenModules`, and the errors and
+		 warnings reported by the workers are reported again by this process, as
+		 they are received. The writer is reset (see `resetModuleState`) before
+		 each module, so that the output of a module does not depend on the
+		 number of processes nor on the process that writes it."""
+		if processes is None: processes = 0
+		self.program = program
+		self.context.append(program)
+		modules=self.getWrittenModules(program)
+		if (((processes > 1) and (len(modules) > 1)) and (u'fork' in multiprocessing.get_all_start_methods())):
+			global PARALLEL_WRITER
+			PARALLEL_WRITER = (self, modules)
+			try:
+				with multiprocessing.get_context("fork").Pool(min(processes, len(modules))) as pool:
+					report = self.environment.report if self.environment else DefaultReporter
+					for text, reports in pool.imap(_writeParallelModule, range(len(modules))):
+						for kind, message, element in reports:
+							if kind == "error":
+								report.error(*message)
+							else:
+								report.warning(message, element)
+						if text:
+							yield text
+			finally:
+				PARALLEL_WRITER = None
+		elif True:
+			for module in modules:
+				self.resetModuleState()
+				text=self.writeModule(module)
+				if text:
+					yield text
+		self.context.pop()
+	
+	def resetModuleState(self):
+		""" Resets the state that the writer carries over from a module to the next,
+		 which is done before each module (see `stream`)."""
+		pass
+	
+	def writeModule(self, module):
+		""" Writes the given module, returning its text as a string."""
+		text=self.write(module)
+		if isinstance(text, Rope):
+			return str(text)
+		elif text:
+			return text
+		elif True:
+			return u''
+	
+	def getWrittenModules(self, program):
+		""" Returns the modules of the given program that are to be written, in
+		 the order in which they are written. Imported modules are not written,
+		 and the others come after the modules they import (see
+		 `Environment.getModuleGraph`), so that modules can use the modules
+		 they import when loaded."""
+		modules=[]
+		ordered=program.getModules()
+		if self.environment:
+			ordered = self.environment.getModuleGraph(program).getOrder()
+		for module in ordered:
+			if (not module.isImported()):
+				modules.append(module)
+		return modules
 	
 	def onProgram(self, element):
 		""" Writes a Program element"""
 		lines=[]
-		for module in element.getModules():
-			if (not module.isImported()):
-				line=self.write(module)
-				if line:
-					lines.append(line)
-		return u'\n'.join(lines)
+		for module in self.getWrittenModules(element):
+			self.resetModuleState()
+			line=self.write(module)
+			if line:
+				lines.append(line)
+		return self._join(u'\n', lines)
 	
 	def _format(self, *values):
 		return format(*values)
 	
+	def _join(self, separator, values):
+		return join(separator, values)
+	
 	def _expand(self, values, kw):
 		return [string.Template(_).substitute(**kw) for _ in values]
 	
@@ -5,10 +5,37 @@ import sys
 __module__ = sys.modules[__name__]
 import lambdafactory.reporter as reporter
 import lambdafactory.interfaces as interfaces
-import json, os
+import json, os, math, re
 __module_name__ = 'lambdafactory.passes'
 ERR_NO_DATAFLOW_AVAILABLE = u'ERR_NO_DATAFLOW_AVAILABLE'
 ERR_PASS_HANDLER_NOT_DEFINED = u'ERR_PASS_HANDLER_NOT_DEFINED'
+MAX_SAFE_INTEGER = 9007199254740991
+def isNumber (value):
+	""" Tells if the given Python value is a number, booleans excluded."""
+	self=__module__
+	return (isinstance(value, (int, float)) or type(value).__name__ == "long") and not isinstance(value, bool)
+
+
+def isText (value):
+	""" Tells if the given Python value is a (unicode) string."""
+	self=__module__
+	return isinstance(value, str) or type(value).__name__ == "unicode"
+
+
+def isConstantValue (value):
+	""" Tells if the given Python value is a boolean, number or string that
+	 is written and evaluated the same way in JavaScript and Python."""
+	self=__module__
+	if isinstance(value, bool):
+		return True
+	elif isinstance(value, float):
+		return not (math.isinf(value) or math.isnan(value)) and float(str(value)) == value
+	elif isNumber(value):
+		return abs(value) <= MAX_SAFE_INTEGER
+	else:
+		return isText(value)
+
+
 class PassContext:
 	""" The 'PassContext' represents the current state of one or more passes when
 	 walking the program. It offers access to the 'environment' (gives access
@@ -360,6 +387,76 @@ class PassContext:
 		if content is None: content = None
 		value.addAnnotation(self.environment.factory.annotation(name, content))
 	
+	def replace(self, element, value):
+		""" Replaces the given element by the given value in the element's parent,
+		 which can be an operation, a process, a list, a dict, an argument or
+		 a slot. Returns the value, or `None` if the element was not found."""
+		parent=element.parent
+		found=False
+		def replace_in(values):
+			for i, v in enumerate(values):
+				if v is element:
+					values[i] = value
+					return True
+				elif type(v) is list and replace_in(v):
+					return True
+			return False
+		if isinstance(parent, interfaces.IOperation):
+			found = replace_in(parent.getOpArguments())
+		elif isinstance(parent, interfaces.IProcess):
+			found = replace_in(parent.getOperations())
+		elif isinstance(parent, interfaces.IList):
+			found = replace_in(parent.getValues())
+		elif isinstance(parent, interfaces.IDict):
+			found = replace_in(parent.getItems())
+		elif isinstance(parent, interfaces.IArgument) and parent.getValue() is element:
+			parent.setValue(value)
+			found = True
+		elif isinstance(parent, interfaces.ISlot) and parent.getDefaultValue() is element:
+			parent.setDefaultValue(value)
+			found = True
+		if (not found):
+			return None
+		element.detach()
+		value.setParent(parent)
+		return value
+	
+	def getElements(self, element):
+		""" Returns the given element and the elements it contains, in the order
+		 in which `walk` visits them."""
+		res=[]
+		stack = [element]
+		while stack:
+			e = stack.pop()
+			if not isinstance(e, interfaces.IElement): continue
+			res.append(e)
+			children = []
+			if isinstance(e, interfaces.IProgram):
+				children.extend(e.getModules())
+			if isinstance(e, interfaces.IContext):
+				for slot in e.getSlots(): children.extend(slot[1:4])
+			if isinstance(e, interfaces.IProcess):
+				children.extend(e.getOperations())
+			if isinstance(e, interfaces.IAttribute):
+				children.append(e.getDefaultValue())
+			if isinstance(e, interfaces.IOperation):
+				for a in e.getOpArguments():
+					children.extend(a if type(a) in (tuple, list) else [a])
+			if isinstance(e, interfaces.IList):
+				children.extend(e.getValues())
+			if isinstance(e, interfaces.IDict):
+				for item in e.getItems(): children.extend(item)
+			if isinstance(e, interfaces.IArgument):
+				children.append(e.getValue())
+			stack.extend(reversed(children))
+		return res
+	
+	def _getDataFlow(self, element):
+		""" Returns the dataflow of the closest element (or ancestor) that has one."""
+		while (element and (not element.getDataFlow())):
+			element = element.parent
+		return (element and element.getDataFlow())
+	
 	def resolve(self, referenceOrName, contextOrDataFlow=None):
 		""" Resolves the given 'IReference' or String sing the given context
 		 ('IContext') or dataflow ('IDataFlow'). This usually requires that
@@ -626,107 +723,190 @@ class TransformAsynchronousInvocations(Pass):
 	NAME = u'AsynchronousInvocationsExpansion'
 
 class CountReferences(Pass):
-	""" This pass adds "refcount" and "referers" annotations to all the referenced
-	 elements by handling every 'IReference' element.
+	""" This pass builds the reference graph of the program and adds "refcount"
+	 and "referers" annotations to its nodes, the referers being the reached
+	 nodes that reference them.
+	
+	 The nodes are the modules, the classes and the values of their slots,
+	 identified by their index in `nodes`. The edges (adjacency sets indexed
+	 by node id in `edges`) go from the node enclosing each 'IReference' to
+	 the node of the referenced element (and to the resolved slot for each
+	 'IResolution' in a module or a class), from each slot value to its module
+	 or class, from each class to its slots and parents, and from each module
+	 to its attributes and its init and main functions. Once the program is
+	 walked, the nodes reachable from the entry points (listed in the
+	 `entryPoints` option file, `.entrypoints` by default) are found using
+	 a worklist, and the other nodes get a `refcount` of 0.
 	
 	 This is the first pass to be applied before actually removing the dead
 	 code."""
-	HANDLES = [interfaces.IProgram, interfaces.IReference]
+	HANDLES = [interfaces.IProgram, interfaces.IModule, interfaces.IClass, interfaces.IResolution, interfaces.IReference]
 	NAME = u'CountReferences'
+	def __init__ (self):
+		self.nodes = []
+		self.ids = {}
+		self.edges = []
+		self.entries = []
+		self.entryPoints = []
+		Pass.__init__(self)
+	
+	def run(self, program):
+		""" Walks the program to build the reference graph, and then annotates
+		 the nodes reachable from the entry points."""
+		self.nodes = []
+		self.ids = {}
+		self.edges = []
+		self.entries = []
+		self.entryPoints = []
+		Pass.run(self, program)
+		referers=self._reach(self.entries, program)
+		for i in range(len(self.nodes)):
+			r=referers[i]
+			if (r is None):
+				self.annotate(self.nodes[i], u'refcount', 0)
+				self.annotate(self.nodes[i], u'referers', [])
+			elif True:
+				self.annotate(self.nodes[i], u'refcount', len(r))
+				self.annotate(self.nodes[i], u'referers', r)
+	
 	def onProgram(self, element):
-		""" Resolves all the entry points in the program, and add the given
-		 referers to it (the program)"""
+		""" Resolves all the entry points in the program. Each entry point is
+		 registered in `entryPoints` as a `[name, [node id]]` couple."""
 		entries_path=(self.getOption(u'entryPoints') or u'.entrypoints')
 		entry_points=[]
 		if entries_path:
 			if os.path.exists(entries_path):
 				with open(entries_path, 'rt') as f:
 					entry_points = [_.strip() for _ in f.readlines() if _.strip() and _.strip()[0]!="#"]
-		entries=[]
 		for entry in entry_points:
-			entries = (entries + self.getEntries(self.resolveAbsolute(entry)[1]))
-		for entry in entries:
-			self.addReferer(entry, element)
-		return False
+			roots=[]
+			for e in self.getEntries(self.resolveAbsolute(entry)[1]):
+				roots.append(self.getNode(e))
+			self.entries.extend(roots)
+			self.entryPoints.append([entry, roots])
+	
+	def onModule(self, element):
+		node=self.getNode(element)
+		for k_v in element.getSlots():
+			value=k_v[1]
+			if value:
+				slot_node=self.getNode(value)
+				self.addEdge(slot_node, node)
+				if ((isinstance(value, interfaces.IAttribute) or (k_v[0] == interfaces.Constants.ModuleInit)) or (k_v[0] == interfaces.Constants.MainFunction)):
+					self.addEdge(node, slot_node)
+	
+	def onClass(self, element):
+		node=self.getNode(element)
+		for k_v in element.getSlots():
+			if k_v[1]:
+				slot_node=self.getNode(k_v[1])
+				self.addEdge(slot_node, node)
+				self.addEdge(node, slot_node)
+		for p in self.getClassParents(element):
+			if isinstance(p, interfaces.IClass):
+				self.addEdge(node, self.getNode(p))
+	
+	def onReference(self, reference):
+		if self.isIn(interfaces.IOperation):
+			target=self.getParentConstruct(self.resolve(reference)[1])
+			source=self.getContextConstruct()
+			if (target and source):
+				self.addEdge(self.getNode(source), self.getNode(target))
+	
+	def onResolution(self, resolution):
+		""" Resolutions of a slot in a module or a class (like `module.slot`)
+		 reference the value of the slot."""
+		context=resolution.getContext()
+		if isinstance(context, interfaces.IReference):
+			value=self.resolve(context)[1]
+			name=resolution.getReference().getReferenceName()
+			source=self.getContextConstruct()
+			if (((isinstance(value, interfaces.IModule) or isinstance(value, interfaces.IClass)) and value.hasSlot(name)) and source):
+				target=value.getSlot(name)
+				if target:
+					self.addEdge(self.getNode(source), self.getNode(target))
 	
 	def getEntries(self, element):
 		""" If an entry is a class or module, we'll get all the symbols defined there (and for the
 		 parent classes as well)."""
 		res=[]
-		if (isinstance(element, interfaces.IModule) or isinstance(element, interfaces.IClass)):
-			res.append(element)
-			for k_v in element.getSlots():
-				res = (res + self.getEntries(k_v[1]))
-			if isinstance(element, interfaces.IClass):
-				for p in self.getClassParents(element):
-					res = (res + self.getEntries(p))
-		elif element:
-			res.append(element)
+		visited={}
+		pending=[element]
+		while pending:
+			e=pending.pop()
+			if (e and (e not in visited)):
+				visited[e] = True
+				res.append(e)
+				if (isinstance(e, interfaces.IModule) or isinstance(e, interfaces.IClass)):
+					for k_v in e.getSlots():
+						pending.append(k_v[1])
+				if isinstance(e, interfaces.IClass):
+					for p in self.getClassParents(e):
+						if isinstance(p, interfaces.IClass):
+							pending.append(p)
 		return res
 	
-	def addReferer(self, element, context=None):
-		""" Adds the given `context` as a referer to the given element."""
-		if context is None: context = self.getCurrentContext()
-		parent=element.parent
-		while parent:
-			self._increaseRefCount(parent, element)
-			parent = parent.parent
-		if (not self._increaseRefCount(element, context)):
-			self.walk(element)
-		if isinstance(element, interfaces.IClass):
-			for p in self.getClassParents(element):
-				self.addReferer(p, element)
-	
-	def _increaseRefCount(self, element, context=None):
-		""" Adds the given `context` as a referer of the given `element`
-		 element. This updates the `refcount` and `referers` annotations.
-		 Returns `True` if the `element` already has a referer, `False`
-		 otherwise."""
-		if context is None: context = None
-		refcount=element.getAnnotation(u'refcount')
-		referers=element.getAnnotation(u'referers')
-		if refcount:
-			referers = referers.getContent()
-			if (context and (context not in referers)):
-				refcount.setContent((refcount.getContent() + 1))
-				referers.append(context)
+	def getNode(self, element):
+		""" Returns the id of the node for the given element, creating it if
+		 necessary."""
+		node=self.ids.get(element)
+		if (node is None):
+			node = len(self.nodes)
+			self.ids[element] = node
+			self.nodes.append(element)
+			self.edges.append(set())
+		return node
+	
+	def addEdge(self, source, destination):
+		self.edges[source].add(destination)
+	
+	def isNode(self, element):
+		""" Tells if the given element is a node of the reference graph, that
+		 is a module, a class or the value of one of their slots."""
+		if (isinstance(element, interfaces.IModule) or isinstance(element, interfaces.IClass)):
 			return True
 		elif True:
-			self.annotate(element, u'refcount', 1)
-			if context:
-				referers = [context]
-			elif True:
-				referers = []
-			self.annotate(element, u'referers', referers)
-			return False
-	
-	def onReference(self, reference):
-		if self.isIn(interfaces.IOperation):
-			slot_and_value=self.resolve(reference)
-			value=self.getParentConstruct(slot_and_value[1])
-			if value:
-				self.addReferer(value, self.getContextConstruct())
+			parent=element.parent
+			return (isinstance(parent, interfaces.IModule) or isinstance(parent, interfaces.IClass))
 	
 	def getContextConstruct(self):
+		""" Returns the innermost node in the current context"""
 		for p in reversed(self.context):
-			if self.isConstruct(p):
+			if (p and self.isNode(p)):
 				return p
 		return None
 	
-	def isConstruct(self, value):
-		return (value and ((isinstance(value, interfaces.IConstruct) or isinstance(value, interfaces.IFunction)) or isinstance(value, interfaces.ISlot)))
-	
 	def getParentConstruct(self, value):
-		if (not value):
-			return None
-		elif True:
-			v=value
-			while (v and (not (isinstance(value, interfaces.IConstruct) or isinstance(value, interfaces.IFunction)))):
-				v = v.parent
-			return v
+		""" Returns the node that is or contains the given value"""
+		v=value
+		while (v and (not self.isNode(v))):
+			v = v.parent
+		return v
+	
+	def _reach(self, roots, root):
+		""" Returns the list of referers (`None` when unreached) for each node,
+		 visiting each reachable node and edge once. The `root` is the referer
+		 of the entry points."""
+		referers=([None] * len(self.nodes))
+		worklist=[]
+		for n in roots:
+			if (referers[n] is None):
+				referers[n] = []
+				worklist.append(n)
+			referers[n].append(root)
+		while worklist:
+			n=worklist.pop()
+			for m in self.edges[n]:
+				if (referers[m] is None):
+					referers[m] = []
+					worklist.append(m)
+				referers[m].append(self.nodes[n])
+		return referers
 	
 
 class RemoveDeadCode(Pass):
+	""" Annotates the nodes that `CountReferences` found unreachable as
+	 "deadcode", so that the writers can skip them."""
 	HANDLES = [interfaces.IConstruct]
 	NAME = u'RemoveDeadCode'
 	def getRefCount(self, value):
@@ -737,28 +917,1091 @@ class RemoveDeadCode(Pass):
 			return 0
 	
 	def onConstruct(self, value):
-		""" For every construct, we see if there is a refcount or not, and we
-		 see if at least one referer has a refcount. If it's not the case,
-		 then the value will be shadowed, and its refcount set to 0."""
-		actual_count=0
+		""" Constructs with a "refcount" of 0 are dead, along with all their
+		 children, which are then not walked."""
 		refcount=value.getAnnotation(u'refcount')
-		referers=value.getAnnotation(u'referers')
-		if refcount:
-			referers = referers.getContent()
-			for r in referers:
-				r_refcount=r.getAnnotation(u'refcount')
-				if (r_refcount and (r_refcount.getContent() > 0)):
-					actual_count = (actual_count + 1)
-			if (actual_count == 0):
-				self.annotate(value, u'deadcode')
-				refcount.setContent(0)
-			elif True:
-				for element in self.context:
-					element.removeAnnotation(u'deadcode')
-		elif value.getAbsoluteName():
+		if (refcount and (refcount.getContent() == 0)):
 			self.annotate(value, u'deadcode')
+			return False
 	
 	def onElement(self, element):
 		pass
 	
 
+
+class CodeSplitting(CountReferences):
+	""" Splits the modules of the program into chunks, so that each entry point
+	 only loads the code it can reach. The reachability is computed for each
+	 entry point separately: the modules reached by a single entry point go
+	 into the chunk of this entry point (named after it), while the modules
+	 reached by several entry points go into a shared chunk (`shared0`,
+	 `shared1`, ...) for each set of entry points. The modules reached by no
+	 entry point are not part of any chunk.
+	
+	 As this pass extends `CountReferences`, the unreachable slots can still
+	 be removed within the modules (`-P std,CodeSplitting,RemoveDeadCode`).
+	 The chunks and their dependencies are given by `getManifest`, and
+	 `markChunk` allows to write the chunks one at a time (see
+	 `lambdafactory.main.Command.splitProgram`)."""
+	NAME = u'CodeSplitting'
+	def __init__ (self):
+		self.chunks = []
+		self.chunkIds = {}
+		CountReferences.__init__(self)
+	
+	def run(self, program):
+		self.chunks = []
+		self.chunkIds = {}
+		CountReferences.run(self, program)
+		reached={}
+		for i in range(len(self.entryPoints)):
+			for n in self._reachable(self.entryPoints[i][1]):
+				module=self.nodes[n]
+				if isinstance(module, interfaces.IModule):
+					if (module not in reached):
+						reached[module] = []
+					reached[module].append(i)
+		groups={}
+		for module in program.getModules():
+			if ((module in reached) and (not module.isImported())):
+				key=tuple(reached[module])
+				if (key not in groups):
+					groups[key] = []
+				groups[key].append(module)
+		keys = sorted(groups.keys(), key=lambda _:(-len(_), _))
+		shared=0
+		for key in keys:
+			name=None
+			if (len(key) == 1):
+				name = self.entryPoints[key[0]][0]
+			elif True:
+				name = (u'shared' + str(shared))
+				shared = (shared + 1)
+			for module in groups[key]:
+				self.chunkIds[module] = len(self.chunks)
+			self.chunks.append({u'name':name, u'entries':list(key), u'modules':groups[key], u'dependencies':set()})
+		for n in range(len(self.nodes)):
+			source=self.getChunk(self.nodes[n])
+			if (source is not None):
+				for m in self.edges[n]:
+					destination=self.getChunk(self.nodes[m])
+					if ((destination is not None) and (destination != source)):
+						self.chunks[source][u'dependencies'].add(destination)
+	
+	def getChunk(self, element):
+		""" Returns the index of the chunk that contains the given element, if any."""
+		while (element and (not isinstance(element, interfaces.IModule))):
+			element = element.parent
+		return self.chunkIds.get(element)
+	
+	def getChunkOrder(self, entry):
+		""" Returns the indexes of the chunks to be loaded for the entry point
+		 with the given index, each chunk coming after its dependencies."""
+		order=[]
+		visited={}
+		for i in range(len(self.chunks)):
+			if (entry in self.chunks[i][u'entries']):
+				self._orderChunk(i, entry, order, visited)
+		return order
+	
+	def _orderChunk(self, index, entry, order, visited):
+		if (index not in visited):
+			visited[index] = True
+			for d in sorted(self.chunks[index][u'dependencies']):
+				if (entry in self.chunks[d][u'entries']):
+					self._orderChunk(d, entry, order, visited)
+			order.append(index)
+	
+	def getManifest(self, extension=None):
+		""" Returns the manifest of the chunks as a dictionary that can be dumped
+		 as JSON. The `chunks` map the chunk names to their `path` (the name
+		 followed by the given extension), `modules`, `entries` and
+		 `dependencies`, and the `entries` map each entry point to the list
+		 of chunks it loads, in order."""
+		if extension is None: extension = u''
+		manifest={u'chunks':{}, u'entries':{}}
+		for chunk in self.chunks:
+			name=chunk[u'name']
+			manifest["chunks"][name] = {
+				"path"         : name + extension,
+				"modules"      : [_.getAbsoluteName() for _ in chunk["modules"]],
+				"entries"      : [self.entryPoints[_][0] for _ in chunk["entries"]],
+				"dependencies" : [self.chunks[_]["name"] for _ in sorted(chunk["dependencies"])],
+			}
+		for i in range(len(self.entryPoints)):
+			manifest["entries"][self.entryPoints[i][0]] = [self.chunks[_]["name"] for _ in self.getChunkOrder(i)]
+		return manifest
+	
+	def markChunk(self, program, index):
+		""" Annotates the modules of the program that are not in the chunk with
+		 the given index as "deadcode", so that writing the program only
+		 writes the chunk. Returns the annotated modules, to be given to
+		 `unmarkChunk`."""
+		marked=[]
+		for module in program.getModules():
+			if ((self.chunkIds.get(module) != index) and (not module.getAnnotation(u'deadcode'))):
+				module.addAnnotation(u'deadcode')
+				marked.append(module)
+		return marked
+	
+	def unmarkChunk(self, marked):
+		for module in marked:
+			module.removeAnnotation(u'deadcode')
+	
+	def _reachable(self, roots):
+		""" Returns the ids of the nodes reachable from the given roots."""
+		reached={}
+		worklist=[]
+		for n in roots:
+			if (n not in reached):
+				reached[n] = True
+				worklist.append(n)
+		while worklist:
+			for m in self.edges[worklist.pop()]:
+				if (m not in reached):
+					reached[m] = True
+					worklist.append(m)
+		return reached.keys()
+	
+
+
+class ConstantFolding(Pass):
+	""" Folds the computations over number, string and boolean constants, removes
+	 the rules of selections whose predicates are constant and propagates the
+	 constants, which are the module attributes and the allocated slots bound
+	 once to a constant value and never assigned.
+	
+	 The constants are resolved using the dataflow, so the pass is meant to be
+	 run after the standard passes (`-P std,ConstantFolding`). Only the
+	 computations that give the same result in JavaScript and Python are
+	 folded, for instance `7 / 2` or `"a" + 1` are left as they are."""
+	HANDLES = [interfaces.IProcess, interfaces.ISelection, interfaces.IAssignment, interfaces.IAllocation, interfaces.IEmbed, interfaces.IComputation, interfaces.IReference]
+	NAME = u'ConstantFolding'
+	RE_NAME = re.compile(u'[A-Za-z_][A-Za-z_0-9]*')
+	def __init__ (self):
+		self._collecting = False
+		self._mutated = {}
+		self._mutatedNames = {}
+		self._evaluating = []
+		Pass.__init__(self)
+	
+	def run(self, program):
+		""" Walks the program a first time to collect the slots that are assigned
+		 or declared more than once, and a second time to fold the constants."""
+		self._mutated = {}
+		self._mutatedNames = {}
+		self._collecting = True
+		Pass.run(self, program)
+		self._collecting = False
+		Pass.run(self, program)
+	
+	def onAssignment(self, element):
+		if (not self._collecting):
+			return None
+		target=element.getTarget()
+		if isinstance(target, interfaces.IResolution):
+			self._mutatedNames[target.getReference().getReferenceName()] = True
+		elif isinstance(target, interfaces.IReference):
+			slot_and_value=self.resolve(target)
+			key=self.getConstantKey(slot_and_value[0], slot_and_value[1])
+			if key:
+				self._mutated[key] = True
+	
+	def onAllocation(self, element):
+		if (not self._collecting):
+			return None
+		slot=self.resolve(element.getSlotName(), element)[0]
+		if ((slot and slot.getOrigin()) and (slot.getOrigin()[0] is not element)):
+			self._mutated[element] = True
+			self._mutated[slot.getOrigin()[0]] = True
+	
+	def onEmbed(self, element):
+		if (not self._collecting):
+			return None
+		for name in self.__class__.RE_NAME.findall((element.getCode() or u'')):
+			self._mutatedNames[name] = True
+	
+	def onProcess(self, process):
+		if self._collecting:
+			return None
+		operations=process.getOperations()
+		folded=self._foldOperations(process, operations)
+		if ((len(folded) != len(operations)) or (folded != operations)):
+			if ((not folded) and operations):
+				nop=self.getFactory().nop()
+				nop.setParent(process)
+				folded.append(nop)
+			process.operations = folded
+	
+	def onSelection(self, selection):
+		if self._collecting:
+			return None
+		rule=self._foldSelection(selection)
+		if ((rule and isinstance(rule, interfaces.IMatchExpressionOperation)) and (not isinstance(selection.parent, interfaces.IProcess))):
+			expression=rule.getExpression()
+			self.replace(selection, expression)
+			self.walk(expression)
+			return False
+	
+	def onComputation(self, computation):
+		if self._collecting:
+			return None
+		constant=self.getConstant(computation)
+		if (constant[0] and self._canReplace(computation, constant[1])):
+			self.replace(computation, self._createLiteral(constant[1]))
+			return False
+		operator=computation.getOperator().getReferenceName()
+		if (((operator == u'and') or (operator == u'or')) and (not computation.isUnary())):
+			left=self.getConstant(computation.getLeftOperand())
+			if (left[0] and (((operator == u'and') and left[1]) or ((operator == u'or') and (not left[1])))):
+				right=computation.getRightOperand()
+				self.replace(computation, right)
+				self.walk(right)
+				return False
+	
+	def onReference(self, reference):
+		if self._collecting:
+			return None
+		parent=reference.parent
+		name=reference.getReferenceName()
+		if (((name == u'True') or (name == u'False')) or isinstance(reference, interfaces.IOperator)):
+			return None
+		elif ((isinstance(parent, interfaces.IResolution) or isinstance(parent, interfaces.IAssignment)) or isinstance(parent, interfaces.IInvocation)):
+			return None
+		constant=self.getConstant(reference)
+		if (constant[0] and self._canReplace(reference, constant[1])):
+			self.replace(reference, self._createLiteral(constant[1]))
+	
+	def getConstant(self, element):
+		""" Returns `[True, value]` when the given element always evaluates to
+		 the same boolean, number or string `value`, `[False, None]` otherwise."""
+		if isinstance(element, interfaces.INumber):
+			value=element.getActualValue()
+			if (isNumber(value) and isConstantValue(value)):
+				return [True, value]
+		elif isinstance(element, interfaces.IString):
+			value=element.getActualValue()
+			if isText(value):
+				return [True, value]
+		elif isinstance(element, interfaces.IComputation):
+			return self._evaluateComputation(element)
+		elif isinstance(element, interfaces.IReference):
+			return self._evaluateReference(element)
+		return [False, None]
+	
+	def getConstantKey(self, slot, value):
+		""" Returns the element that binds the value of the given dataflow slot,
+		 when it can be a constant: a module attribute or an allocation."""
+		if isinstance(value, interfaces.IModuleAttribute):
+			return value
+		elif (((slot and slot.isLocal()) and slot.getOrigin()) and isinstance(slot.getOrigin()[0], interfaces.IAllocation)):
+			return slot.getOrigin()[0]
+		elif True:
+			return None
+	
+	def _evaluateReference(self, reference):
+		name=reference.getReferenceName()
+		slot_and_value=self.resolve(reference, self._getDataFlow(reference))
+		slot=slot_and_value[0]
+		if ((name == u'True') or (name == u'False')):
+			if ((not slot) or slot.isEnvironment()):
+				return [True, (name == u'True')]
+			elif True:
+				return [False, None]
+		key=self.getConstantKey(slot, slot_and_value[1])
+		if (((not key) or (key in self._mutated)) or (key in self._evaluating)):
+			return [False, None]
+		elif ((name in self._mutatedNames) or (key.getName() in self._mutatedNames)):
+			return [False, None]
+		self._evaluating.append(key)
+		res=self.getConstant(key.getDefaultValue())
+		self._evaluating.pop()
+		return res
+	
+	def _evaluateComputation(self, computation):
+		operator=computation.getOperator().getReferenceName()
+		left=self.getConstant(computation.getLeftOperand())
+		if (not left[0]):
+			return left
+		elif computation.isUnary():
+			return self._evaluateUnary(operator, left[1])
+		elif ((operator == u'and') and (not left[1])):
+			return left
+		elif ((operator == u'or') and left[1]):
+			return left
+		right=self.getConstant(computation.getRightOperand())
+		if (not right[0]):
+			return right
+		elif True:
+			return self._evaluateBinary(operator, left[1], right[1])
+	
+	def _evaluateUnary(self, operator, a):
+		res=None
+		if operator == "not":
+			res = not a
+		elif operator == "-" and isNumber(a):
+			res = -a
+		return [((res is not None) and isConstantValue(res)), res]
+	
+	def _evaluateBinary(self, operator, a, b):
+		""" Returns `[True, value]` when the result of the given operator applied
+		 to `a` and `b` is the same in JavaScript and Python."""
+		res=None
+		if operator == "and":
+			res = b if a else a
+		elif operator == "or":
+			res = a if a else b
+		elif isNumber(a) and isNumber(b):
+			exact = not (isinstance(a, float) or isinstance(b, float))
+			if   operator == "+":  res = a + b
+			elif operator == "-":  res = a - b
+			elif operator == "*":  res = a * b
+			elif operator == "/" and b != 0 and (not exact or a % b == 0):
+				# NOTE: `7 / 2` is 3 in Python 2, so only exact divisions are folded
+				res = float(a) / b
+			elif operator == "%" and exact and a >= 0 and b > 0:
+				res = a % b
+			elif operator == "==": res = a == b
+			elif operator == "!=": res = a != b
+			elif operator == "<":  res = a <  b
+			elif operator == "<=": res = a <= b
+			elif operator == ">":  res = a >  b
+			elif operator == ">=": res = a >= b
+		elif isText(a) and isText(b):
+			if   operator == "+":  res = a + b
+			elif operator == "==": res = a == b
+			elif operator == "!=": res = a != b
+		return [((res is not None) and isConstantValue(res)), res]
+	
+	def _foldOperations(self, process, operations):
+		""" Returns the given operations where the selections that cannot match
+		 are removed, and the selections whose first rule always matches are
+		 replaced by the operations of the rule."""
+		res=[]
+		for operation in operations:
+			if (isinstance(operation, interfaces.ISelection) and (not operation.getImplicitValue())):
+				rule=self._foldSelection(operation)
+				if (not operation.getRules()):
+					operation.detach()
+				elif ((rule and isinstance(rule, interfaces.IMatchProcessOperation)) and isinstance(rule.getProcess(), interfaces.IBlock)):
+					for o in self._foldOperations(process, rule.getProcess().getOperations()):
+						o.setParent(process)
+						res.append(o)
+				elif True:
+					res.append(operation)
+			elif True:
+				res.append(operation)
+		return res
+	
+	def _foldSelection(self, selection):
+		""" Removes the rules of the given selection that never match, as well as
+		 the rules following a rule that always matches. Returns the first rule
+		 when it always matches."""
+		if selection.getImplicitValue():
+			return None
+		rules=[]
+		always=None
+		for rule in selection.getRules():
+			predicate=self.getConstant(rule.getPredicate())
+			if rule.hasAnnotation(u'else'):
+				predicate = [True, True]
+			if (not predicate[0]):
+				rules.append(rule)
+			elif predicate[1]:
+				rules.append(rule)
+				always = rule
+				break
+		if ((not rules) and (not isinstance(selection.parent, interfaces.IProcess))):
+			return None
+		elif (len(rules) != len(selection.getRules())):
+			selection.setOpArgument(0, rules)
+		if always:
+			predicate=always.getPredicate()
+			is_literal=((isinstance(predicate, interfaces.INumber) or isinstance(predicate, interfaces.IString)) or (isinstance(predicate, interfaces.IReference) and (predicate.getReferenceName() == u'True')))
+			if (rules[0] is always):
+				always.removeAnnotation(u'else')
+			if (not (is_literal or always.hasAnnotation(u'else'))):
+				true_ref=self.getFactory()._ref(u'True')
+				if predicate:
+					self.replace(predicate, true_ref)
+				elif True:
+					always.setPredicate(true_ref)
+					true_ref.setParent(always)
+		if (rules and (rules[0] is always)):
+			return always
+		elif True:
+			return None
+	
+	def _canReplace(self, element, value):
+		""" Tells if the given element can be replaced by a literal of the given
+		 value: negative numbers are not allowed as the operand of unary or
+		 power operators (`--1` and `-1 ** 2` being errors in JavaScript)."""
+		parent=element.parent
+		if (isinstance(parent, interfaces.IComputation) and isNumber(value)):
+			if ((value < 0) and (parent.isUnary() or (parent.getOperator().getReferenceName() == u'**'))):
+				return False
+		return True
+	
+	def _createLiteral(self, value):
+		factory=self.getFactory()
+		if (value is True):
+			return factory._ref(u'True')
+		elif (value is False):
+			return factory._ref(u'False')
+		elif isNumber(value):
+			return factory._number(value)
+		elif True:
+			return factory._string(value)
+	
+
+
+class Inlining(Pass):
+	""" Replaces the invocations of small functions by the expression that they
+	 return, and the uses of the accessors and mutators of the current class
+	 (`self.a` and `self.a = v` within its methods) by their body, which saves
+	 a call in both the JavaScript and Python output.
+	
+	 The callees are resolved using the dataflow, so the pass is meant to be
+	 run after the standard passes (`-P std,Inlining`). A callee is inlined
+	 when:
+	
+	 - its body is a single `return` (a single operation for mutators) of at
+	   most `inlineSize` elements (set with `-O inlineSize=N`), made of
+	   literals, references, computations, resolutions and invocations,
+	 - it is neither recursive nor annotated as `noinline`,
+	 - the names it references resolve to the same slots at the call site,
+	 - the arguments are literals or local variables, or expressions of these
+	   that are used exactly once, so that inlining does not change what the
+	   arguments evaluate to.
+	
+	 Accessors and mutators are only inlined when no other class of the program
+	 redefines them in a subclass, so classes that are subclassed in separately
+	 compiled programs should annotate them as `noinline`."""
+	HANDLES = [interfaces.IInvocation, interfaces.IAssignment, interfaces.IResolution]
+	NAME = u'Inlining'
+	SIZE = 12
+	EXPRESSIONS = [interfaces.INumber, interfaces.IString, interfaces.IReference, interfaces.IComputation, interfaces.IResolution, interfaces.IInvocation, interfaces.IInstanciation, interfaces.IAccessOperation, interfaces.IArgument, interfaces.IList]
+	def __init__ (self):
+		self.inlining = []
+		self._size = 0
+		self._subclasses = None
+		self._closures = {}
+		Pass.__init__(self)
+	
+	def run(self, program):
+		self._size = int((self.getOption(u'inlineSize') or self.__class__.SIZE))
+		self._subclasses = None
+		self._closures = {}
+		self.inlining = []
+		Pass.run(self, program)
+	
+	def onInvocation(self, invocation):
+		self.walkChildren(invocation)
+		callee=self.getCallee(invocation)
+		body=(callee and self.getInlinedBody(callee))
+		if (not body):
+			return False
+		parameters=callee.getParameters()
+		arguments=(invocation.getArguments() or [])
+		bindings={}
+		if (len(arguments) > len(parameters)):
+			return False
+		i=0
+		for parameter in parameters:
+			if (i < len(arguments)):
+				argument=arguments[i]
+				if ((argument.isByName() or argument.isAsList()) or argument.isAsMap()):
+					return False
+				bindings[parameter.getName()] = argument.getValue()
+			elif isinstance(parameter.getDefaultValue(), interfaces.ILiteral):
+				bindings[parameter.getName()] = parameter.getDefaultValue()
+			elif True:
+				return False
+			i += 1
+		self._inline(callee, body, bindings, invocation)
+		return False
+	
+	def onResolution(self, resolution):
+		parent=resolution.parent
+		if (isinstance(parent, interfaces.IAssignment) and (parent.getTarget() is resolution)):
+			return None
+		elif (isinstance(parent, interfaces.IInvocation) and (parent.getTarget() is resolution)):
+			return None
+		accessor=self.getAttributeMethod(resolution, True)
+		body=(accessor and self.getInlinedBody(accessor))
+		if (body and (not accessor.getParameters())):
+			if self._inline(accessor, body, {'self':resolution.getContext()}, resolution):
+				return False
+	
+	def onAssignment(self, assignment):
+		target=assignment.getTarget()
+		if (not (isinstance(assignment.parent, interfaces.IProcess) and isinstance(target, interfaces.IResolution))):
+			return None
+		mutator=self.getAttributeMethod(target, False)
+		body=(mutator and self.getInlinedBody(mutator))
+		parameters=(mutator and mutator.getParameters())
+		if ((body and (len(parameters) == 1)) and (not (parameters[0].isRest() or parameters[0].isKeywordsRest()))):
+			bindings={'self':target.getContext()}
+			bindings[parameters[0].getName()] = assignment.getAssignedValue()
+			if self._inline(mutator, body, bindings, assignment):
+				return False
+	
+	def getCallee(self, invocation):
+		""" Returns the function invoked by the given invocation, when the dataflow
+		 binds the invocation's target to a function."""
+		target=invocation.getTarget()
+		value=None
+		if isinstance(target, interfaces.IReference):
+			value = self.resolve(target)[1]
+		elif (isinstance(target, interfaces.IResolution) and isinstance(target.getContext(), interfaces.IReference)):
+			module=self.resolve(target.getContext())[1]
+			name=target.getReference().getReferenceName()
+			if (isinstance(module, interfaces.IModule) and module.hasSlot(name)):
+				value = module.getSlot(name)
+		if (isinstance(value, interfaces.IFunction) and (not (isinstance(value, interfaces.IMethod) or isinstance(value, interfaces.IInitializer)))):
+			return value
+		elif True:
+			return None
+	
+	def getAttributeMethod(self, resolution, isAccessor):
+		""" Returns the accessor (or mutator) of the given resolution, when it
+		 resolves an attribute of `self` within a method of the class that
+		 defines the accessor, and no subclass redefines the attribute."""
+		context=resolution.getContext()
+		if (not (isinstance(context, interfaces.IReference) and (context.getReferenceName() == u'self'))):
+			return None
+		slot=self.resolve(context)[0]
+		method=((slot and slot.isEnvironment()) and slot.getDataFlow().getElement())
+		if ((not (isinstance(method, interfaces.IMethod) and isinstance(method.parent, interfaces.IClass))) or isinstance(method, interfaces.IClassMethod)):
+			return None
+		the_class=method.parent
+		name=resolution.getReference().getReferenceName()
+		if (not the_class.hasSlot(name)):
+			return None
+		for subclass in self.getSubclasses(the_class):
+			if subclass.hasSlot(name):
+				return None
+		if isAccessor:
+			return the_class.getAccessor(name)
+		elif True:
+			return the_class.getMutator(name)
+	
+	def getSubclasses(self, theClass):
+		""" Returns the classes of the program that inherit from the given class."""
+		if (self._subclasses is None):
+			self._subclasses = {}
+			for element in self.getElements(self.getProgram()):
+				if isinstance(element, interfaces.IClass):
+					for ancestor in self.getClassAncestors(element):
+						self._subclasses.setdefault(id(ancestor), []).append(element)
+		return self._subclasses.get(id(theClass), [])
+	
+	def getInlinedBody(self, callee):
+		""" Returns the expression returned by the given function, or the single
+		 operation of the given mutator, when the callee can be inlined."""
+		operations=callee.getOperations()
+		if ((callee.hasAnnotation(u'noinline') or (callee in self.inlining)) or (len(operations) != 1)):
+			return None
+		for parameter in callee.getParameters():
+			if (parameter.isRest() or parameter.isKeywordsRest()):
+				return None
+		body=operations[0]
+		if isinstance(callee, interfaces.IMutator):
+			if (isinstance(body, interfaces.IAssignment) or isinstance(body, interfaces.IInvocation)):
+				return body
+		elif isinstance(body, interfaces.ITermination):
+			return body.getReturnedEvaluable()
+		return None
+	
+	def _inline(self, callee, body, bindings, element):
+		""" Replaces the given element by a copy of the given body of the callee,
+		 where the parameters are bound to the given values. Returns the
+		 inlined copy, or `None` when the body cannot be inlined."""
+		elements=self.getElements(body)
+		if (len(elements) > self._size):
+			return None
+		uses={}
+		effects=False
+		for e in elements:
+			if (((e is body) and (isinstance(e, interfaces.IAssignment) or isinstance(e, interfaces.IInvocation))) and isinstance(element.parent, interfaces.IProcess)):
+				pass
+			elif (not self._isExpression(e)):
+				return None
+			effects = (((effects or isinstance(e, interfaces.IInvocation)) or isinstance(e, interfaces.IInstanciation)) or isinstance(e, interfaces.IAssignment))
+			if (isinstance(e, interfaces.IReference) and (not self._isResolved(e))):
+				name=e.getReferenceName()
+				if (name in bindings):
+					if (isinstance(e.parent, interfaces.IAssignment) and (e.parent.getTarget() is e)):
+						return None
+					elif (not self._canSubstitute(e, bindings[name])):
+						return None
+					uses[name] = (uses.get(name, 0) + 1)
+				elif isinstance(e, interfaces.IOperator):
+					pass
+				elif True:
+					slot_and_value=self.resolve(e, callee)
+					if ((slot_and_value[1] is callee) or (slot_and_value[0] is not self.resolve(name)[0])):
+						return None
+		for name in bindings:
+			if (not self._canBind(bindings[name], uses.get(name, 0), effects)):
+				return None
+		if (not self._canSubstitute(element, body)):
+			return None
+		res=body.copy().detach()
+		for e in self.getElements(res):
+			e.setDataFlow(element.getDataFlow())
+		for e in self.getElements(res):
+			if ((isinstance(e, interfaces.IReference) and (not self._isResolved(e))) and (e.getReferenceName() in bindings)):
+				value=bindings[e.getReferenceName()].copy().detach()
+				if (e is res):
+					res = value
+				elif True:
+					self.replace(e, value)
+		if (not self.replace(element, res)):
+			return None
+		self.inlining.append(callee)
+		self.walk(res)
+		self.inlining.pop()
+		return res
+	
+	def _canBind(self, value, uses, effects):
+		""" Tells if the given argument value can be substituted to the given
+		 number of uses of a parameter in a body, which may have side effects.
+		 Literals can always be, references only when they cannot be changed
+		 by the body, and expressions of these only when used exactly once, as
+		 dropping them would also drop the errors they may raise."""
+		if isinstance(value, interfaces.ILiteral):
+			return True
+		elif isinstance(value, interfaces.IReference):
+			if ((not effects) or (value.getReferenceName() in [u'self', u'True', u'False', u'None'])):
+				return True
+			slot=self.resolve(value)[0]
+			closure=((slot and (slot.isLocal() or slot.isArgument())) and slot.getDataFlow().getElement())
+			return (isinstance(closure, interfaces.IClosure) and (not self._hasClosures(closure)))
+		elif (isinstance(value, interfaces.IComputation) and (uses == 1)):
+			for operand in value.getOperands():
+				if (operand and (not self._canBind(operand, uses, effects))):
+					return False
+			return True
+		elif True:
+			return False
+	
+	def _canSubstitute(self, element, value):
+		""" Tells if the given value can replace the given element: computations
+		 and negative numbers need the parentheses that only computations,
+		 arguments and operations that take expressions give them."""
+		parent=element.parent
+		is_negative=((isinstance(value, interfaces.INumber) and isNumber(value.getActualValue())) and (value.getActualValue() < 0))
+		if (not (isinstance(value, interfaces.IComputation) or is_negative)):
+			return True
+		elif isinstance(parent, interfaces.IComputation):
+			return (not (is_negative and (parent.isUnary() or (parent.getOperator().getReferenceName() == u'**'))))
+		elif True:
+			return ((((isinstance(parent, interfaces.IArgument) or isinstance(parent, interfaces.ITermination)) or isinstance(parent, interfaces.IAllocation)) or isinstance(parent, interfaces.IAssignment)) or isinstance(parent, interfaces.IList))
+	
+	def _isExpression(self, element):
+		if isinstance(element, interfaces.ITuple):
+			return False
+		for interface in self.__class__.EXPRESSIONS:
+			if isinstance(element, interface):
+				return True
+		return False
+	
+	def _isResolved(self, reference):
+		""" Tells if the given reference is the name resolved by a resolution,
+		 rather than a reference to a slot."""
+		parent=reference.parent
+		return (isinstance(parent, interfaces.IResolution) and (parent.getReference() is reference))
+	
+	def _hasClosures(self, closure):
+		key=id(closure)
+		if (key not in self._closures):
+			self._closures[key] = False
+			for e in self.getElements(closure):
+				if ((e is not closure) and isinstance(e, interfaces.IClosure)):
+					self._closures[key] = True
+					break
+		return self._closures[key]
+	
+
+
+class HoistLoopInvariants(Pass):
+	""" Hoists the resolutions that do not change within the body of a loop (a
+	 repetition or an iteration used as a statement) into temporaries that are
+	 allocated before the loop, so that chains such as `self.a.b.c` and
+	 module slots (written `__module__.CONST` in JavaScript) are only resolved
+	 once.
+	
+	 The pass uses the dataflow, so it is meant to be run after the standard
+	 passes (`-P std,HoistLoopInvariants`). A resolution is invariant when:
+	
+	 - the slot it starts from is declared outside of the loop and is not
+	   assigned within the loop,
+	 - none of its attributes is assigned within the loop or defined by an
+	   accessor or a mutator,
+	 - the loop does not invoke, instantiate or embed anything, which could
+	   change the attributes.
+	
+	 Module slots may be hoisted out of loops that invoke functions, as long as
+	 no function of the program mutates them (see `Callable.hasMutation`) and
+	 no attribute of the same name is assigned.
+	
+	 Hoisted resolutions are evaluated before the loop, even when it does not
+	 run, so a resolution chain is only hoisted when it cannot fail there: when
+	 it resolves a single name in `self` or in a module, or when it is part of
+	 the condition of a repetition (which is evaluated at least once) and is
+	 not an operand of `and` or `or`. Otherwise, only its first resolution
+	 (`self.a` of `self.a.b.c`) may be hoisted."""
+	HANDLES = [interfaces.IRepetition, interfaces.IIteration]
+	NAME = u'HoistLoopInvariants'
+	PREFIX = u'_invariant_'
+	def __init__ (self):
+		self._hoisted = []
+		self._count = 0
+		self._callables = None
+		self._accessors = None
+		self._attributes = None
+		Pass.__init__(self)
+	
+	def run(self, program):
+		self._hoisted = []
+		self._count = 0
+		self._callables = None
+		self._accessors = None
+		self._attributes = None
+		Pass.run(self, program)
+		for process_loop_allocations in self._hoisted:
+			operations=process_loop_allocations[0].getOperations()
+			loop=process_loop_allocations[1]
+			i=0
+			while (operations[i] is not loop):
+				i += 1
+			for allocation in process_loop_allocations[2]:
+				operations.insert(i, allocation)
+				allocation.setParent(process_loop_allocations[0])
+				i += 1
+		self._hoisted = []
+	
+	def onRepetition(self, repetition):
+		self.hoist(repetition, [repetition.getCondition(), repetition.getProcess()])
+	
+	def onIteration(self, iteration):
+		self.hoist(iteration, [iteration.getClosure()])
+	
+	def hoist(self, loop, body):
+		""" Hoists the invariant resolutions of the given body of the given loop
+		 into temporaries allocated before the loop."""
+		process=loop.parent
+		if (not isinstance(process, interfaces.IProcess)):
+			return None
+		elements=[]
+		for _ in body:
+			elements.extend(self.getElements(_))
+		assigned={}
+		mutable=False
+		for e in elements:
+			if ((isinstance(e, interfaces.IInvocation) or isinstance(e, interfaces.IInstanciation)) or isinstance(e, interfaces.IEmbed)):
+				mutable = True
+			elif isinstance(e, interfaces.IAssignment):
+				target=e.getTarget()
+				if isinstance(target, interfaces.IReference):
+					assigned[target.getReferenceName()] = True
+				elif isinstance(target, interfaces.IResolution):
+					assigned[target.getReference().getReferenceName()] = True
+				elif True:
+					mutable = True
+		dataflow=loop.getDataFlow()
+		factory=self.getFactory()
+		temporaries={}
+		allocations=[]
+		hoisted={}
+		for e in elements:
+			if (id(e.parent) in hoisted):
+				hoisted[id(e)] = True
+			elif True:
+				key=self.getInvariantKey(e, loop, assigned, mutable)
+				if key:
+					hoisted[id(e)] = True
+					if (key not in temporaries):
+						name=self._getTemporaryName(loop)
+						value=e.copy().detach()
+						allocation=factory.allocate(factory._slot(name), value)
+						for _ in self.getElements(allocation):
+							_.setDataFlow(dataflow)
+						dataflow.declareLocal(name, value, allocation)
+						temporaries[key] = name
+						allocations.append(allocation)
+					ref=factory._ref(temporaries[key])
+					ref.setDataFlow(e.getDataFlow())
+					self.replace(e, ref)
+		if allocations:
+			self._hoisted.append([process, loop, allocations])
+	
+	def getInvariantKey(self, element, loop, assigned, mutable):
+		""" Returns a key identifying the value of the given element when it is an
+		 invariant resolution of the given loop, or `None` otherwise."""
+		if self._isTarget(element):
+			return None
+		elif isinstance(element, interfaces.IResolution):
+			names=[]
+			root=element
+			while isinstance(root, interfaces.IResolution):
+				names.insert(0, root.getReference().getReferenceName())
+				root = root.getContext()
+			if (mutable or (not isinstance(root, interfaces.IReference))):
+				return None
+			accessors=self._getAccessors()
+			for name in names:
+				if ((name in assigned) or (name in accessors)):
+					return None
+			slot_value=self.resolve(root, self._getDataFlow(root))
+			slot=slot_value[0]
+			if (((not slot) or (root.getReferenceName() in assigned)) or self._isWithin(slot.getDataFlow().getElement(), loop)):
+				return None
+			is_safe=((len(names) == 1) and ((root.getReferenceName() == u'self') or isinstance(slot_value[1], interfaces.IModule)))
+			if (not (is_safe or self._isEvaluated(element, loop))):
+				return None
+			return ((str(id(slot)) + u'.') + u'.'.join(names))
+		elif isinstance(element, interfaces.IReference):
+			name=element.getReferenceName()
+			slot_value=self.resolve(element, self._getDataFlow(element))
+			slot=slot_value[0]
+			if (not (slot and isinstance(slot.getDataFlow().getElement(), interfaces.IModule))):
+				return None
+			elif ((isinstance(slot_value[1], interfaces.IModule) or (name in assigned)) or self._isMutated(name)):
+				return None
+			return str(id(slot))
+		elif True:
+			return None
+	
+	def _isTarget(self, element):
+		""" Tells if the given element is the target of an invocation or an
+		 assignment, or the name resolved by a resolution, which cannot be
+		 replaced by a temporary."""
+		parent=element.parent
+		if (isinstance(parent, interfaces.IInvocation) or isinstance(parent, interfaces.IAssignment)):
+			return (parent.getTarget() is element)
+		elif isinstance(parent, interfaces.IResolution):
+			return (parent.getReference() is element)
+		elif True:
+			return False
+	
+	def _isEvaluated(self, element, loop):
+		""" Tells if the given element is evaluated whenever the given loop is,
+		 that is when it is part of the condition of a repetition and is only
+		 nested in resolutions and in computations other than `and` and `or`."""
+		if (not isinstance(loop, interfaces.IRepetition)):
+			return False
+		condition=loop.getCondition()
+		while (element is not condition):
+			parent=element.parent
+			if isinstance(parent, interfaces.IComputation):
+				operator=parent.getOperator().getReferenceName()
+				if ((operator == u'and') or (operator == u'or')):
+					return False
+			elif (not isinstance(parent, interfaces.IResolution)):
+				return False
+			element = parent
+		return True
+	
+	def _isWithin(self, element, ancestor):
+		while element:
+			if (element is ancestor):
+				return True
+			element = element.parent
+		return False
+	
+	def _isMutated(self, name):
+		""" Tells if a slot of the given name is mutated by a function of the
+		 program, or assigned as an attribute."""
+		self._getAccessors()
+		for callable in self._callables:
+			if callable.hasMutation(name):
+				return True
+		return (name in self._attributes)
+	
+	def _getAccessors(self):
+		""" Returns the names of the accessors and mutators defined in the
+		 program, listing its callables and assigned attributes along the way."""
+		if (self._accessors is None):
+			self._callables = []
+			self._accessors = {}
+			self._attributes = {}
+			for e in self.getElements(self.getProgram()):
+				if isinstance(e, interfaces.IClosure):
+					self._callables.append(e)
+				elif (isinstance(e, interfaces.IAssignment) and isinstance(e.getTarget(), interfaces.IResolution)):
+					self._attributes[e.getTarget().getReference().getReferenceName()] = True
+				elif isinstance(e, interfaces.IClass):
+					for slot in e.getSlots():
+						if (slot[2] or slot[3]):
+							self._accessors[slot[0]] = True
+		return self._accessors
+	
+	def _getTemporaryName(self, loop):
+		name=None
+		while ((name is None) or self.resolve(name, loop)[0]):
+			name = (self.__class__.PREFIX + str(self._count))
+			self._count += 1
+		return name
+	
+
+
+class RemoveTailRecursion(Pass):
+	""" Rewrites the functions and methods that return an invocation of themselves
+	 (self tail calls) into a loop that reassigns their parameters and starts
+	 over, so that they run in constant stack space and do not hit Python's
+	 recursion limit. The body of the function is wrapped in a `while True`
+	 repetition, and each `return f(a, b)` becomes the assignment of `a` and `b`
+	 to the parameters followed by a `continue`.
+	
+	 The pass uses the dataflow, so it is meant to be run after the standard
+	 passes (`-P std,RemoveTailRecursion`). A termination is a self tail call
+	 when it returns the invocation of the function (`self.f(...)` for methods
+	 that no subclass of the program overrides) with positional arguments, and
+	 is only nested in selections and blocks. Functions with rest parameters,
+	 or with closures (other than the closures of iterations) that reference
+	 their parameters or locals, are left as they are, as the closures would
+	 share the slots across iterations instead of having their own."""
+	HANDLES = [interfaces.IFunction]
+	NAME = u'RemoveTailRecursion'
+	PREFIX = u'_tail_'
+	def __init__ (self):
+		Pass.__init__(self)
+	
+	def onFunction(self, function):
+		if (((isinstance(function, interfaces.IInitializer) or isinstance(function, interfaces.IConstructor)) or isinstance(function, interfaces.IDestructor)) or isinstance(function, interfaces.IAttributeMethod)):
+			return None
+		for parameter in function.getParameters():
+			if ((parameter.isRest() or parameter.isKeywordsRest()) or self.resolve((self.__class__.PREFIX + parameter.getName()), function)[0]):
+				return None
+		calls=[]
+		for e in self.getElements(function):
+			if (isinstance(e, interfaces.ITermination) and self.isTailCall(e, function)):
+				calls.append(e)
+		if (calls and (not self._hasEnclosures(function))):
+			self.rewrite(function, calls)
+	
+	def isTailCall(self, termination, function):
+		""" Tells if the given termination returns an invocation of the given
+		 function that can be replaced by a `continue`."""
+		invocation=termination.getReturnedEvaluable()
+		if (not (isinstance(invocation, interfaces.IInvocation) and isinstance(termination.parent, interfaces.IProcess))):
+			return False
+		parent=termination.parent
+		while (parent is not function):
+			if (not ((isinstance(parent, interfaces.IBlock) or isinstance(parent, interfaces.IMatchProcessOperation)) or (isinstance(parent, interfaces.ISelection) and (not parent.hasAnnotation(u'if-expression'))))):
+				return False
+			parent = parent.parent
+		parameters=function.getParameters()
+		arguments=(invocation.getArguments() or [])
+		if (len(arguments) > len(parameters)):
+			return False
+		for argument in arguments:
+			if ((argument.isByName() or argument.isAsList()) or argument.isAsMap()):
+				return False
+		for parameter in parameters[len(arguments):]:
+			if (not isinstance(parameter.getDefaultValue(), interfaces.ILiteral)):
+				return False
+		target=invocation.getTarget()
+		if isinstance(function, interfaces.IMethod):
+			the_class=function.parent
+			if (not (isinstance(target, interfaces.IResolution) and isinstance(target.getContext(), interfaces.IReference))):
+				return False
+			elif ((target.getContext().getReferenceName() != u'self') or (target.getReference().getReferenceName() != function.getName())):
+				return False
+			elif ((not isinstance(the_class, interfaces.IClass)) or (the_class.getSlot(function.getName()) is not function)):
+				return False
+			for e in self.getElements(self.getProgram()):
+				if (((isinstance(e, interfaces.IClass) and (e is not the_class)) and (the_class in self.getClassAncestors(e))) and e.hasSlot(function.getName())):
+					return False
+			return True
+		elif True:
+			return (isinstance(target, interfaces.IReference) and (self.resolve(target, self._getDataFlow(target))[1] is function))
+	
+	def rewrite(self, function, calls):
+		""" Wraps the body of the given function in a `while True` repetition, and
+		 replaces the given tail calls by the reassignment of the parameters."""
+		factory=self.getFactory()
+		dataflow=function.getDataFlow()
+		parameters=function.getParameters()
+		for termination in calls:
+			arguments=(termination.getReturnedEvaluable().getArguments() or [])
+			changed=[]
+			i=0
+			for parameter in parameters:
+				name=parameter.getName()
+				value=None
+				if (i < len(arguments)):
+					value = arguments[i].getValue().detach()
+				elif True:
+					value = parameter.getDefaultValue().copy().detach()
+				if (not (isinstance(value, interfaces.IReference) and (value.getReferenceName() == name))):
+					changed.append([name, value])
+				i += 1
+			operations=[]
+			if (len(changed) == 1):
+				operations.append(factory.assign(factory._ref(changed[0][0]), changed[0][1]))
+			elif True:
+				for name_value in changed:
+					allocation=factory.allocate(factory._slot((self.__class__.PREFIX + name_value[0])), name_value[1])
+					if (not dataflow.resolve((self.__class__.PREFIX + name_value[0]))[0]):
+						dataflow.declareLocal((self.__class__.PREFIX + name_value[0]), name_value[1], allocation)
+					operations.append(allocation)
+				for name_value in changed:
+					operations.append(factory.assign(factory._ref(name_value[0]), factory._ref((self.__class__.PREFIX + name_value[0]))))
+			operations.append(factory.continues())
+			process=termination.parent
+			j=0
+			while (process.getOperations()[j] is not termination):
+				j += 1
+			process.removeOperationAt(j)
+			for operation in operations:
+				operation.setDataFlow(self._getDataFlow(process))
+				process.getOperations().insert(j, operation)
+				operation.setParent(process)
+				j += 1
+		for e in self.getElements(function):
+			if ((isinstance(e, interfaces.IAllocation) and (not e.getDefaultValue())) and (self._getClosure(e) is function)):
+				undefined=factory._ref(u'Undefined')
+				e.setOpArgument(1, undefined)
+				undefined.setParent(e)
+		block=factory.createBlock()
+		while function.getOperations():
+			operation=function.getOperations()[0]
+			function.removeOperationAt(0)
+			block.addOperation(operation)
+		last=block.getOperations()[-1]
+		if (not (isinstance(last, interfaces.ITermination) or isinstance(last, interfaces.IInterruption))):
+			breaks=factory.breaks()
+			breaks.setDataFlow(dataflow)
+			block.addOperation(breaks)
+		loop=factory.repeat(factory._ref(u'True'), block)
+		loop.setDataFlow(dataflow)
+		block.setDataFlow(dataflow)
+		function.addOperation(loop)
+	
+	def _getClosure(self, element):
+		parent=element.parent
+		while (parent and (not isinstance(parent, interfaces.IClosure))):
+			parent = parent.parent
+		return parent
+	
+	def _hasEnclosures(self, function):
+		""" Tells if a closure nested in the given function, other than the closure
+		 of an iteration, references one of its parameters or locals."""
+		names={}
+		for parameter in function.getParameters():
+			names[parameter.getName()] = True
+		elements=self.getElements(function)
+		for e in elements:
+			if isinstance(e, interfaces.IAllocation):
+				names[e.getSlotName()] = True
+		for e in elements:
+			if ((isinstance(e, interfaces.IClosure) and (e is not function)) and (not isinstance(e.parent, interfaces.IIteration))):
+				for r in self.getElements(e):
+					if (isinstance(r, interfaces.IReference) and (r.getReferenceName() in names)):
+						return True
+		return False
+	
+
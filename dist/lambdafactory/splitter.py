@@ -28,16 +28,20 @@ class FileSplitter:
 	
 	def end(self):
 		""" Callback invoked after a 'fromXXX' method was invoked"""
-		self.currentFile.close()
+		if self.currentFile:
+			self.currentFile.close()
 		self.currentFilePath = None
 		self.currentFile = None
 	
 	def newFile(self, path):
+		if self.currentFile:
+			self.currentFile.close()
 		path = os.path.join(self.outputDir, path)
 		parents=os.path.dirname(path)
 		if (not os.path.exists(parents)):
 			os.makedirs(parents)
-		self.currentFile = file(path, u'w')
+		self.currentFilePath = path
+		self.currentFile = open(path, u'w')
 	
 	def writeLine(self, line):
 		""" Writes the given line to the current file"""
@@ -66,4 +70,24 @@ class FileSplitter:
 	def fromString(self, text):
 		return self.fromLines(text.split(u'\n'), True)
 	
+	def fromChunks(self, chunks):
+		""" Splits the given chunks of text, as yielded by `AbstractWriter.stream`,
+		 into files. Each chunk is made of complete lines, so that chunks are
+		 processed as they come and never need to be joined together."""
+		return self.fromLines((line for chunk in chunks for line in chunk.split("\n")), True)
+	
+	def toFile(self, path, chunks):
+		""" Writes the given chunks of text to the file at the given path (relative
+		 to the output directory) as they come, separated by newlines, without
+		 looking for snip lines."""
+		self.start()
+		self.newFile(path)
+		first=True
+		for chunk in chunks:
+			if (not first):
+				self.writeLine(u'\n')
+			self.writeLine(chunk)
+			first = False
+		self.end()
+	
 
@@ -16,11 +16,14 @@
 # TODO: Provide a global rewrite operation
 # TODO: Use const whenever possible
 
-from   lambdafactory.modelwriter import AbstractWriter, flatten
+from   lambdafactory.modelwriter import AbstractWriter, Rope, flatten
+from   lambdafactory.passes import Pass
 import lambdafactory.interfaces as interfaces
 import lambdafactory.reporter   as reporter
+import lambdafactory.typecast   as typecast
+import lambdafactory.modeltypes as modeltypes
 from   lambdafactory.splitter import SNIP
-import os.path, re, time, string, random, json, sys
+import os.path, re, time, string, random, json, sys, math
 
 PYTHON2 = sys.version_info[0] < 3
 if not PYTHON2:
@@ -37,6 +40,7 @@ VALID_SYMBOL       = re.compile("^[\$_A-Za-z][\$_A-Za-z0-9]*$")
 VALID_SYMBOL_CHARS = "_0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
 
 RE_SAFENAME        = re.compile("[\:\-/]")
+RE_IDENTIFIER      = re.compile("[\$_A-Za-z][\$_A-Za-z0-9]*")
 
 # NOTE: This is not the complete list of keywords for JavaScript, we removed
 # some such as typeof, null, which may be used as functions/values in code.
@@ -59,6 +63,8 @@ volatile while with""".replace("\n", " ").split()
 MODULE_VANILLA = "vanilla"
 MODULE_UMD     = "umd"
 MODULE_GOOGLE  = "google"
+MODULE_ES      = "esm"
+MODULE_BUNDLE  = "bundle"
 
 OPTION_EXTERNS        = "externs"
 OPTION_NICE           = "nice"
@@ -66,12 +72,44 @@ OPTION_NOPARENS       = "noparens"
 OPTION_EXTEND_ITERATE = "iterate"
 OPTION_TESTS          = "tests"
 OPTION_NOBINDING      = "nobinding"
+OPTION_MINIFY         = "minify"
+OPTION_LAZY           = "lazy"
 
 OPTIONS = {
 	"ENABLE_METADATA" : False,
 	"INCLUDE_SOURCE"  : False,
+	"CACHE_METHODS"   : False,
 }
 
+# Bundles (see `MODULE_BUNDLE`) wrap all the modules of the program in a
+# single closure, written to a single `bundle.js` file when split.
+BUNDLE_PREFIX = "// " + SNIP % ("bundle.js") + "\n// START:BUNDLE\n(function(){"
+BUNDLE_SUFFIX = "})();\n// END:BUNDLE"
+
+# Returns the method `n` of `o` bound to `o`, caching it in a non-enumerable
+# property of `o` for as long as the method is not changed.
+BOUND_METHOD = (
+	"function __bound(o,n){var c=o.__bound__,f=o[n],b=c&&c.o===o?c.get(n):undefined;"
+	"if(b&&b[0]===f){return b[1]}if(!Object.isExtensible(o)){return f.bind(o)}"
+	"if(!c||c.o!==o){c=new Map();c.o=o;Object.defineProperty(o,'__bound__',{value:c})}"
+	"b=[f,f.bind(o)];c.set(n,b);return b[1]}"
+)
+
+# Defers the init `f` of the module `m` until one of the module's slots is
+# first accessed, or until the module's `__lazy__` hook is invoked. The slots
+# are accessors until then, which give way to the original slots before the
+# modules returned by `d` (the imported modules) and then the module itself
+# are initialized, so that modules are initialized after the modules they
+# depend on.
+LAZY_MODULE = (
+	"function __lazy(m,d,f){var ks=f?Object.keys(m):[],ps={},done=false;"
+	"function i(){if(done){return}done=true;for(var k in ps){Object.defineProperty(m,k,ps[k])}"
+	"d().forEach(function(_){if(_&&_.__lazy__){_.__lazy__()}});if(f){f.call(m)}}"
+	"ks.forEach(function(k){var p=Object.getOwnPropertyDescriptor(m,k);if(!p.configurable){return}ps[k]=p;"
+	"Object.defineProperty(m,k,{get:function(){i();return m[k]},set:function(v){i();m[k]=v},enumerable:p.enumerable,configurable:true})});"
+	"Object.defineProperty(m,'__lazy__',{value:i,configurable:true});return m}"
+)
+
 JS_OPERATORS = {
 	"and"   :"&&",
 	"is"    :"===",
@@ -94,6 +132,103 @@ UNIT_OPERATORS = {
 
 RE_STRING_FORMAT = re.compile("\{((\d+)|([\w_]+))\s*(:\s*(\w+))?\}")
 
+# The names that minified code must never use for its local variables: the
+# reserved words and literals of JavaScript, along with the names that the
+# writer itself outputs within functions and module wrappers.
+MINIFY_RESERVED = set("""await break case catch class const continue debugger
+default delete do else enum eval export extends false finally for function if
+implements import in instanceof interface let new null package private
+protected public return static super switch this throw true try typeof var
+void while with yield arguments undefined NaN Infinity self result _ c window
+global exports require define module goog factory __module__ __wrapped__
+__def""".split())
+
+MINIFY_START = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+MINIFY_CHARS = MINIFY_START + "0123456789"
+
+#------------------------------------------------------------------------------
+#
+#  MINIFICATION
+#
+#------------------------------------------------------------------------------
+
+def minifiedName( index ):
+	"""Returns the short name with the given index, from `a` to `Z`, then `aa`
+	and so on."""
+	name  = MINIFY_START[index % len(MINIFY_START)]
+	index = index // len(MINIFY_START)
+	while index:
+		index -= 1
+		name  += MINIFY_CHARS[index % len(MINIFY_CHARS)]
+		index  = index // len(MINIFY_CHARS)
+	return name
+
+class NameScope(object):
+	"""The local names declared in a JavaScript function (or `catch` block)
+	when minifying, mapped to the short names they are written as."""
+
+	__slots__ = ("names", "next", "mangles", "block")
+
+	def __init__( self, next=0, mangles=True, block=False ):
+		self.names   = {}
+		self.next    = next
+		self.mangles = mangles
+		self.block   = block
+
+class NameCollector(Pass):
+	"""Collects the names that minified local names must not clash with, that
+	is every name referenced or declared within a module, as well as the
+	identifiers found in its embedded code. The functions and closures that
+	embed code are collected too, as the embedded code may refer to their
+	local names."""
+
+	HANDLES = [interfaces.IElement]
+
+	def __init__( self ):
+		Pass.__init__(self)
+		self.names     = set()
+		self.embedding = set()
+
+	def onElement( self, element ):
+		if isinstance(element, interfaces.IReference):
+			self.names.update(element.getReferenceName().split("."))
+		elif isinstance(element, interfaces.IEmbed):
+			self.names.update(RE_IDENTIFIER.findall(element.getCode()))
+			for _ in self.context:
+				if isinstance(_, interfaces.IFunction) or isinstance(_, interfaces.IClosure):
+					self.embedding.add(id(_))
+		dataflow = getattr(element, "dataflow", None)
+		if dataflow:
+			for slot in dataflow.getSlots():
+				self.names.add(slot.getName())
+		# Annotations (like decorators) are not walked as part of the model
+		for annotation in element.getAnnotations() or ():
+			content = annotation.getContent()
+			if isinstance(content, interfaces.IElement):
+				self.walk(content)
+
+class ImportCollector(Pass):
+	"""Collects the names of the modules imported by the import operations
+	written within the functions of a module, which are not listed in the
+	module's import operations."""
+
+	HANDLES = [interfaces.IImportOperation]
+
+	def __init__( self ):
+		Pass.__init__(self)
+		self.modules = []
+
+	def onImportOperation( self, element ):
+		if isinstance(element, interfaces.IImportModulesOperation):
+			modules = element.getImportedModuleNames()
+		elif isinstance(element, interfaces.IImportModuleOperation):
+			modules = [element.getImportedModuleName()]
+		else:
+			modules = [element.getImportOrigin()]
+		for _ in modules:
+			if _ not in self.modules:
+				self.modules.append(_)
+
 #------------------------------------------------------------------------------
 #
 #  WRITER
@@ -105,6 +240,8 @@ class Writer(AbstractWriter):
 	# The following generates short random variables. Note that it's not thread
 	# safe.
 	RNDVARLETTERS  = "ijklmonpqrstuvwxyzabcdefgh"
+	# Tells if local names are mangled when minifying (see `OPTION_MINIFY`)
+	MANGLES        = True
 	UNIT_OPERATORS = UNIT_OPERATORS
 	RUNTIME_OPS = {
 		"isIn"   :"__in__",
@@ -131,8 +268,21 @@ class Writer(AbstractWriter):
 		self._isNice                 = False
 		self._withUnits              = False
 		self._currentModule          = None
+		self._namesCache             = {}
+		self._namesEpoch             = None
+		self._isMinified             = False
+		self._nameScopes             = []
+		self._reservedNames          = set()
+		self._unmangled              = set()
+		self._selfReferences         = 0
+		self._hasBoundMethods        = False
 		self.runtimeModules          = [self.runtimePrefix[:-1], self.declarePrefix[:-1].replace("_", ".")]
 
+	def resetModuleState( self ):
+		# Generated variable names restart with each module, so that they do
+		# not depend on the modules written before by the same process.
+		self._generatedVars = [0]
+
 	def isDeadCode( self, element ):
 		"""Tells if the element is dead code or not."""
 		if not element or not element.getAnnotation("deadcode"):
@@ -141,6 +291,8 @@ class Writer(AbstractWriter):
 			return True
 
 	def _getRandomVariable( self ):
+		if self._nameScopes and self._nameScopes[-1].mangles:
+			return self._newName(self._nameScopes[-1])
 		s = "__"
 		i = self._generatedVars[0]
 		c = self.RNDVARLETTERS
@@ -166,12 +318,54 @@ class Writer(AbstractWriter):
 		pass
 		#self._generatedVars[-1] += names
 
-	def pushVarContext( self, value ):
+	def pushVarContext( self, value, block=False ):
 		# FIXME: This does not work properly
 		self._generatedVars.append([])
+		# When mangling names, each function gets its own name scope, which
+		# starts after the names of its parent so as not to shadow them.
+		if self._nameScopes:
+			parent = self._nameScopes[-1]
+			self._nameScopes.append(NameScope(
+				parent.next,
+				parent.mangles if block else id(value) not in self._unmangled,
+				block
+			))
 
 	def popVarContext( self ):
 		self._generatedVars.pop()
+		if self._nameScopes:
+			scope = self._nameScopes.pop()
+			# Variables declared in a block are hoisted to the function
+			if scope.block:
+				self._nameScopes[-1].next = max(scope.next, self._nameScopes[-1].next)
+
+	def _declareName( self, name ):
+		"""Declares the given local name in the current name scope, returning
+		the name it is to be written as."""
+		if not self._nameScopes:
+			return name
+		scope   = self._nameScopes[-1]
+		mangled = scope.names.get(name)
+		if mangled is None:
+			mangled = scope.names[name] = self._newName(scope) if scope.mangles else name
+		return mangled
+
+	def _localName( self, name ):
+		"""Returns the name the given name is written as, looking it up from
+		the innermost name scope, the same way JavaScript would bind it."""
+		for scope in reversed(self._nameScopes):
+			mangled = scope.names.get(name)
+			if mangled is not None:
+				return mangled
+		return name
+
+	def _newName( self, scope ):
+		"""Returns the next short name available in the given scope."""
+		while True:
+			name        = minifiedName(scope.next)
+			scope.next += 1
+			if name not in self._reservedNames:
+				return name
 
 	def _isSymbolValid( self, string ):
 		"""Tells if the name of the symbol is valid, ie. not a keyword
@@ -213,19 +407,44 @@ class Writer(AbstractWriter):
 		last part of a dot-separated name."""
 		return element.getName().split(".")[-1]
 
+	def _getNamesCache( self, element ):
+		"""Returns the cache for the names derived from the given element. The
+		cache is cleared whenever an element of the program model is renamed
+		or reparented, which is tracked by `Element.getNamingEpoch`."""
+		epoch = element.getNamingEpoch() if hasattr(element, "getNamingEpoch") else None
+		if epoch is None:
+			# Elements that don't track their naming can't be cached
+			return {}
+		if epoch is not self._namesEpoch:
+			self._namesCache.clear()
+			self._namesEpoch = epoch
+		return self._namesCache
+
 	def getAbsoluteName( self, element, asList=False ):
 		"""Returns the absolute name for the given element. This is the '.'
 		concatenation of the individual names of the parents."""
 		if not element or not element.getName(): return None
+		cache = self._getNamesCache(element)
+		key   = ("absolute", element)
+		names = cache.get(key)
+		if names is None:
+			names = self._getAbsoluteNames(element)
+			# FIXME: This is a bit of a hack
+			if names is None: return self.write(element)
+			names = cache[key] = (names, ".".join(names))
+		return list(names[0]) if asList else names[1]
+
+	def _getAbsoluteNames( self, element ):
+		"""Returns the list of names that make the absolute name of the given
+		element, or `None` if the element is a type reference."""
 		names = element.getName().split(".")
-		if len(names) > 1: return names if asList else ".".join(names)
+		if len(names) > 1: return names
 		# TODO: We should have a special handling for the current module, but
 		# this is disabled for now.
 		# if element == self.getCurrentModule() and self.resolve(element.getName())[1] != element:
 		# 	return ["__module__"] if asList else "__module__"
 		if isinstance( element, interfaces.ITypeReference ):
-			# FIXME: This is a bit of a hack
-			return self.write(element)
+			return None
 		while element.getParent():
 			element = element.getParent()
 			# Transient scope elements do not participate in the naming
@@ -239,7 +458,7 @@ class Writer(AbstractWriter):
 				n = element.getName()
 				if n:
 					names.insert(0, n)
-		return names if asList else ".".join(names)
+		return names
 
 	def getSafeLocalName( self, element ):
 		name = self.getSafeName(element)
@@ -253,14 +472,21 @@ class Writer(AbstractWriter):
 		# 	return "__module__"
 		if isinstance(element, str):
 			return RE_SAFENAME.sub("_", element)
-		elif self._moduleType == MODULE_VANILLA:
-			return self.getAbsoluteName(element).replace("/", ".").replace(":", ".").replace("-","_")
+		elif self._moduleType != MODULE_VANILLA and not (isinstance(element, interfaces.IProgram) or isinstance(element, interfaces.IModule)):
+			name = self.getName().replace("-", "_")
+			return self.getSafeSuperName(element) + ("." + name if name else "")
 		else:
-			if isinstance(element, interfaces.IProgram) or isinstance(element, interfaces.IModule):
-				return self.getAbsoluteName(element).replace(".", "_").replace("-", "_").replace("/", ".").replace(":", ".")
-			else:
-				name = self.getName().replace("-", "_")
-				return self.getSafeSuperName(element) + ("." + name if name else "")
+			cache = self._getNamesCache(element)
+			key   = ("safe", element, self._moduleType)
+			name  = cache.get(key)
+			if name is None:
+				name = self.getAbsoluteName(element)
+				if self._moduleType == MODULE_VANILLA:
+					name = name.replace("/", ".").replace(":", ".").replace("-","_")
+				else:
+					name = name.replace(".", "_").replace("-", "_").replace("/", ".").replace(":", ".")
+				cache[key] = name
+			return name
 
 	def getSafeSuperName( self, element ):
 		"""Returns the absolute name of the given element's parent."""
@@ -268,7 +494,20 @@ class Writer(AbstractWriter):
 		name   = element.getName()
 		if not parent:
 			return name
-		if parent == self.getCurrentModule():
+		# The safe super name depends on what the parent names resolve to
+		# in the current scope, so the scope is part of the key.
+		module = self.getCurrentModule()
+		cache  = self._getNamesCache(element)
+		key    = ("super", element, self._moduleType, module, self.getCurrentDataFlow())
+		res    = cache.get(key)
+		if res is None:
+			res = cache[key] = self._getSafeSuperName(element, parent, name, module)
+		return res
+
+	def _getSafeSuperName( self, element, parent, name, module ):
+		if self.isBundled(parent):
+			return self.getBundleName(parent, name)
+		elif parent == module:
 			if self.resolve(self.getLocalName(parent))[1] == parent:
 				return self.getLocalName(parent) + "." + name
 			else:
@@ -335,23 +574,35 @@ class Writer(AbstractWriter):
 	def onModule( self, moduleElement ):
 		"""Writes a Module element."""
 		if self.isDeadCode(moduleElement): return []
+		self._hasBoundMethods = False
 		# Detects the module type
 		self._withExterns = self.environment.options.get(OPTION_EXTERNS) and True or False
 		self._isNice      = self.environment.options.get(OPTION_NICE)
 		self._isUnambiguous = not self.environment.options.get(OPTION_NOPARENS)
 		self._withUnits     = self.environment.options.get(OPTION_TESTS)
 		self._noBinding     = self.environment.options.get(OPTION_NOBINDING)
+		self._isMinified    = self.environment.options.get(OPTION_MINIFY) and True or False
+		self._isLazy        = self.environment.options.get(OPTION_LAZY) and True or False
 		if self.environment.options.get(MODULE_UMD):
 			self._moduleType = MODULE_UMD
 		elif self.environment.options.get(MODULE_GOOGLE):
 			self._moduleType = MODULE_GOOGLE
+		elif self.environment.options.get(MODULE_ES):
+			self._moduleType = MODULE_ES
+		elif self.environment.options.get(MODULE_BUNDLE):
+			self._moduleType = MODULE_BUNDLE
 		else:
 			self._moduleType = MODULE_VANILLA
+		is_es                   = self._moduleType == MODULE_ES
+		is_bundle               = self._moduleType == MODULE_BUNDLE
 		self._withExtendIterate = self.environment.options.get(OPTION_EXTEND_ITERATE) and True or False
 		module_name             = self.getSafeName(moduleElement)
 		full_name               = self.getAbsoluteName(moduleElement)
+		if self._isMinified and self.MANGLES:
+			self._startNameMangling(moduleElement)
+		# NOTE: Bundles are written as a single file (see `BUNDLE_PREFIX`)
 		code = [
-			"// " + SNIP % ("%s|%s" % (moduleElement.getSourcePath(), self.getAbsoluteName(moduleElement))),
+			None if is_bundle else "// " + SNIP % ("%s|%s" % (moduleElement.getSourcePath(), self.getAbsoluteName(moduleElement))),
 		] + self._header() + [
 			self._document(moduleElement),
 			self.options["ENABLE_METADATA"] and "function __def(v,m){var ms=v['__def__']||{};for(var k in m){ms[k]=m[k]};v['__def__']=ms;return v}" or None,
@@ -361,18 +612,37 @@ class Writer(AbstractWriter):
 			code.extend(self.getModuleUMDPrefix(moduleElement))
 		elif self._moduleType == MODULE_GOOGLE:
 			code.extend(self.getModuleGooglePrefix(moduleElement))
+		elif is_es:
+			code.extend(self.getModuleESPrefix(moduleElement))
+		elif is_bundle:
+			code.extend(self.getModuleBundlePrefix(moduleElement))
 		else:
 			code.extend(self.getModuleVanillaPrefix(moduleElement))
 		code.extend(self._runtimePreamble())
 		# --- VERSION ---------------------------------------------------------
 		version = moduleElement.getAnnotation("version")
 		if version:
-			code.append("%s.__VERSION__='%s';" % (module_name, version.getContent()))
+			if is_es:
+				code.append("export const __VERSION__='%s';" % (version.getContent()))
+			else:
+				code.append("%s.__VERSION__='%s';" % (module_name, version.getContent()))
 		# --- SLOTS -----------------------------------------------------------
+		# ES modules export each slot as a separate binding, so that bundlers
+		# can drop the slots that are never imported. Bundles bind each slot
+		# to a variable of the bundle's closure, which the module's namespace
+		# gives access to.
+		has_init = False
 		for name, value, accessor, mutator in moduleElement.getSlots():
+			# Slots that `RemoveDeadCode` found unreachable are not written
+			if self.isDeadCode(value): continue
 			declaration = ""
 			if isinstance(value, interfaces.IModuleAttribute):
-				declaration = u"{0}.{1};".format(module_name, self.write(value))
+				if is_es:
+					declaration = u"export let {0};".format(self.write(value))
+				elif is_bundle:
+					declaration = self._writeBundleAttribute(moduleElement, name, value)
+				else:
+					declaration = u"{0}.{1};".format(module_name, self.write(value))
 			else:
 				# NOTE: Some slot values may be shadowed, in which case they
 				# won't return any value
@@ -389,17 +659,29 @@ class Writer(AbstractWriter):
 						slot_name = "main"
 						if self._isNice:
 							declaration = "\n".join(self._section("Module main")) + "\n"
-					declaration   += u"{0}.{1} = {2}".format(module_name, slot_name, self._format(value_code))
+					if is_es:
+						has_init       = has_init or slot_name == self.jsInit
+						declaration   += "export const " + slot_name + " = " + self._format(value_code)
+						value_name     = slot_name
+					elif is_bundle:
+						value_name     = self.getBundleName(moduleElement, name)
+						declaration   += "var " + value_name + " = " + self._format(value_code) + ";\n"
+						declaration   += module_name + "." + slot_name + " = " + value_name
+					else:
+						declaration   += module_name + "." + slot_name + " = " + self._format(value_code)
+						value_name     = module_name + "." + slot_name
 					if isinstance(value, interfaces.IClass):
 						self.pushContext(value)
-						declaration += ";\n" + self._format(self._onClassPostamble(value, module_name + "." + slot_name))
+						declaration += ";\n" + self._format(self._onClassPostamble(value, value_name))
 						self.popContext()
 			code.append(self._document(value))
 			if declaration:
 				code.append(declaration)
 		# --- INIT ------------------------------------------------------------
 		# FIXME: Init should be only invoked once
-		if self._moduleType != MODULE_VANILLA and not self._noBinding:
+		# NOTE: ES modules are not registered in the globals, as this would
+		# retain all of their exports.
+		if self._moduleType != MODULE_VANILLA and not is_es and not self._noBinding:
 			code.extend(self.registerModuleInWindow(moduleElement))
 		if self._isNice:
 			code += self._section("Module initialization code")
@@ -407,10 +689,24 @@ class Writer(AbstractWriter):
 				"// NOTE: This is called after the registration, as init code might",
 				"// depend on the module to be registered (eg. dynamic loading)."
 			]
-		code.append('if (typeof(%s.%s)!="undefined") {%s.%s();}' % (
-			module_name, self.jsInit,
-			module_name, self.jsInit
-		))
+		lazy_dependencies = self.getLazyDependencies(moduleElement) if self._isLazy and not is_es else []
+		if self.isLazy(moduleElement) or lazy_dependencies:
+			# NOTE: Modules without init still define the hook, so that the
+			# modules they import are initialized in order.
+			code.append("__lazy(%s, function(){return [%s]}, %s);" % (
+				module_name, ",".join(lazy_dependencies),
+				(module_name + "." + self.jsInit) if self.isLazy(moduleElement) else "undefined"
+			))
+			# NOTE: Bundles declare the helper once, in their closure
+			if not is_bundle:
+				code.append(LAZY_MODULE)
+		elif not is_es:
+			code.append('if (typeof(%s.%s)!="undefined") {%s.%s();}' % (
+				module_name, self.jsInit,
+				module_name, self.jsInit
+			))
+		elif has_init:
+			code.append("%s();" % (self.jsInit))
 		for _ in self._writeUnitTests(moduleElement):
 			code.append(_)
 		# --- SOURCE ----------------------------------------------------------
@@ -422,17 +718,63 @@ class Writer(AbstractWriter):
 				source = source.split("://",1)[-1]
 				if os.path.exists(source):
 					with open(source) as f:
-						code.append("%s.__source__=%s;" % (module_name, json.dumps(f.read())))
+						if is_es:
+							code.append("export const __source__=%s;" % (json.dumps(f.read())))
+						else:
+							code.append("%s.__source__=%s;" % (module_name, json.dumps(f.read())))
+		# NOTE: The helper is a function declaration, so it is hoisted
+		if self._hasBoundMethods:
+			code.append(BOUND_METHOD)
 		# --- SUFFIX ----------------------------------------------------------
 		# We add the suffix
 		if self._moduleType == MODULE_UMD:
 			code.extend(self.getModuleUMDSuffix(moduleElement))
 		elif self._moduleType == MODULE_GOOGLE:
 			code.extend(self.getModuleGoogleSuffix(moduleElement))
+		elif is_es:
+			code.extend(self.getModuleESSuffix(moduleElement))
+		elif is_bundle:
+			code.extend(self.getModuleBundleSuffix(moduleElement))
 		else:
 			code.extend(self.getModuleVanillaSuffix(moduleElement))
 		# --- RESULT ----------------------------------------------------------
-		return self._format(*code)
+		if self._isMinified:
+			self._endNameMangling()
+			return self._minify(self._format(*code))
+		else:
+			return self._format(*code)
+
+	# === MINIFICATION ========================================================
+
+	def _startNameMangling( self, moduleElement ):
+		"""Sets up the mangling of the local names of the given module, where
+		local variables, parameters and generated variables get short names
+		that don't clash with any name referenced in the module."""
+		collector = NameCollector()
+		collector.walk(moduleElement)
+		self._reservedNames = collector.names | MINIFY_RESERVED
+		for module in self.getProgram().getModules():
+			self._reservedNames.update(self.getAbsoluteName(module, asList=True))
+			self._reservedNames.add(self.getSafeName(module))
+		self._unmangled      = collector.embedding
+		self._nameScopes     = [NameScope()]
+		self._runtimeAliases = (self.runtimePrefix, self.declarePrefix)
+
+	def _endNameMangling( self ):
+		if self._nameScopes:
+			self.runtimePrefix, self.declarePrefix = self._runtimeAliases
+		self._nameScopes    = []
+		self._reservedNames = set()
+		self._unmangled     = set()
+
+	def _minify( self, code ):
+		"""Removes the indentation, empty lines and line comments from the given
+		code (see `Rope.compact`), keeping the lines that the splitter relies
+		on. Statements stay on their own lines, so that they never need
+		semicolons to be inserted."""
+		if not isinstance(code, Rope):
+			code = Rope([(0, code)])
+		return code.compact()
 
 	# === VANILLA MODULES =====================================================
 
@@ -607,6 +949,154 @@ class Writer(AbstractWriter):
 			"// END:GOOGLE_POSTAMBLE"
 		]
 
+	# === ES MODULES ==========================================================
+
+	def getModuleESPrefix( self, moduleElement ):
+		module_name = self.getSafeName(moduleElement)
+		abs_name    = self.getAbsoluteName(moduleElement)
+		imported    = []
+		# NOTE: We prevent modules from importing themselves, as the module
+		# imports its own namespace as `__module__` below.
+		# Modules imported within functions are imported statically too, as
+		# a dynamic `import()` would bind the imported names to promises.
+		inner = ImportCollector()
+		inner.walk(moduleElement)
+		for _ in self.runtimeModules + self.getImportedModules(moduleElement) + inner.modules:
+			if _ != abs_name and _ not in imported:
+				imported.append(_)
+		symbols = []
+		for alias, module, slot, op in self.getImportedSymbols(moduleElement):
+			safe_module = self.getSafeLocalName(module)
+			if module == abs_name:
+				continue
+			elif not slot:
+				# Modules are already imported
+				if alias:
+					symbols.append("const {0} = {1};".format(alias or safe_module, safe_module))
+			else:
+				pass
+				# NOTE: References to imported symbols are always absolute,
+				# which bundlers resolve statically as namespace members.
+		return [
+			"// START:ESM_PREAMBLE",
+		] + [
+			"import * as {0} from \"{1}\";".format(self.getSafeLocalName(_), _) for _ in imported
+		] + [
+			# The module's own namespace is only used by the code that
+			# references the module as a value (eg. `self` in functions).
+			"import * as __module__ from \"{0}\";".format(abs_name),
+			"const {0} = __module__;".format(module_name) if module_name != "__module__" else "",
+		] + symbols + ["// END:ESM_PREAMBLE\n"]
+
+	def getModuleESSuffix( self, moduleElement ):
+		return []
+
+	# === BUNDLES =============================================================
+
+	def getModuleBundlePrefix( self, moduleElement ):
+		# NOTE: The namespace is declared in the bundle's closure, so that the
+		# other modules can reference it, while the module's own code is in
+		# a block where `__module__` is the namespace.
+		return [
+			"// START:BUNDLE_PREAMBLE",
+			"const {0} = {{}};".format(self.getSafeName(moduleElement)),
+			"{",
+			"const {0} = {1};".format(self.jsModule, self.getSafeName(moduleElement)),
+			"// END:BUNDLE_PREAMBLE\n",
+		]
+
+	def getModuleBundleSuffix( self, moduleElement ):
+		return [
+			"\n// START:BUNDLE_POSTAMBLE",
+			"}",
+			"// END:BUNDLE_POSTAMBLE",
+		]
+
+	def getBundleName( self, moduleElement, name ):
+		"""Returns the name of the bundle's variable bound to the slot with
+		the given name in the given module. The `$` prevents the name from
+		clashing with the names of the program."""
+		return self.getSafeName(moduleElement) + "$" + name
+
+	def isBundled( self, moduleElement ):
+		"""Tells if the slots of the given module are bound to variables of
+		the bundle being written. The slots of lazily initialized modules are
+		accessed through their namespace from the other modules, so that the
+		first access initializes the module."""
+		return self._moduleType == MODULE_BUNDLE and isinstance(moduleElement, interfaces.IModule) and not moduleElement.isImported() and (
+			moduleElement == self.getCurrentModule() or not self.isLazy(moduleElement)
+		)
+
+	def getBundlePrefix( self ):
+		"""Returns the code that opens the bundle's closure, along with the
+		helpers that its modules share."""
+		if self.environment.options.get(OPTION_LAZY):
+			return BUNDLE_PREFIX + "\n" + LAZY_MODULE
+		else:
+			return BUNDLE_PREFIX
+
+	def onProgram( self, element ):
+		res = AbstractWriter.onProgram(self, element)
+		if self.environment.options.get(MODULE_BUNDLE):
+			return self._join("\n", [self.getBundlePrefix(), res, BUNDLE_SUFFIX])
+		else:
+			return res
+
+	def stream( self, program, processes=0 ):
+		is_bundle = self.environment.options.get(MODULE_BUNDLE)
+		if is_bundle:
+			yield self.getBundlePrefix()
+		for text in AbstractWriter.stream(self, program, processes):
+			yield text
+		if is_bundle:
+			yield BUNDLE_SUFFIX
+
+	# === LAZY INITIALIZATION =================================================
+
+	def isLazy( self, moduleElement ):
+		"""Tells if the init of the given module is deferred until the module
+		is first accessed (see `LAZY_MODULE`). ES modules are always
+		initialized when loaded, as their namespace cannot be changed."""
+		if not self.environment.options.get(OPTION_LAZY) or self.environment.options.get(MODULE_ES):
+			return False
+		elif not moduleElement.hasSlot(interfaces.Constants.ModuleInit):
+			return False
+		else:
+			return not self.isDeadCode(moduleElement.getSlot(interfaces.Constants.ModuleInit))
+
+	def getLazyDependencies( self, moduleElement ):
+		"""Returns the expressions of the modules imported by the given
+		module, which are initialized before it."""
+		abs_name = self.getAbsoluteName(moduleElement)
+		res      = []
+		for name in self.getImportedModules(moduleElement):
+			if name == abs_name or name in self.runtimeModules:
+				continue
+			elif self._moduleType == MODULE_UMD:
+				res.append(self.getSafeLocalName(name))
+			elif self._moduleType == MODULE_GOOGLE:
+				res.append(self.getSafeName(name))
+			elif self._moduleType == MODULE_BUNDLE:
+				# Only the modules of the bundle are declared in its closure
+				module = self.getProgram().getModule(name)
+				if module and not module.isImported():
+					res.append(self.getSafeName(module))
+			else:
+				res.append(name)
+		return res
+
+	def _writeBundleAttribute( self, moduleElement, name, element ):
+		"""Writes the given module attribute as a variable of the bundle,
+		accessed through a property of the module's namespace."""
+		default_value = element.getDefaultValue()
+		value_name    = self.getBundleName(moduleElement, name)
+		return "var {0} = {1};\nObject.defineProperty({2}, \"{3}\", {{get:function(){{return {0}}}, set:function(_){{{0}=_}}, enumerable:true, configurable:true}});".format(
+			value_name,
+			self.write(default_value) if default_value else "undefined",
+			self.jsModule,
+			name,
+		)
+
 	def registerModuleInWindow( self, moduleElement ):
 		safe_name = self.getSafeName(moduleElement)
 		names     = self.getAbsoluteName(moduleElement, asList=True)
@@ -630,7 +1120,44 @@ class Writer(AbstractWriter):
 	# =========================================================================
 
 	def onImportOperation( self, importElement):
-		return self._format("")
+		# Module imports are written in the module prefix. ES modules also
+		# statically import the modules imported within functions (see
+		# `getModuleESPrefix`), so that the imported names are bound here
+		# to the module's namespace (or to the symbol).
+		if self._moduleType != MODULE_ES or isinstance(importElement.getParent(), interfaces.IModule):
+			return self._format("")
+		o = importElement
+		if isinstance(o, interfaces.IImportModuleOperation):
+			imports = [(o.getAlias() or o.getImportedModuleName(), o.getImportedModuleName(), None)]
+		elif isinstance(o, interfaces.IImportModulesOperation):
+			imports = [(_, _, None) for _ in o.getImportedModuleNames()]
+		elif isinstance(o, interfaces.IImportSymbolOperation):
+			imports = [(o.getAlias() or o.getImportedElement(), o.getImportOrigin(), o.getImportedElement())]
+		elif isinstance(o, interfaces.IImportSymbolsOperation):
+			imports = [(_.getAlias() or _.getImportedElement(), o.getImportOrigin(), _.getImportedElement()) for _ in o.getImportedElements()]
+		else:
+			raise Exception("Import operation not supported yet: {0}".format(o))
+		res = []
+		for alias, module, symbol in imports:
+			name      = self._declareName(self.getSafeLocalName(alias))
+			namespace = self.jsModule if module == self.getAbsoluteName(self.getCurrentModule()) else self.getSafeLocalName(module)
+			if symbol:
+				res.append("const {0} = {1}.{2}".format(name, namespace, symbol))
+			elif name != namespace:
+				res.append("const {0} = {1}".format(name, namespace))
+		return self._format(";\n".join(res))
+
+	def onImportSymbolOperation( self, importElement ):
+		return self.onImportOperation(importElement)
+
+	def onImportSymbolsOperation( self, importElement ):
+		return self.onImportOperation(importElement)
+
+	def onImportModuleOperation( self, importElement ):
+		return self.onImportOperation(importElement)
+
+	def onImportModulesOperation( self, importElement ):
+		return self.onImportOperation(importElement)
 
 	# =========================================================================
 	# CLASS
@@ -760,21 +1287,21 @@ class Writer(AbstractWriter):
 			result.append("%s," % (self.write(destructors[0])))
 		if accessors:
 			result.append("accessors:{")
-			result.extend([",\n\n".join(self._format(self.onMethod(_)) for _ in accessors)])
+			result.extend([self._join(",\n\n", (self._format(self.onMethod(_)) for _ in accessors))])
 			result.append("},")
 		if mutators:
 			result.append("mutators:{")
-			result.extend([",\n\n".join(self._format(self.onMethod(_)) for _ in mutators)])
+			result.extend([self._join(",\n\n", (self._format(self.onMethod(_)) for _ in mutators))])
 			result.append("},")
 		if methods:
 			result += self._group("Methods", 1)
-			written_meths = ",\n\n".join(self._format(self.write(_)) for _ in methods)
+			written_meths = self._join(",\n\n", (self._format(self.write(_)) for _ in methods))
 			result.append("methods: {")
 			result.append([written_meths])
 			result.append("},")
 		if classOperations:
 			result += self._group("Class methods", 1)
-			written_ops = ",\n\n".join(self._format(self.write(_)) for _ in classOperations)
+			written_ops = self._join(",\n\n", (self._format(self.write(_)) for _ in classOperations))
 			result.append("operations:{")
 			result.append([written_ops])
 			result.append("},")
@@ -906,6 +1433,7 @@ class Writer(AbstractWriter):
 		res         = []
 		parent      = element.getParent()
 		name        = self._rewriteSymbol( element.getName() )
+		self_count  = self._selfReferences
 		if name == interfaces.Constants.Constructor:
 			name = "init"
 		elif name == interfaces.Constants.Destructor:
@@ -922,7 +1450,12 @@ class Writer(AbstractWriter):
 			operations = ["return " + self._runtimeEventBind(event.getContent()) + ";"]
 		else:
 			operations = list(map(self._writeStatement, element.getOperations()))
-		if parent and isinstance(parent, interfaces.IModule):
+		if parent and isinstance(parent, interfaces.IModule) and self._moduleType == MODULE_ES:
+			# ES modules only bind the module's namespace when the function
+			# uses it, as bundlers would otherwise retain all the exports.
+			if self._selfReferences != self_count:
+				self_ref = ['const {0} = __module__;'.format(self._runtimeSelfReference(element))]
+		elif parent and isinstance(parent, interfaces.IModule):
 			self_ref = ['const {0} = {1};'.format(
 				self._runtimeSelfReference(element),
 				self.getResolvedName(element.parent))
@@ -942,8 +1475,9 @@ class Writer(AbstractWriter):
 			res.append("const result = __wrapped__.apply(%s, arguments);" % (self._runtimeSelfReference(element)))
 			res.append(self.writeFunctionPost(element))
 			res.append("return result;")
-		res = self.writeDecorators(element, res)
+		# Decorators are evaluated outside of the function's scope
 		self.popVarContext()
+		res = self.writeDecorators(element, res)
 		return res
 
 	def onAccessor( self, element ):
@@ -978,6 +1512,8 @@ class Writer(AbstractWriter):
 		an iteration loop.
 		"""
 		operations = closure.getOperations()
+		if not bodyOnly:
+			self.pushVarContext(closure)
 		implicits  = [_ for _ in self._writeAllocations(closure)]
 		if bodyOnly:
 			result = implicits + [self._format(self.write(_)) + ";" for _ in operations]
@@ -996,6 +1532,7 @@ class Writer(AbstractWriter):
 					"}, %s)" % ( self._writeFunctionMeta(closure))
 				)
 			]
+			self.popVarContext()
 		# We format the result as a string
 		# FIXME: Should not do that
 		result = self._format(*result)
@@ -1012,9 +1549,9 @@ class Writer(AbstractWriter):
 			# The scope will be a map containing the current enclosed values. We
 			# get the list of names of enclosed variables.
 			transpose = transpose or {}
-			enclosed = list(encloses.content.keys())
+			enclosed = [self._localName(_) for _ in encloses.content.keys()]
 			# There might be a `transpose` parameter to rename the variables
-			transposed = [transpose.get(_) or _ for _ in enclosed]
+			transposed = [transpose.get(k) or v for k, v in zip(encloses.content.keys(), enclosed)]
 			# We create a scope in which we're going to copy the value of the variables
 			# This is *fairly ugly*, but it's easier for now as otherwise we
 			# would need to do rewriting of variables/arguments
@@ -1066,7 +1603,7 @@ class Writer(AbstractWriter):
 
 	def onParameter( self, param ):
 		"""Writes a parameter element."""
-		return "%s" % (self._rewriteSymbol(param.getName()))
+		return "%s" % (self._declareName(self._rewriteSymbol(param.getName())))
 
 	def onImplicitReference( self, element ):
 		scope = element.getElement()
@@ -1082,6 +1619,7 @@ class Writer(AbstractWriter):
 		else:
 			scope = None
 		if symbol_name == "self":
+			self._selfReferences += 1
 			return self._runtimeSelfReference(element)
 		elif symbol_name == "__target__":
 			return "this"
@@ -1114,7 +1652,7 @@ class Writer(AbstractWriter):
 			symbol_name = ".".join(map(self._rewriteSymbol, symbol_name.split(".")))
 		# If there is no scope, then the symmbol is undefined
 		if not scope:
-			return symbol_name
+			return self._localName(symbol_name)
 		# If the slot is imported
 		elif slot.isImported():
 			return self._onImportedReference(symbol_name, slot)
@@ -1132,6 +1670,9 @@ class Writer(AbstractWriter):
 			elif isinstance(value, interfaces.IClassMethod):
 				# FIXME: Same as above
 				if self.isIn(interfaces.IMethod) or self.isIn(interfaces.IConstructor) or self.isIn(interfaces.IDestructor):
+					invocation = self.findInContext(interfaces.IInvocation)
+					if invocation and invocation.getTarget() == element:
+						return self._runtimeGetMethodByName(symbol_name, value, element)
 					return self._runtimeWrapMethodByName(symbol_name, value, element)
 				else:
 					#return "%s.%s" % (self._runtimeSelfReference(value), symbol_name)
@@ -1146,13 +1687,21 @@ class Writer(AbstractWriter):
 				return self._runtimeSelfReference(value) + "." + symbol_name
 		# It is a local variable
 		elif self.getCurrentFunction() == scope:
-			return symbol_name
+			return self._localName(symbol_name)
 		# It within the current module
 		elif self.getCurrentModule() == scope:
+			# NOTE: ES modules refer to the exported binding, which can be
+			# assigned to, unlike the module's namespace.
+			if self._moduleType == MODULE_ES:
+				return symbol_name
+			elif self.isBundled(scope) and scope.hasSlot(symbol_name):
+				return self.getBundleName(scope, symbol_name)
 			# NOTE: We need the current module scope so as not to shadow
 			return "__module__." + symbol_name
 		# It is a property of a module
 		elif isinstance(scope, interfaces.IModule):
+			if self.isBundled(scope) and scope.hasSlot(symbol_name):
+				return self.getBundleName(scope, symbol_name)
 			names = [self._rewriteSymbol(scope.getName()), symbol_name]
 			while scope.getParent():
 				scope = scope.getParent()
@@ -1171,13 +1720,13 @@ class Writer(AbstractWriter):
 		# FIXME: This is an exception... iteration being an operation, not a
 		# context...
 		elif isinstance(scope, interfaces.IIteration):
-			return symbol_name
+			return self._localName(symbol_name)
 		elif isinstance(scope, interfaces.IClosure):
-			return symbol_name
+			return self._localName(symbol_name)
 		elif isinstance(scope, interfaces.IProgram):
-			return symbol_name
+			return self._localName(symbol_name)
 		elif isinstance(scope, interfaces.IBlock):
-			return symbol_name
+			return self._localName(symbol_name)
 		else:
 			raise Exception("Unsupported scope:" + str(scope))
 
@@ -1193,7 +1742,7 @@ class Writer(AbstractWriter):
 		elif isinstance(o, interfaces.IImportSymbolOperation):
 			module_name = o.getImportOrigin()
 			symbol_name = o.getImportedElement()
-			return self.getSafeName(self.getProgram().getModule(module_name)) + "." + symbol_name
+			return self._writeModuleSlot(self.getProgram().getModule(module_name), symbol_name)
 		elif isinstance(o, interfaces.IImportSymbolsOperation):
 			module_name = o.getImportOrigin()
 			match       = None
@@ -1204,12 +1753,20 @@ class Writer(AbstractWriter):
 				# NOTE: We don't use the alias here but the actual symbol
 				# because we're doing a fully prefixed resolution because we're
 				# doing a fully prefixed resolution.
-				return self.getSafeName(self.getProgram().getModule(module_name)) + "." + match.getImportedElement()
+				return self._writeModuleSlot(self.getProgram().getModule(module_name), match.getImportedElement())
 			else:
 				raise Exception("Could not find imported symbol: {0} in parent operation {1}".format(name, op))
 		else:
 			raise Exception("Import operation not supported yet: {0}".format(o))
 
+	def _writeModuleSlot( self, module, name ):
+		"""Returns the expression of the slot with the given name in the
+		given module."""
+		if self.isBundled(module) and module.hasSlot(name):
+			return self.getBundleName(module, name)
+		else:
+			return self.getSafeName(module) + "." + name
+
 	def onOperator( self, operator ):
 		"""Writes an operator element."""
 		o = operator.getReferenceName()
@@ -1230,7 +1787,7 @@ class Writer(AbstractWriter):
 
 	def onList( self, element ):
 		"""Writes a list element."""
-		return '[%s]' % (", ".join([
+		return '[%s]' % (self._join(", ", [
 			self.write(e) for e in element.getValues()
 		]))
 
@@ -1250,7 +1807,7 @@ class Writer(AbstractWriter):
 				break
 		# If we only have litterals, we can create the map "as is"
 		if only_litterals:
-			return '{%s}' % (", ".join([
+			return '{%s}' % (self._join(", ", [
 				"%s:%s" % ( self._writeDictKey(k),self.write(v))
 				for k,v in element.getItems()
 				])
@@ -1270,9 +1827,9 @@ class Writer(AbstractWriter):
 		# NOTE: We don't do any declaration here as the declaration happens
 		# in the parent scope
 		if v:
-			return "%s%s = %s" % (prefix, self._rewriteSymbol(s.getName()), self._format(self.write(v)))
+			return "%s%s = %s" % (prefix, self._localName(self._rewriteSymbol(s.getName())), self._format(self.write(v)))
 		else:
-			return "%s%s" % (prefix, self._rewriteSymbol(s.getName()))
+			return "%s%s" % (prefix, self._localName(self._rewriteSymbol(s.getName())))
 
 	def onAssignment( self, assignation ):
 		"""Writes an assignation operation."""
@@ -1281,7 +1838,7 @@ class Writer(AbstractWriter):
 		parent = self.context[-2]
 		rvalue = assignation.getAssignedValue()
 		if isinstance(rvalue, interfaces.IChain):
-			return "{0}{1} = {2}".format("".join(self.write(rvalue)), self.write(assignation.getTarget()), rvalue.dataflow.getImplicitSlotFor(rvalue).getName())
+			return "{0}{1} = {2}".format(self._join("", self.write(rvalue)), self.write(assignation.getTarget()), rvalue.dataflow.getImplicitSlotFor(rvalue).getName())
 		else:
 			return "%s = %s" % (
 				self.write(assignation.getTarget()),
@@ -1343,6 +1900,17 @@ class Writer(AbstractWriter):
 			return self._runtimeSuperResolution(resolution)
 		elif isinstance(resolution, interfaces.IDecomposition):
 			return self._runtimeDecompose(context, reference)
+		elif self._moduleType == MODULE_BUNDLE and isinstance(context, interfaces.IReference):
+			# Slots of the bundled modules are accessed through the variables
+			# bound to them rather than through the modules' namespaces.
+			module  = self.resolve(context)[1]
+			current = self.getCurrentModule()
+			if module is None and context.getReferenceName() == self.getAbsoluteName(current):
+				# A module's own name is not in its scope, but it is bundled too
+				module = current
+			if isinstance(module, interfaces.IModule):
+				return self._writeModuleSlot(module, reference.getReferenceName())
+			return context_name + "." + reference.getReferenceName()
 		else:
 			# NOTE: We don't need to rewrite symbols in decompositions
 			return self.write(context) + "." + reference.getReferenceName()
@@ -1453,13 +2021,13 @@ class Writer(AbstractWriter):
 		if with_ellipsis is None:
 			return "new %s(%s)" % (
 				t,
-				", ".join(self.write(_) for _ in element.getArguments())
+				self._join(", ", (self.write(_) for _ in element.getArguments()))
 			)
 		else:
 			# SEE: https://stackoverflow.com/questions/1606797/use-of-apply-with-new-operator-is-this-possible/8843181#8843181
 			return "(function(c){{return new (Function.prototype.bind.apply(c,Array.prototype.slice.call(arguments,0,{2}+1).concat(arguments[{2}+1])));}})({0},{1})".format(
 				t,
-				", ".join(self.write(_.getValue()) for _ in element.getArguments()),
+				self._join(", ", (self.write(_.getValue()) for _ in element.getArguments())),
 				i
 			)
 
@@ -1583,6 +2151,8 @@ class Writer(AbstractWriter):
 	def onIteration( self, iteration ):
 		"""Writes a iteration operation."""
 		if isinstance(iteration.parent, interfaces.IOperation):
+			if self._isNativeIteration(iteration) and not iteration.hasAnnotation("terminates"):
+				return self._writeNativeIteration(iteration, "iterate")
 			return self._runtimeIterate(
 				iteration.getIterator(),
 				iteration.getClosure(),
@@ -1596,6 +2166,8 @@ class Writer(AbstractWriter):
 				return self._writeObjectIteration(iteration)
 
 	def onMapIteration( self, iteration ):
+		if self._isNativeIteration(iteration, iteration.getClosure()):
+			return self._writeNativeIteration(iteration, "map")
 		return self._runtimeMap(
 			iteration.getIterator(),
 			iteration.getClosure()
@@ -1605,6 +2177,8 @@ class Writer(AbstractWriter):
 		i= iteration.getIterator()
 		c = iteration.getClosure()
 		p = iteration.getPredicate()
+		if self._isNativeIteration(iteration, p):
+			return self._writeNativeIteration(iteration, "filter", p)
 		return self._runtimeFilter(i,p)
 		# FIXME: We used to have extra closure/predicate for the
 		# filter, but Sugar2 outputs a different model.
@@ -1621,6 +2195,8 @@ class Writer(AbstractWriter):
 
 	def onReduceIteration( self, iteration ):
 		op = iteration.getAnnotation("operator")
+		if not (op and op.getContent() == "::<") and self._isNativeIteration(iteration, iteration.getClosure()):
+			return self._writeNativeIteration(iteration, "reduce")
 		return self._runtimeReduce(
 			iteration.getIterator(),
 			iteration.getClosure(),
@@ -1628,7 +2204,180 @@ class Writer(AbstractWriter):
 			op.getContent() == "::<" if op else False
 		)
 
+	# === NATIVE ITERATIONS ===================================================
+	# Iterations over values that are known to be arrays are written as
+	# inline `for` loops instead of runtime calls, which saves the allocation
+	# of the closure and the runtime's dispatch on the type of the value.
+
+	def _isArray( self, element ):
+		"""Tells if the given element is known to evaluate to an array, like
+		list literals and enumerations, values typed as arrays or references
+		to values annotated with `@array`."""
+		if isinstance(element, interfaces.IList) or isinstance(element, interfaces.IEnumeration):
+			return True
+		elif self._isAnnotatedAs(element, "array"):
+			return True
+		else:
+			t = element.getResultAbstractType()
+			return isinstance(t, typecast.Array) and t is not modeltypes.Data.String
+
+	def _isIndex( self, element ):
+		"""Tells if the given element is known to evaluate to a non-negative
+		integer, as inferred by the `Typer` pass."""
+		return element.getResultAbstractType() is modeltypes.Data.UnsignedInteger
+
+	def _isObject( self, element ):
+		"""Tells if the given element is known to evaluate to an object that
+		is not an array, like dict literals, values typed as maps or
+		references to values annotated with `@object`."""
+		if isinstance(element, interfaces.IDict):
+			return True
+		elif self._isAnnotatedAs(element, "object"):
+			return True
+		else:
+			return isinstance(element.getResultAbstractType(), typecast.Map)
+
+	def _isAnnotatedAs( self, element, name ):
+		if element.hasAnnotation(name):
+			return True
+		elif isinstance(element, interfaces.IReference):
+			value = self.resolve(element.getReferenceName())[1]
+			return hasattr(value, "hasAnnotation") and value.hasAnnotation(name)
+		else:
+			return False
+
+	def _isNativeIteration( self, iteration, closure=None ):
+		"""Tells if the given iteration can be written as a native loop. The
+		closure of expression iterations must be a plain closure that
+		returns an expression, so that the expression can be inlined."""
+		if self._withExtendIterate or not self._isArray(iteration.getIterator()):
+			return False
+		if closure is None:
+			closure = iteration.getClosure()
+			return isinstance(closure, interfaces.IClosure) and not self._hasSpecialParameters(closure)
+		if not isinstance(closure, interfaces.IClosure) or self._hasSpecialParameters(closure):
+			return False
+		operations = closure.getOperations()
+		return len(operations) == 1 and isinstance(operations[0], interfaces.ITermination)
+
+	def _hasSpecialParameters( self, closure ):
+		for param in closure.getParameters():
+			if param.isRest() or not (param.getDefaultValue() is None):
+				return True
+		return False
+
+	def _writeNativeIteration( self, iteration, kind, closure=None ):
+		"""Writes the given iteration as a `for` loop within a function that
+		is invoked right away, so that it stays an expression. The `kind` is
+		one of `iterate`, `map`, `filter` and `reduce`, and the closure's
+		parameters are bound like they are by the corresponding runtime
+		functions: the parameters that are not bound are reset to `undefined`
+		for each item, and a reduction keeps its accumulated value when the
+		expression is `undefined`."""
+		closure  = closure or iteration.getClosure()
+		iterator = iteration.getIterator()
+		initial  = iteration.getInitialValue() if kind == "reduce" else None
+		# The iterated value and the initial value are given as arguments, as
+		# they are evaluated outside of the closure's scope.
+		bounds   = self._getEnumerationBounds(iterator)
+		values   = [] if bounds else [self.write(iterator)]
+		if initial is not None:
+			values.append(self.write(initial))
+		self.pushVarContext(closure)
+		dataflow = closure.dataflow
+		self._reserveVariableNames(*[_.getName() for _ in dataflow.getSlots()] if dataflow else [])
+		params   = [self.write(_) for _ in closure.getParameters()]
+		a        = (params.pop(0) if params else self._getRandomVariable()) if kind == "reduce" else None
+		v        = params[0] if len(params) > 0 else self._getRandomVariable()
+		i        = params[1] if len(params) > 1 else self._getRandomVariable()
+		n        = self._getRandomVariable()
+		r        = self._getRandomVariable()
+		args     = []
+		if bounds:
+			# Enumerations with literal bounds don't need to create the array
+			start, count, step = bounds
+			item = lambda index: self._writeEnumerationItem(start, step, index)
+			head = ["var {n}={count};".format(n=n, count=count)]
+			if not isinstance(count, int):
+				# A written count is evaluated outside of the closure's scope
+				head = []
+				args.append(n)
+				values.insert(0, count)
+		else:
+			l    = self._getRandomVariable()
+			item = lambda index: "{l}[{index}]".format(l=l, index=index)
+			head = ["var {n}={l}.length;".format(n=n, l=l)]
+			args.append(l)
+		if kind == "iterate":
+			body   = self.onClosure(closure, bodyOnly=True)
+			result = None
+		else:
+			expression = self.write(closure.getOperations()[0].getReturnedEvaluable())
+			body       = list(self._writeAllocations(closure))
+			if kind == "map":
+				head.append("var {r}=[];".format(r=r))
+				body.append("{r}.push({e});".format(r=r, e=expression))
+				result = r
+			elif kind == "filter":
+				head.append("var {r}=[];".format(r=r))
+				body.append("if ({e}) {{{r}.push({v});}}".format(r=r, e=expression, v=v))
+				result = r
+			else:
+				if initial is None:
+					# Without an initial value, the first item is the initial value
+					head.append("var {a}={n}>0?{item}:undefined;".format(a=a, n=n, item=item("0")))
+				else:
+					args.append(a)
+				y = self._getRandomVariable()
+				body.append("var {y}={e};".format(y=y, e=expression))
+				body.append("if ({y}!==undefined) {{{a}={y};}}".format(y=y, a=a))
+				result = a
+		self.popVarContext()
+		return self._format(
+			"(function({0}){{".format(",".join(args)),
+			head + [
+				"for (var {i}={s};{i}<{n};{i}++){{".format(i=i, n=n, s=1 if kind == "reduce" and initial is None else 0),
+				[
+					"var {v}={item};".format(v=v, item=item(i)),
+				] + ["var {0}=undefined;".format(_) for _ in params[2:]] + (body if isinstance(body, list) else [body]),
+				"}",
+				"return {0};".format(result) if result else None,
+			],
+			"}}({0}))".format(",".join(values))
+		)
+
+	def _writeEnumerationItem( self, start, step, index ):
+		"""Returns the expression of the item at the given index of an
+		enumeration with the given start and step."""
+		item = index if step == 1 else "{0}*{1}".format(index, step)
+		return item if start == 0 else "{0}+{1}".format(start, item)
+
+	def _getEnumerationBounds( self, iterator ):
+		"""Returns the `(start, count, step)` of the given enumeration when it
+		has literal bounds, following the same rules as range iterations. An
+		enumeration from zero to a value known to be a non-negative integer
+		has the written value as count."""
+		if not isinstance(iterator, interfaces.IEnumeration):
+			return None
+		start, end, step = iterator.getStart(), iterator.getEnd(), iterator.getStep()
+		if isinstance(start, interfaces.INumber) and start.getActualValue() == 0 and step is None and self._isIndex(end):
+			return 0, self.write(end), 1
+		if not (isinstance(start, interfaces.INumber) and isinstance(end, interfaces.INumber)):
+			return None
+		if step is not None and not isinstance(step, interfaces.INumber):
+			return None
+		start = start.getActualValue()
+		end   = end.getActualValue()
+		step  = abs(step.getActualValue()) if step is not None else 1
+		if not step:
+			return None
+		if start > end:
+			step = -step
+		count = max(0, int(math.ceil((end - start) / float(step))))
+		return start, count, step
+
 	def _writeRangeIteration( self, iteration ):
+
 		iterator = iteration.getIterator()
 		closure  = iteration.getClosure()
 		start    = self.write(iterator.getStart())
@@ -1652,7 +2401,7 @@ class Writer(AbstractWriter):
 		else:
 			if step < 0: step = -step
 		if isinstance(closure, interfaces.IClosure):
-			args  = [self._rewriteSymbol(a.getName()) for a in closure.getParameters()]
+			args  = [self._declareName(self._rewriteSymbol(a.getName())) for a in closure.getParameters()]
 		elif isinstance(closure, interfaces.IReference):
 			args = []
 		else:
@@ -1666,7 +2415,7 @@ class Writer(AbstractWriter):
 			"var %s=%s;" % (v,i),
 			self.onClosure(closure, bodyOnly=True) if isinstance(closure,
 			interfaces.IClosure) \
-			else closure.getReferenceName() + "({0}, {1})".format(*args),
+			else self._localName(closure.getReferenceName()) + "({0}, {1})".format(*args),
 			"}"
 		)
 
@@ -1689,16 +2438,32 @@ class Writer(AbstractWriter):
 		dataflow            = (closure and closure.dataflow or iteration.dataflow)
 		reserved_slot_names = [_.getName() for _ in dataflow.getSlots()] if dataflow else []
 		self._reserveVariableNames(*reserved_slot_names)
-		args    = [self._rewriteSymbol(a.getName()) for a in closure.getParameters()] if isinstance(closure, interfaces.IClosure) else []
+		args    = [self._declareName(self._rewriteSymbol(a.getName())) for a in closure.getParameters()] if isinstance(closure, interfaces.IClosure) else []
+		# When the iterated value is known to be an array or an object, we
+		# don't need to check its type. Fresh arrays (that the iteration's body
+		# can't modify) are iterated with `for...of` when the index is not used,
+		# and enumerations with a counter when the body is an inline closure,
+		# as other callbacks are given the iterated value.
+		iterated = iteration.getIterator()
+		bounds   = self._getEnumerationBounds(iterated) if isinstance(closure, interfaces.IClosure) else None
+		if bounds:
+			shape    = "range"
+		elif self._isArray(iterated):
+			is_fresh = isinstance(iterated, interfaces.IList) or isinstance(iterated, interfaces.IEnumeration)
+			shape    = "values" if is_fresh and len(args) <= 1 and isinstance(closure, interfaces.IClosure) else "array"
+		elif self._isObject(iterated):
+			shape    = "object"
+		else:
+			shape    = None
 		if len(args) == 0: args.append(self._getRandomVariable())
-		if len(args) == 1: args.append(self._getRandomVariable())
+		if len(args) == 1 and shape != "values": args.append(self._getRandomVariable())
 		v  = args[0]
-		i  = args[1]
-		l  = self._getRandomVariable()
-		k  = self._getRandomVariable()
-		ki = self._getRandomVariable()
-		kl = self._getRandomVariable()
-		iterator = self.write(iteration.getIterator())
+		i  = args[1] if shape != "values" else None
+		l  = self._getRandomVariable() if shape not in ("values", "range") else None
+		k  = self._getRandomVariable() if shape in (None, "object") else None
+		ki = self._getRandomVariable() if shape != "values" else None
+		kl = self._getRandomVariable() if shape != "values" else None
+		iterator = self.write(iterated) if shape != "range" else None
 		prefix     = None
 		encloses   = None
 		if isinstance(closure, interfaces.IClosure):
@@ -1715,9 +2480,51 @@ class Writer(AbstractWriter):
 				closure = self.onClosure(closure, bodyOnly=True)
 		else:
 			closure = self.handle(closure) + "({0}, {1}, {2})".format(v,i,l)
-		# If there is no scope forcing, then we can do a simple iteration
-		# over the array/object
-		# TODO: Use for of https://developer.mozilla.org/en-US/docs/Web/JavaScript/Reference/Statements/for...of
+		if shape == "values":
+			return self._format(
+				"for (var {v} of {iterator}){{".format(v=v, iterator=iterator),
+				(closure,),
+				"}"
+			)
+		elif shape == "range":
+			# Enumerations are iterated without creating the array
+			start, count, step = bounds
+			return self._format(
+				"var {kl}={count};".format(kl=kl, count=count),
+				"for (var {ki}=0;{ki}<{kl};{ki}++){{".format(ki=ki, kl=kl),
+				(
+					"var {i}={ki};".format(i=i, ki=ki),
+					"var {v}={item};".format(v=v, item=self._writeEnumerationItem(start, step, ki)),
+					closure,
+				),
+				"}"
+			)
+		elif shape == "array":
+			return self._format(
+				"var {l}={iterator};".format(l=l, iterator=iterator),
+				"var {kl}={l}.length;".format(l=l, kl=kl),
+				"for (var {ki}=0;{ki}<{kl};{ki}++){{".format(ki=ki, kl=kl),
+				(
+					"var {i}={ki};".format(i=i, ki=ki),
+					"var {v}={l}[{i}];".format(v=v, l=l, i=i),
+					closure,
+				),
+				"}"
+			)
+		elif shape == "object":
+			return self._format(
+				"var {l}={iterator};".format(l=l, iterator=iterator),
+				"var {k}=Object.keys({l});".format(k=k, l=l),
+				"var {kl}={k}.length;".format(k=k, kl=kl),
+				"for (var {ki}=0;{ki}<{kl};{ki}++){{".format(ki=ki, kl=kl),
+				(
+					"var {i}={k}[{ki}];".format(i=i, k=k, ki=ki),
+					"var {v}={l}[{i}];".format(v=v, l=l, i=i),
+					closure,
+				),
+				"}"
+			)
+		# Otherwise we do a generic iteration over the array/object
 		return self._format(
 			# OK, so it is a bit complicated here. We start by storing a reference
 			# to the iterated expression
@@ -1750,12 +2557,20 @@ class Writer(AbstractWriter):
 	def onAccessOperation( self, operation ):
 		target = operation.getTarget()
 		index  = operation.getIndex()
-		is_direct = isinstance(index, interfaces.IString) or isinstance(index, interfaces.INumber) and index.getActualValue() >= 0
+		is_direct = isinstance(index, interfaces.IString) or isinstance(index, interfaces.INumber) and index.getActualValue() >= 0 or self._isIndex(index)
 		is_lvalue = isinstance(operation.parent, interfaces.IAssignment) and operation.parent.getTarget() is operation
 		if is_direct or is_lvalue:
 			return self._format(
 				"%s[%s]" % (self.write(target), self.write(index))
 			)
+		elif self._isArray(target) and isinstance(target, interfaces.IReference) and (isinstance(index, interfaces.IReference) or isinstance(index, interfaces.INumber)):
+			# The negative indexes of arrays are relative to their end, which
+			# we can write inline when the operands can be evaluated twice.
+			t, i = self.write(target), self.write(index)
+			if isinstance(index, interfaces.INumber):
+				return self._format("%s[%s.length%s]" % (t, t, i))
+			else:
+				return self._format("(%s<0?%s[%s.length+%s]:%s[%s])" % (i, t, t, i, t, i))
 		else:
 			return self._format(self._runtimeAccess(
 				self.write(target), self.write(index)
@@ -1792,13 +2607,13 @@ class Writer(AbstractWriter):
 		# them in a prefix
 		i       = self.lastIndexInContext(interfaces.IClosure)
 		closure = self.context[i] if i >= 0 else None
-		prefix  = "&&".join(self.write(_.content) for _ in
-				closure.getAnnotations("post")) if closure else None
+		prefix  = self._join("&&", (self.write(_.content) for _ in
+				closure.getAnnotations("post"))) if closure else None
 		# We format the result
 		result = self.write(termination.getReturnedEvaluable())
 		if prefix:
 			result = "(({0}) || true) ? {1} : undefined".format(prefix, result)
-		else:
+		elif not isinstance(result, Rope):
 			result = "{0}".format(result)
 
 		iteration = self.findInContext(interfaces.IIteration)
@@ -1865,11 +2680,14 @@ class Writer(AbstractWriter):
 		try_finally = interception.getConclusion()
 		res         = ["try {", list(map(self._writeStatement, try_block.getOperations())), "}"]
 		if try_catch:
+			# The caught exception is only bound within the catch block
+			self.pushVarContext(try_catch, block=True)
 			res[-1] += " catch(%s) {" % ( self.write(try_catch.getArguments()[0]))
 			res.extend([
 				list(map(self._writeStatement, try_catch.getOperations())),
 				"}"
 			])
+			self.popVarContext()
 		if try_finally:
 			res[-1] += " finally {"
 			res.extend([list(map(self._writeStatement, try_finally.getOperations())), "}"])
@@ -2028,6 +2846,8 @@ class Writer(AbstractWriter):
 
 	def _document( self, element ):
 		res = None
+		if self._isMinified:
+			return res
 		if isinstance(element, interfaces.IClass):
 			res = "\n".join(self._section(element.getName()))
 		if element.getDocumentation():
@@ -2051,8 +2871,10 @@ class Writer(AbstractWriter):
 			declared = {}
 			for s in self._walkDataFlowSlots(element.dataflow):
 				if s.isArgument() or s.isImported() or s.isEnvironment(): continue
-				if s.isImplicit() or (not implicitsOnly):
+				if s.isImplicit():
 					declared[s.getName()] = True
+				elif not implicitsOnly:
+					declared[self._declareName(s.getName())] = True
 			if declared:
 				yield "var {0};".format(", ".join(declared.keys()))
 
@@ -2108,7 +2930,7 @@ class Writer(AbstractWriter):
 		r = self.write(element)
 		if isinstance( element, interfaces.IContext):
 			return r
-		elif isinstance(r, str) or isinstance(r, unicode):
+		elif isinstance(r, str) or isinstance(r, unicode) or isinstance(r, Rope):
 			return r + ";"
 		else:
 			return r
@@ -2166,13 +2988,13 @@ class Writer(AbstractWriter):
 				# For singletons the absolute name is actually the class name
 				return "Object.getPrototypeOf(Object.getPrototypeOf(self).constructor).apply({2},[{1}])".format(
 					self.getSafeSuperName(self.getCurrentClass()),
-					", ".join(map(self.write, element.getArguments())),
+					self._join(", ", map(self.write, element.getArguments())),
 					self._runtimeSelfReference(),
 				)
 			else:
 				return "Object.getPrototypeOf({0}).apply({2},[{1}])".format(
 					self.getSafeSuperName(self.getCurrentClass()),
-					", ".join(map(self.write, element.getArguments())),
+					self._join(", ", map(self.write, element.getArguments())),
 					self._runtimeSelfReference(),
 				)
 		else:
@@ -2180,11 +3002,14 @@ class Writer(AbstractWriter):
 			# is a simple call forwarding
 			return "({0}.apply({2},[{1}]))".format(
 				self.write(element.getTarget()),
-				", ".join(map(self.write, element.getArguments())),
+				self._join(", ", map(self.write, element.getArguments())),
 				self._runtimeSelfReference(),
 			)
 
 	def _runtimeGetMethodByName(self, name, value=None, element=None):
+		if isinstance(value, interfaces.IClassMethod) and not self.findInContext(interfaces.IClassMethod):
+			# Class methods are invoked on the class when within methods
+			return "Object.getPrototypeOf({0}).constructor.{1}".format(self._runtimeSelfReference(element), name)
 		return self._runtimeSelfReference(value) + "." + name
 
 	def _runtimeWrapMethodByName(self, name, value=None, element=None):
@@ -2193,11 +3018,20 @@ class Writer(AbstractWriter):
 			if self.findInContext(interfaces.IClassMethod):
 				# In ES, we need to re-bind static methods when we're calling
 				# them back, otherwise the reference will be lost.
-				return "{0}.{1}.bind({0})".format(s, name)
+				return self._runtimeBindMethod(s, name)
 			else:
-				return "Object.getPrototypeOf({0}).constructor.{1}.bind(Object.getPrototypeOf({0}).constructor)".format(s, name)
+				return self._runtimeBindMethod("Object.getPrototypeOf({0}).constructor".format(s), name)
 		else:
-			return "{0}.{1}.bind({0})".format(s, name)
+			return self._runtimeBindMethod(s, name)
+
+	def _runtimeBindMethod(self, target, name):
+		"""Returns the method `name` of `target` bound to `target`. The bound
+		method is cached, so that it is only created once per object."""
+		if self.options.get("CACHE_METHODS"):
+			self._hasBoundMethods = True
+			return "__bound({0},\"{1}\")".format(target, name)
+		else:
+			return "{0}.{1}.bind({0})".format(target, name)
 
 	def _runtimeGetCurrentClass(self, element=None ):
 		if self.indexLikeInContext(interfaces.IClassAttribute) >= 0:
@@ -2221,7 +3055,7 @@ class Writer(AbstractWriter):
 		return "{0}{1}({2})".format(
 			self.runtimePrefix,
 			self.RUNTIME_OPS.get(name) or name,
-			", ".join(self.write(_) for _ in args)
+			self._join(", ", (self.write(_) for _ in args))
 		)
 
 	def _runtimeIsIn( self, element, collection ):
@@ -2268,8 +3102,8 @@ class Writer(AbstractWriter):
 			assert_symbol,
 			predicate,
 			json.dumps(self.getScopeName() + ":"),
-			json.dumps("(failed `" + predicate + "`)"),
-			", ".join(self.write(_) for _ in rest) or '""',
+			json.dumps("(failed `{0}`)".format(predicate)),
+			self._join(", ", (self.write(_) for _ in rest)) or '""',
 		)
 
 	def _runtimeRestArguments( self, i ):
@@ -2306,7 +3140,7 @@ class Writer(AbstractWriter):
 		if with_ellipsis is None:
 			return "{0}({1})".format(
 				self.write(element.getTarget()),
-				", ".join(self.write(_) for _ in args)
+				self._join(", ", (self.write(_) for _ in args))
 			)
 		else:
 			a = args[:with_ellipsis]
@@ -2320,8 +3154,8 @@ class Writer(AbstractWriter):
 				args = self.write(n[0].getValue())
 			else:
 				args = "[{0}]{1}".format(
-					", ".join(self.write(_) for _ in a),
-					"".join(".concat(" + (self.write(_.getValue())) + ")" for _ in n),
+					self._join(", ", (self.write(_) for _ in a)),
+					self._join("", (".concat(" + (self.write(_.getValue())) + ")" for _ in n)),
 				)
 
 			target = element.getTarget()
@@ -2344,7 +3178,20 @@ class Writer(AbstractWriter):
 				)
 
 	def _runtimePreamble( self ):
-		return []
+		if not self._nameScopes:
+			return []
+		# When mangling names, the runtime modules are accessed through short
+		# aliases, declared in the module's scope.
+		res = []
+		for prefix in self._runtimeAliases:
+			module = prefix[:-1]
+			alias  = self._declareName(module)
+			res.append("{0}=typeof({1})!='undefined'?{1}:undefined".format(alias, module))
+		self.runtimePrefix = self._localName(self.runtimePrefix[:-1]) + "."
+		self.declarePrefix = self._localName(self.declarePrefix[:-1]) + "."
+		# NOTE: The modules of a bundle share the bundle's closure, so their
+		# aliases are scoped to the module's block.
+		return [("let " if self._moduleType == MODULE_BUNDLE else "var ") + ",".join(res) + ";"]
 
 	def _runtimeAccess( self, target, index ):
 		return "{0}__access__({1},{2})".format(self.runtimePrefix, target, index)
@@ -2378,7 +3225,7 @@ class Writer(AbstractWriter):
 		elif len(args) == 1:
 			args = self.write(args[0])
 		else:
-			args = "[" + ", ".join(self.write(_) for _ in args) + "]"
+			args = "[" + self._join(", ", (self.write(_) for _ in args)) + "]"
 		return "{0}__send__({1}, {2}, {3}, {1})".format(self.runtimePrefix, target, event, args)
 
 	def _runtimeEventBind( self, element ):
@@ -6,7 +6,7 @@
 # License           :   BSD License (revised)
 # ------------------------------------------------------------------------------
 # Creation date     :   21-Mar-2005
-# Last mod.         :   15-Aug-2007
+# Last mod.         :   19-Oct-2026
 # ------------------------------------------------------------------------------
 
 # TODO: Add in-place type mutation (so that one type instance can become another)
@@ -17,7 +17,6 @@
 #       types. isSubtype(Parameter, Parameter(String))
 # TODO: Test suites for Sequence_combine
 
-import types as pythontypes
 
 __pychecker__ = "unusednames=_,___,_0_"
 
@@ -30,6 +29,67 @@ __pychecker__ = "unusednames=_,___,_0_"
 class SemanticError(Exception): pass
 class InvalidArgument(Exception): pass
 
+# ------------------------------------------------------------------------------
+#
+# INTERNING
+#
+# ------------------------------------------------------------------------------
+
+# The interned types, by structural key. Interned types are never released, so
+# that their `id` can be used in the keys of their parents and of the memos.
+INTERNED = {}
+
+def intern( theType ):
+	"""Returns the shared instance of the types that have the same structure
+	as the given type, which becomes the shared instance if there is none.
+	Interned types must not be modified, so that the types with the same
+	structure are identical (`a is b`) and that the comparisons between
+	interned types can be memoized. Types that have no structural key (like
+	contexts, which are nominal) and types that have a concrete type (like
+	the processes of closures) are returned as-is."""
+	if theType._interned:
+		return theType
+	key = theType.key() if theType._concrete is None else None
+	if key is None:
+		return theType
+	res = INTERNED.get(key)
+	if res is None:
+		res = INTERNED[key] = theType
+		theType._interned = True
+	return res
+
+def internKey( theType, *structure ):
+	"""Returns the structural key for the given type, made of its class, name,
+	parent types and of the given structure (values and interned types), or
+	`None` if one of these types can't be interned."""
+	theType._parentTypes = [intern(_) for _ in theType._parentTypes]
+	res = [theType.__class__, theType._name]
+	for _ in theType._parentTypes + list(structure):
+		if not isinstance(_, Type):
+			res.append(_)
+		elif _._interned:
+			res.append(id(_))
+		else:
+			return None
+	return tuple(res)
+
+def memoized( comparison ):
+	"""Decorates the given comparison method (`isSameAs`, `isLike`,
+	`isSubtypeOf`) so that its result is cached when both types are
+	interned."""
+	memo = {}
+	def method( self, otherType ):
+		if not (self._interned and isinstance(otherType, Type) and otherType._interned):
+			return comparison(self, otherType)
+		key = (id(self), id(otherType))
+		res = memo.get(key)
+		if res is None:
+			res = memo[key] = comparison(self, otherType)
+		return res
+	method.__name__ = comparison.__name__
+	method.__doc__  = comparison.__doc__
+	return method
+
 # ------------------------------------------------------------------------------
 #
 # ABSTRACT TYPE
@@ -45,13 +105,23 @@ class Type:
 		self._parentTypes = []
 		self._definition  = None
 		self._concrete    = None
+		self._interned    = False
 
 	def setConcreteType( self, value ):
 		"""Sets the _concrete type_ for this abstract type. The concrete type
 		is a value which represents the type. For instance, if this type
-		represents a class, then the concrete type would be the class instance."""
+		represents a class, then the concrete type would be the class instance.
+		Interned types are shared, and thus have no concrete type."""
+		assert not self._interned, "Interned types can't be modified: %s" % (self)
 		self._concrete = value
 
+	def key( self ):
+		"""Returns the structural key of this type, which is the same for
+		all the types with the same structure, or `None` if the type can't
+		be interned (see `intern`). The children of the type are interned
+		by this method."""
+		return None
+
 	def concreteType( self ):
 		"""Returns the _concrete type_ for this abstract type."""
 		return self._concrete
@@ -71,17 +141,24 @@ class Type:
 	def isSameAs( self, otherType ):
 		"""Generic implementation of isSameAs. You should always call this method
 		in subclasses."""
-		if otherType == self: return True
+		if otherType is self: return True
 		else: return False
 
 	def isLike( self, otherType ):
 		"""Generic implementation of isLike. You should always call this method
 		in subclasses, as it implements basic type systems rules such as
 		isLike(Any)."""
-		if otherType == self: return True
-		if otherType == Any: return True
+		if otherType is self: return True
+		if otherType is Any: return True
 		return False
 
+	def addParent( self, parentType ):
+		"""Adds the given type to the parents of this type (see
+		`isSubtypeOf`)."""
+		assert not self._interned, "Interned types can't be modified: %s" % (self)
+		self._parentTypes.append(parentType)
+		return self
+
 	def subtype( self, name ):
 		subtype = self.__class__()
 		subtype.name(name)
@@ -91,15 +168,18 @@ class Type:
 	def isSubtypeOf( self, otherType ):
 		"""Generic implementation of isSubtypeOf. You should always call this method
 		in subclasses, as it implements basic type systems rules such as
-		isSubtypeOf(Any)."""
-		if otherType == self: return True
-		if otherType == Any: return True
-		# FIXME: Implement transitivity, or whatever...
-		else: return otherType in self._parentTypes
+		isSubtypeOf(Any) and the transitivity of parent types."""
+		if otherType is self: return True
+		if otherType is Any: return True
+		for parent in self._parentTypes:
+			if parent is otherType or Type.isSubtypeOf(parent, otherType): return True
+		return False
 
 	def name( self, name=None):
 		"""Returns/sets the name for this type. By defaults, types are unnamed."""
-		if name: self._name = name
+		if name:
+			assert not self._interned, "Interned types can't be modified: %s" % (self)
+			self._name = name
 		if self._name == None:
 			return self.__class__.__name__
 		return self._name
@@ -111,6 +191,7 @@ class Type:
 	def asString( self, fromTypes=None ):
 		"""Returns a string representation of this type."""
 		if fromTypes == None: fromTypes = []
+		# The types are shared, so only the types we are in are cycles
 		if self in fromTypes: return "@"
 		fromTypes.append(self)
 		return None
@@ -146,6 +227,9 @@ class Symbolic(Type):
 	def __init__( self, name ):
 		Type.__init__(self, name)
 
+	def key( self ):
+		return internKey(self)
+
 	def asString( self, fromType=None ):
 		return self._name
 
@@ -170,11 +254,16 @@ class Cell(Type):
 		Type.__init__(self, name)
 		self._bytes = length
 
+	def key( self ):
+		return internKey(self, self._bytes)
+
+	@memoized
 	def isSameAs( self, otherType ):
 		if Type.isSameAs(self, otherType): return True
 		if not isinstance( otherType, Cell): return False
 		return otherType.length() == self.length()
 
+	@memoized
 	def isLike( self, otherType ):
 		"""The other type is like this Cell if the other type is a cell of the
 		same length as this one."""
@@ -184,6 +273,7 @@ class Cell(Type):
 		if self.length() != otherType.length(): return False
 		return True
 
+	@memoized
 	def isSubtypeOf( self, otherType ):
 		if Type.isSubtypeOf(self, otherType): return True
 		if not isinstance( otherType, Cell): return False
@@ -217,18 +307,25 @@ class Array(Type):
 
 	def setContentType( self, theType ):
 		assert isinstance(theType, Type)
+		assert not self._interned, "Interned types can't be modified: %s" % (self)
 		self._contentType = theType
 
+	def key( self ):
+		self._contentType = intern(self._contentType)
+		return internKey(self, self._contentType)
+
 	# TODO: Maybe add a "peel" method
 	def content( self ):
 		"""Returns the type for the content of this array."""
 		return self._contentType
 
+	@memoized
 	def isSameAs( self, otherType ):
 		if Type.isSameAs(self, otherType): return True
 		if not isinstance( otherType, Array): return False
 		return self.content().isSameAs(otherType.content())
 
+	@memoized
 	def isLike( self, otherType ):
 		"""Othertype must be an Array with a content type that is the same type
 		as the content type."""
@@ -236,6 +333,7 @@ class Array(Type):
 		if not isinstance(otherType, Array): return False
 		return self.content().isLike(otherType.content())
 
+	@memoized
 	def isSubtypeOf( self, otherType ):
 		"""Othertype must be an Array with a content type that is a subtype of
 		this content type."""
@@ -247,7 +345,9 @@ class Array(Type):
 		if fromTypes == None: fromTypes = []
 		res = Type.asString(self, fromTypes)
 		if res: return res
-		return "[%s]" % (self._contentType.asString(fromTypes))
+		res = "[%s]" % (self._contentType.asString(fromTypes))
+		fromTypes.pop()
+		return res
 
 # ------------------------------------------------------------------------------
 #
@@ -265,10 +365,15 @@ class Sequence(Type):
 
 	def add( self, theType ):
 		assert isinstance(theType, Type)
+		assert not self._interned, "Interned types can't be modified: %s" % (self)
 		assert not self._elements or \
 		not self._elements[-1] == Rest, "No element is allowed after Rest"
 		self._elements.append(theType)
 
+	def key( self ):
+		self._elements = [intern(_) for _ in self._elements]
+		return internKey(self, *self._elements)
+
 	def extend( self, othertype ):
 		if isinstance(othertype, Sequence):
 			for e in othertype.elements():
@@ -282,6 +387,7 @@ class Sequence(Type):
 	def length( self ):
 		return len(self._elements)
 
+	@memoized
 	def isSameAs( self, otherType ):
 		if Type.isSameAs(self, otherType): return True
 		if not isinstance( otherType, Sequence): return False
@@ -292,6 +398,7 @@ class Sequence(Type):
 			if not this_elements[i].isSameAs(other_elements[i]): return False
 		return True
 
+	@memoized
 	def isLike( self, otherType ):
 		"""The other type is like this one if the other is a sequence with the
 		same length and that all elements are like the corresponding elements of
@@ -306,6 +413,7 @@ class Sequence(Type):
 		if len(other_elements) != len(this_elements): return False
 		return True
 
+	@memoized
 	def isSubtypeOf( self, otherType ):
 		if Type.isSubtypeOf(self, otherType): return True
 		if not isinstance(otherType, Sequence): return False
@@ -321,7 +429,9 @@ class Sequence(Type):
 		if fromTypes == None: fromTypes = []
 		res = Type.asString(self, fromTypes)
 		if res: return res
-		return "(" + ",".join([t.asString(fromTypes) for t in self._elements]) + ")"
+		res = "(" + ",".join([t.asString(fromTypes) for t in self._elements]) + ")"
+		fromTypes.pop()
+		return res
 
 def Sequence_make( args, sequenceclass=Sequence ):
 	"""Tries to make a sequence from the given argumnents. This follows the
@@ -348,20 +458,17 @@ def Sequence_combine( a, b, sequenceclass=Sequence ):
 	if a == Nothing and b == Nothing: return Nothing
 	if a == Nothing: return b
 	if b == Nothing: return a
+	# NOTE: The sequences are not modified, as they may be interned
 	if isinstance(a, Sequence):
-		if isinstance(b, Sequence):
-			for el in b.elements():
-				a.add(el)
-		else:
-			a.add(b)
-		return a
+		sequenceclass = a.__class__
+		a = a.elements()
+	else:
+		a = [a]
 	if isinstance(b, Sequence):
-		a = sequenceclass(a)
-		for el in b.elements():
-			a.add(el)
-		return a
+		b = b.elements()
 	else:
-		return sequenceclass(a, b)
+		b = [b]
+	return sequenceclass(*(list(a) + list(b)))
 
 # ------------------------------------------------------------------------------
 #
@@ -395,8 +502,13 @@ class Process(Type):
 		otherwise."""
 		if not isinstance(theType, Type):
 			raise InvalidArgument("Expected class or Type subclass: %s" % (repr(theType)))
+		assert not self._interned, "Interned types can't be modified: %s" % (self)
 		self._elements.append(theType)
 
+	def key( self ):
+		self._elements = [intern(_) for _ in self._elements]
+		return internKey(self, *self._elements)
+
 	def arguments( self, args=None ):
 		"""Returns the arguments of this process encapsulated in a sequence
 		if there is more than one argument."""
@@ -435,6 +547,7 @@ class Process(Type):
 			raise SemanticError("Cannot peel a process with only two elements.")
 		return Process(self._elements[1:])
 
+	@memoized
 	def isSameAs( self, otherType ):
 		if Type.isSameAs(self, otherType): return True
 		if not isinstance(otherType, Process): return False
@@ -445,6 +558,7 @@ class Process(Type):
 			if not this_elements[i].isLike(other_elements[i]):return False
 		return True
 
+	@memoized
 	def isLike( self, otherType ):
 		"""The other type is like this one if the other is a sequence with the
 		same length and that all elements are like the corresponding elements of
@@ -458,6 +572,7 @@ class Process(Type):
 			if not this_elements[i].isLike(other_elements[i]):return False
 		return True
 
+	@memoized
 	def isSubtypeOf( self, otherType ):
 		"""The other type is like this one if the other is a sequence with the
 		same length and that all elements are like the corresponding elements of
@@ -476,7 +591,9 @@ class Process(Type):
 		if fromTypes == None: fromTypes = []
 		res = Type.asString(self, fromTypes)
 		if res: return res
-		return self.arguments().asString(fromTypes) + "->" + self.result().asString(fromTypes)
+		res = self.arguments().asString(fromTypes) + "->" + self.result().asString(fromTypes)
+		fromTypes.pop()
+		return res
 
 	def clone( self, clone=None ):
 		if clone == None: clone = Process()
@@ -508,8 +625,15 @@ class Map(Type):
 		type ('theType')."""
 		assert isinstance(theType, Type), "Expected Typecast._Type instance: %s" % (theType)
 		assert theType != Nothing, "There is no point in adding Nothing."
+		assert not self._interned, "Interned types can't be modified: %s" % (self)
 		self._elements[name] = theType
 
+	def key( self ):
+		names = sorted(self._elements.keys())
+		for name in names:
+			self._elements[name] = intern(self._elements[name])
+		return internKey(self, *[_ for name in names for _ in (name, self._elements[name])])
+
 	def get( self, name ):
 		"""Returns the type for the slot with the given name."""
 		return self._elements[name]
@@ -526,6 +650,7 @@ class Map(Type):
 		"""Returns the element associated to the given key."""
 		return self._elements[key]
 
+	@memoized
 	def isSameAs( self, otherType ):
 		if Type.isSameAs(self, otherType): return True
 		if not isinstance(otherType, Map): return False
@@ -538,6 +663,7 @@ class Map(Type):
 			if not this_elements[key].isSameAs(val): return False
 		return True
 
+	@memoized
 	def isLike( self, otherType ):
 		"""The other type is like this one if the other is a sequence with the
 		same length and that all elements are like the corresponding elements of
@@ -553,6 +679,7 @@ class Map(Type):
 			if not this_elements[key].isLike(val): return False
 		return True
 
+	@memoized
 	def isSubtypeOf( self, otherType ):
 		"""The other type is a subtype of this one if for each element of this
 		type, we find that the other type has a subtype."""
@@ -573,8 +700,10 @@ class Map(Type):
 		res = Type.asString(self, fromTypes)
 		if res: return res
 		assert self in fromTypes
-		return "%s={" % (self.name() or '_') + ",".join(["%s:%s" % (k, t.asString(fromTypes)) for k, t in
+		res = "%s={" % (self.name() or '_') + ",".join(["%s:%s" % (k, t.asString(fromTypes)) for k, t in
 		list(self.elements().items())]) + "}"
+		fromTypes.pop()
+		return res
 
 	def clone(self, clone=None ):
 		if clone == None: clone = Map()
@@ -598,6 +727,10 @@ class Context(Map):
 		for arg in args:
 			self.extends(arg)
 
+	def key( self ):
+		"""Contexts are nominal types, and are thus never interned."""
+		return None
+
 	def extends( self, parent ):
 		"""Add a new parent from which this Context inherits."""
 		assert parent not in self._parents
@@ -676,23 +809,23 @@ def Interface(Context):
 #
 # ------------------------------------------------------------------------------
 
-Nothing = Symbolic("Nothing")
-Nil     = Symbolic("Nil")
-Any     = Symbolic("Any")
-Rest    = Symbolic("Rest")
+Nothing = intern(Symbolic("Nothing"))
+Nil     = intern(Symbolic("Nil"))
+Any     = intern(Symbolic("Any"))
+Rest    = intern(Symbolic("Rest"))
 
 def bits(size):
 	"""Converts the given number of bits into bytes. This is simply for
 	readibility purprose."""
 	assert size % 8 == 0
-	return size / 8
+	return size // 8
 
 def isSame( a, b ):
 	"""Type (b) is the same as (a) if (a) and (b) are identicial, that means
 	that you can use b where you use a, and this also means that isSame(a,b) ==
 	isSame(b,a). Basically, when (b) is same as (a), (b) can be considered as an
 	alias for (a)."""
-	a.isSame(b)
+	return a is b or a.isSameAs(b)
 
 def isLike( a, b ):
 	"""Type (b) is like type (a) if (b) can be used where (a) can be used. When
@@ -709,7 +842,7 @@ def isSubtype( a, b ):
 	return a.isSubtypeOf(b)
 
 def isType( a ):
-	return isinstance(a, Type) or type(a) == pythontypes.ClassType
+	return isinstance(a, Type) or isinstance(a, type)
 
 # ------------------------------------------------------------------------------
 #
@@ -1,21 +1,29 @@
 # Encoding: utf8
 # vim: tw=80 ts=4 sw=4 noet
 # -----------------------------------------------------------------------------
-# Project   : XXX
+# Project   : LambdaFactory
 # -----------------------------------------------------------------------------
 # Author    : Sebastien Pierre                               <sebastien@ffctn.com>
 # License   : Revised BSD License
 # -----------------------------------------------------------------------------
 # Creation  : 14-Aug-2007
-# Last mod  : 14-Aug-2007
+# Last mod  : 19-Oct-2026
 # -----------------------------------------------------------------------------
 
-import interfaces, reporter
-from . import typecast, modeltypes
+from . import interfaces, typecast, modeltypes
+from .passes import Pass
+from collections import deque
+import re
+
+Any     = modeltypes.Any
+Nothing = modeltypes.Nothing
+Number  = modeltypes.Data.Number
+Index   = modeltypes.Data.UnsignedInteger
+String  = modeltypes.Data.String
 
 # ------------------------------------------------------------------------------
 #
-# Typer Class
+# Catalog Class
 #
 # ------------------------------------------------------------------------------
 
@@ -45,219 +53,343 @@ class Catalog(object):
 		if added_to_parents:
 			self.parents.pop()
 
-class Typer(object):
-
-	INTERFACES = (
-
-		"Repetition",
-		"Resolution",
-		"Allocation",
-		"Assignment",
-		"Invocation",
-		"Selection",
-		"Operation",
-
-		"Process",
-		"Context"
-
-	)
-
-	def __init__( self, catalog, reporter=reporter.DefaultReporter ):
-		self.report = reporter
-		self.catalog = catalog
-		self.contexts= []
-
-	# FIXME: Inherit from Pass
-
-	def _filterContext( self, interface ):
-		return [x for x in self.contexts if isinstance(x,interface)]
-
-	def getCurrentClosure( self ):
-		res = self._filterContext(interfaces.IClosure)
-		return res and res[-1] or None
-
-	def getCurrentFunction( self ):
-		res = self._filterContext(interfaces.IFunction)
-		return res and res[-1] or None
-
-	def getCurrentMethod( self ):
-		res = self._filterContext(interfaces.IMethod)
-		return res and res[-1] or None
-
-	def getCurrentClass( self ):
-		res = self._filterContext(interfaces.IClass)
-		return res and res[-1] or None
-
-	def getCurrentDataFlow( self ):
-		i = len(self.contexts) - 1
-		while i >= 0:
-			if self.contexts[i].hasDataFlow():
-				return self.contexts[i].getDataFlow()
-			i -= 1
-		return None
-
-	def inferType( self, element ):
-		"""Infers the type for the given element."""
-		return modeltypes.typeForValue(element)
-
-	def type( self, program ):
-		# FIXME: Should we ensure that the given elemen is an IProgram ?
-		self.phase1(program.getDataFlow())
-		self.phase2(program)
-
-	def _type( self, element ):
-		res = None
-		self.contexts.append(element)
-		# We iterate through the defined interfaces
-		this_interfaces = [(i,getattr(interfaces,"I" + i)) for i in self.INTERFACES]
-		for name, the_interface in this_interfaces:
-			if not isinstance(element, the_interface): continue
-			if not hasattr(self, "type" + name):
-				raise Exception("Typer does not define type method for: %s " %(name))
-			res = getattr(self, "type" + name )(element)
-			break
-		self.contexts.pop()
-		return res
-
-	def phase1(self, dataflow):
-		# Ensures that every element of the dataflow has a basic type
-		# associated to it
-		for slot in dataflow.getSlots():
-			slot.setType(self.inferType(slot.value))
-		for child in dataflow.children:
-			self.phase1(child)
-
-	def phase2(self, element):
-		self._type(element)
-
-	def typeProcess(self, element):
-		for op in element.getOperations():
-			self._type(op)
-
-	def typeContext(self, element):
-		for slot, slot_value in element.getSlots():
-			self._type(slot_value)
+# ------------------------------------------------------------------------------
+#
+# Typer Class
+#
+# ------------------------------------------------------------------------------
 
-	def typeAssignment(self, element):
+class Typer(Pass):
+	"""Infers the abstract types of the slots and expressions of the program
+	and records them with `setAbstractType` (for the dataflow slots) and
+	`setResultAbstractType` (for the expressions), so that the writers can
+	choose specialised code.
+
+	The inference is flow-insensitive: the type of a slot is the union of the
+	types of all the values it is bound to, which is computed by a worklist
+	over the slots until it reaches a fixed point. The inferred types are
+	numbers (`Data.Number`, and `Data.UnsignedInteger` for the non-negative
+	integers), strings (`Data.String`), arrays (`typecast.Array`) and maps
+	(`typecast.Map`). Only the slots allocated in a function and the
+	parameters of iteration closures are typed: arguments, module and class
+	slots, imported slots and the slots referenced by embedded code may be
+	bound to anything. As arrays are mutable, the items of the arrays bound
+	to a slot are only typed when the slot is only read (iterated, indexed,
+	sliced or measured with `length`), as any other use of the slot, like
+	`xs.push(v)`, `f(xs)` or `ys = xs`, may change its items.
+
+	The pass is meant to be run after the standard passes (`-P std,Typer`).
+	A slot that changes more than `MAX_UPDATES` times is given up (typed as
+	`Any`), which bounds the cost of the fixed point."""
+
+	HANDLES = [
+		interfaces.IAllocation,
+		interfaces.IAssignment,
+		interfaces.IIteration,
+		interfaces.IEmbed,
+		interfaces.IReference,
+	]
+	NAME        = "Typer"
+	MAX_UPDATES = 8
+	RE_NAME     = re.compile("[A-Za-z_][A-Za-z_0-9]*")
+
+	def __init__( self ):
+		Pass.__init__(self)
+		self.types     = {}
+		self.writes    = {}
+		self.updates   = {}
+		self.readers   = {}
+		self.embedded  = {}
+		self.escaping  = {}
+		self._slots    = []
+		self._assigned = []
+		self._reader   = None
+		self._resolved = None
+
+	def run( self, program ):
+		"""Walks the program to collect the values bound to the slots, infers
+		the types of the slots and then records the types of the slots and
+		of the expressions."""
+		self.types     = {}
+		self.writes    = {}
+		self.updates   = {}
+		self.readers   = {}
+		self.embedded  = {}
+		self.escaping  = {}
+		self._slots    = []
+		self._assigned = []
+		Pass.run(self, program)
+		# The assignments are bound once all the typed slots are known, as
+		# a closure may assign a slot before it is allocated.
+		for slot, value in self._assigned:
+			if slot in self.types:
+				self.bind(slot, "value", value)
+		self.infer()
+		self.record(program)
+
+	# =========================================================================
+	# COLLECTING
+	# =========================================================================
+
+	def onAllocation( self, element ):
+		slot = self.resolve(element.getSlotName(), element)[0]
+		if slot and slot.isLocal() and isinstance(slot.getOrigin()[0], interfaces.IAllocation) and not self._isShared(slot):
+			# NOTE: A slot without a value is undefined until it is assigned
+			value = element.getDefaultValue()
+			self.bind(slot, "value" if value else None, value)
+
+	def onAssignment( self, element ):
 		target = element.getTarget()
-		value  = element.getAssignedValue()
-		self._type(target)
-		self._type(value)
-		element.setResultAbstractType(value.getAbstractType())
-		# TODO: Constrain the dataflow slot with this operaiont
-
-	def typeAllocation(self, element):
-		target = element.getSlotToAllocate()
-		value  = element.getDefaultValue()
-		# An allocation may not have a default value
-		if value:
-			element.setResultAbstractType(value.getAbstractType())
+		if isinstance(target, interfaces.IReference):
+			slot = self.resolve(target, self._getDataFlow(target))[0]
+			if slot:
+				self._assigned.append((slot, element.getAssignedValue()))
+
+	def onIteration( self, element ):
+		# The parameters of the closures given to iterations are bound to
+		# the items and indexes of the iterated value, and the reductions
+		# are given the accumulated value first.
+		closure = element.getClosure()
+		if isinstance(element, interfaces.IFilterIteration):
+			closure = element.getPredicate()
+		if not isinstance(closure, interfaces.IClosure):
+			return None
+		params = list(closure.getParameters())
+		kinds  = ["item", "index"]
+		if isinstance(element, interfaces.IReduceIteration):
+			kinds.insert(0, None)
+		for i, param in enumerate(params):
+			slot = closure.getDataFlow().resolve(param.getName())[0]
+			if slot:
+				self.bind(slot, kinds[i] if i < len(kinds) and not param.isRest() else None, element)
+
+	def onEmbed( self, element ):
+		# The slots referenced by embedded code may be bound to anything
+		dataflow = self._getDataFlow(element)
+		for name in self.RE_NAME.findall(element.getCode() or ""):
+			slot = self.resolve(name, dataflow)[0]
+			if slot:
+				self.embedded[slot] = True
+
+	def onReference( self, element ):
+		if isinstance(element, interfaces.IOperator) or self._isRead(element):
+			return None
+		slot = self.resolve(element, self._getDataFlow(element))[0]
+		if slot:
+			self.escaping[slot] = True
+
+	def _isRead( self, reference ):
+		"""Tells if the given reference only reads the value of its slot, or
+		is not a use of a slot at all (the name of a resolution or the
+		target of an assignment), so that the items of the array bound to
+		the slot cannot change through it."""
+		parent = reference.parent
+		if isinstance(parent, interfaces.IResolution):
+			return parent.getReference() is reference or parent.getReference().getReferenceName() == "length"
+		elif isinstance(parent, interfaces.IAssignment):
+			return parent.getTarget() is reference
+		elif isinstance(parent, interfaces.IIteration):
+			return parent.getIterator() is reference
+		elif isinstance(parent, interfaces.IAccessOperation):
+			# `xs[i] = v` changes the items of `xs`
+			assignment = parent.parent
+			return parent.getIndex() is reference or not (isinstance(assignment, interfaces.IAssignment) and assignment.getTarget() is parent)
 		else:
-			element.setResultAbstractType(modeltypes.Any)
-		# TODO: Constrain the dataflow slot with this operaiont
-
-	def typeSelection(self, element):
-		for rule in element.getRules():
-			self._type(rule)
-
-	def typeRepetition(self, element):
-		self._type(element.getCondition())
-		self._type(element.getProcess())
-
-	def typeInvocation(self, element):
-		self._type(element.getTarget())
-		# TODO: Constraint the target type with the invocation
-		# FIXME: This is false, it should be the result of the operation resolved
-		# on the target
-		for arg in element.getArguments():
-			self._type(arg)
-		element.setResultAbstractType(element.getTarget().getResultAbstractType())
-
-	def typeResolution(self, element):
-		# TODO: Rewrite this
-		# FIXME: This is too basic and DIRTY !!
-		assert element, "Resolution element is None"
-		dataflow = self.getCurrentDataFlow()
-		context   = element.getContext()
-		reference = element.getReference()
-		# The resolution does not have a context (it can be directly looked up)
-		# in the current scope.
-		if context is None:
-			# A resolution without context means we have to resolve on the
-			# current dataflow
-			if reference.getReferenceName() == "self":
-				current_class = self.getCurrentClass()
-				# FIXME: Maybe we need to get the type for the instance, not
-				# the type for the class
-				element.setResultAbstractType(current_class.getAbstractType())
+			return isinstance(parent, interfaces.ISliceOperation) or isinstance(parent, interfaces.IComputation)
+
+	def bind( self, slot, kind, value ):
+		"""Adds the given value to the values bound to the given slot. The
+		`kind` tells how the type is derived from the value: `value` for an
+		expression, `item` and `index` for the items and indexes of an
+		iterated value, and `None` for an unknown value."""
+		if slot not in self.types:
+			self.types[slot]  = Nothing
+			self.writes[slot] = []
+			self._slots.append(slot)
+		self.writes[slot].append((kind, value))
+
+	def _isShared( self, slot ):
+		"""Tells if the given slot belongs to a module or a class, in which case
+		it can be assigned from other modules."""
+		element = slot.getDataFlow().getElement()
+		return isinstance(element, interfaces.IModule) or isinstance(element, interfaces.IClass) or isinstance(element, interfaces.IProgram)
+
+	# =========================================================================
+	# INFERENCE
+	# =========================================================================
+
+	def infer( self ):
+		"""Updates the types of the slots until they don't change anymore. The
+		slots start as `Nothing` and are only widened, and a slot is updated
+		again only when one of the slots it reads is updated."""
+		for slot in self._slots:
+			if slot in self.embedded:
+				self.writes[slot].append((None, None))
+		queue  = deque(self._slots)
+		queued = dict((_, True) for _ in queue)
+		while queue:
+			slot = queue.popleft()
+			del queued[slot]
+			self._reader = slot
+			res = self.types[slot]
+			for kind, value in self.writes[slot]:
+				res = self.join(res, self.getBoundType(kind, value))
+			self._reader = None
+			if slot in self.escaping and isinstance(res, typecast.Array) and res is not String:
+				res = typecast.intern(typecast.Array(Any))
+			if self.isSame(res, self.types[slot]):
+				continue
+			self.updates[slot] = self.updates.get(slot, 0) + 1
+			if self.updates[slot] > self.MAX_UPDATES:
+				res = Any
+			self.types[slot] = res
+			for reader in self.readers.get(slot, ()):
+				if reader not in queued:
+					queued[reader] = True
+					queue.append(reader)
+
+	def record( self, program ):
+		"""Records the inferred types of the slots and of the expressions."""
+		for slot in self._slots:
+			if self.isKnown(self.types[slot]):
+				slot.setAbstractType(self.types[slot])
+		self._resolved = {}
+		for element in self.getElements(program):
+			if isinstance(element, interfaces.IReference) or isinstance(element, interfaces.IOperation):
+				res = self.getType(element)
+				if self.isKnown(res):
+					element.setResultAbstractType(res)
+		self._resolved = None
+
+	def getBoundType( self, kind, value ):
+		if kind == "value":
+			return self.getType(value)
+		elif kind in ("item", "index"):
+			iterated = self.getType(value.getIterator())
+			if iterated is Nothing:
+				return Nothing
+			elif not isinstance(iterated, typecast.Array) or iterated is String:
+				return Any
 			else:
-				df_slot, context_value = dataflow.resolve(reference.getReferenceName())
-				if not df_slot:
-					return
-				slot_value = df_slot.getValue()
-				# The slot may be empty (resolution fails)
-				if slot_value:
-					slot_value_type = slot_value.getAbstractType()
-					element.setResultAbstractType(resolution_result_type)
-		# The reference has a context that should be resolved first
-		elif isinstance(context, interfaces.IReference):
-			context_name    = context.getReferenceName()
-			reference_name  = reference.getReferenceName()
-			if context_name == "self":
-				current_class = self.getCurrentClass()
-				slot, context_value = current_class.getDataFlow().resolve(reference_name)
-				# FIXME:
-				# The strategy here should be: let the dataflow determine the
-				# slot type. It may be the initial value, or the result of the
-				# constraints.
-				# so: slot_value = slot.getType()
-				if slot:
-					slot_value     = slot.getValue()
-					element.setResultAbstractType(slot_value.getAbstractType())
+				return iterated.content() if kind == "item" else Index
+		else:
+			return Any
+
+	def getSlotType( self, slot ):
+		"""Returns the type of the given slot, registering the slot being
+		inferred as one of its readers."""
+		if slot not in self.types:
+			return Any
+		if self._reader:
+			readers = self.readers.setdefault(slot, [])
+			if self._reader not in readers:
+				readers.append(self._reader)
+		return self.types[slot]
+
+	def getType( self, element ):
+		"""Returns the type of the given expression, given the current types
+		of the slots. `Nothing` means that the type is not known yet, and
+		`Any` that it can't be inferred."""
+		if self._resolved is not None:
+			key = id(element)
+			if key not in self._resolved:
+				self._resolved[key] = self._getType(element)
+			return self._resolved[key]
+		else:
+			return self._getType(element)
+
+	def _getType( self, element ):
+		if isinstance(element, interfaces.INumber):
+			value = element.getActualValue()
+			return Index if isinstance(value, int) and not isinstance(value, bool) and value >= 0 else Number
+		elif isinstance(element, interfaces.IString):
+			return String
+		elif isinstance(element, interfaces.IList):
+			content = Nothing
+			for value in element.getValues():
+				content = self.join(content, self.getType(value))
+			return typecast.intern(typecast.Array(content if self.isKnown(content) else Any))
+		elif isinstance(element, interfaces.IDict):
+			return typecast.intern(typecast.Map())
+		elif isinstance(element, interfaces.IReference):
+			return self.getSlotType(self.resolve(element, self._getDataFlow(element))[0])
+		elif isinstance(element, interfaces.IEnumeration):
+			bounds = [self.getType(_) for _ in (element.getStart(), element.getEnd(), element.getStep()) if _]
+			if Nothing in bounds:
+				return Nothing
+			# The values of enumerations are between their start and end
+			return typecast.intern(typecast.Array(Index if all(_ is Index for _ in bounds) else Number))
+		elif isinstance(element, interfaces.IComputation):
+			return self._getComputationType(element)
+		elif isinstance(element, interfaces.ISliceOperation):
+			res = self.getType(element.getTarget())
+			return res if res is Nothing or res is String or isinstance(res, typecast.Array) else Any
+		elif isinstance(element, interfaces.IResolution):
+			context = element.getContext()
+			if context is None or element.getReference().getReferenceName() != "length":
+				return Any
+			res = self.getType(context)
+			return res if res is Nothing else Index if res is String or isinstance(res, typecast.Array) else Any
+		elif isinstance(element, interfaces.IMapIteration) or isinstance(element, interfaces.IFilterIteration):
+			res = self.getType(element.getIterator())
+			if res is Nothing:
+				return Nothing
+			elif not isinstance(res, typecast.Array) or res is String:
+				return Any
+			elif isinstance(element, interfaces.IFilterIteration) and not element.getClosure():
+				return res
 			else:
-				df_slot, context_value = dataflow.resolve(context.getReferenceName())
-				if not df_slot:
-					return
-				slot_value = df_slot.getValue()
-				if slot_value is None:
-					if not df_slot.getAbstractType(): return
-					element.setResultAbstractType(df_slot.getAbstractType())
-				else:
-					slot_value_type = slot_value.getAbstractType()
-					assert slot_value_type
-					if isinstance(slot_value_type, typecast.Context):
-						resolution_result_type = slot_value_type.element(reference.getReferenceName())
-						element.setResultAbstractType(resolution_result_type)
-					# FIXME: I don't know what this case is for
-					else:
-						pass
-				#df_slot, context_value = slot_value.getDataFlow().resolve(reference.getReferenceName())
-				#slot_value = df_slot.getValue()
-				#element.setResultAbstractType(slot_value.getAbstractType())
-		elif isinstance(context, interfaces.IResolution):
-			self._type(context)
-		 	result_type     = context.getResultAbstractType()
-			resolution_type = None
-			if isinstance(result_type, typecast.Map):
-				resolution_type = result_type.get(reference.getReferenceName())
-				element.setResultAbstractType(resolution_type)
-		# Resolving from an expression. We've got to extract the type of the
-		# expression, see if the resolution can happen (does the type
-		# support resolution ?), and then return the type that results from
-		# the resolution.
+				return typecast.intern(typecast.Array(Any))
 		else:
-			return
-
-	def typeOperation(self, element):
-		for arg in element.getOpArguments():
-			self._type(arg)
+			return Any
+
+	def _getComputationType( self, element ):
+		operator = element.getOperator().getReferenceName()
+		operands = [self.getType(_) for _ in element.getOperands() if _ is not None]
+		if Nothing in operands:
+			return Nothing
+		elif operator == "+" and len(operands) == 2 and operands[0] is String and operands[1] is String:
+			return String
+		elif operator not in ("+", "-", "*", "/", "%") or not all(_ is Number or _ is Index for _ in operands):
+			return Any
+		elif operator in ("+", "*") and all(_ is Index for _ in operands):
+			return Index
+		else:
+			return Number
+
+	# =========================================================================
+	# TYPES
+	# =========================================================================
+
+	def isKnown( self, abstractType ):
+		return abstractType is not Any and abstractType is not Nothing
+
+	def isSame( self, a, b ):
+		# The inferred types are interned, so that the same types are the
+		# same objects.
+		return a is b
+
+	def join( self, a, b ):
+		"""Returns the type of the values that can be of type `a` or `b`."""
+		if a is Nothing or self.isSame(a, b):
+			return b
+		elif b is Nothing:
+			return a
+		elif a is Any or b is Any:
+			return Any
+		elif (a is Index or a is Number) and (b is Index or b is Number):
+			return Number
+		elif isinstance(a, typecast.Array) and isinstance(b, typecast.Array) and a is not String and b is not String:
+			content = self.join(a.content(), b.content())
+			return typecast.intern(typecast.Array(content))
+		else:
+			return Any
 
 def type( element ):
-	catalog = modeltypes.CATALOG = Catalog()
-	typer = Typer(catalog)
-	catalog.make(element.getDataFlow())
-	keys = list(catalog.catalog.keys())
-	keys.sort()
-	typer.type(element)
+	"""Infers and records the types of the given program, which must have
+	its dataflow built."""
+	modeltypes.CATALOG = Catalog()
+	modeltypes.CATALOG.make(element.getDataFlow())
+	Typer().run(element)
 
 # EOF
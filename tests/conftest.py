@@ -0,0 +1,142 @@
+# encoding: utf8
+# -----------------------------------------------------------------------------
+# Project   : LambdaFactory
+# -----------------------------------------------------------------------------
+# Author    : Sebastien Pierre                               <sebastien@ffctn.com>
+# License   : Revised BSD License
+# -----------------------------------------------------------------------------
+# Creation  : 2026-10-19
+# Last mod  : 2026-10-19
+# -----------------------------------------------------------------------------
+
+"""Fixtures for the behaviour tests, which build programs with the factory
+and check the code written for them.
+
+>   python -m pytest tests
+
+The tests run against the compiled sources in `dist`. Those that run the
+written JavaScript are skipped when `node` is not available."""
+
+import os, sys, json, shutil, tempfile, subprocess, importlib
+import pytest
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE, "dist"))
+
+from lambdafactory.main import Command
+
+# Stand-ins for the runtime modules that the written JavaScript requires,
+# implementing the subset of their semantics used by the tests.
+RUNTIME = """
+function each(v,f){
+	if (v instanceof Array) {for (var i=0;i<v.length;i++){f(v[i],i)}}
+	else if (v instanceof Object) {for (var k in v){f(v[k],k)}}
+}
+module.exports = {
+	module:function(n){return {}},
+	__range__:function(a,b){var r=[];for(var i=a;i<b;i++){r.push(i)};return r},
+	__map__:function(v,f){var r=[];each(v,function(x,i){r.push(f(x,i))});return r},
+	__filter__:function(v,f){var r=[];each(v,function(x,i){if(f(x,i)){r.push(x)}});return r},
+	__reduce__:function(v,f,r){var s=r===undefined;each(v,function(x,i){if(s){r=x;s=false}else{var y=f(r,x,i);if(y!==undefined){r=y}}});return r},
+	__iterate__:function(v,f){each(v,f)},
+	__access__:function(t,i){return typeof(i)!='number'?t[i]:i<0&&(typeof(t)=='string'||t instanceof Array)?t[t.length+i]:t[i]},
+};
+"""
+
+RUNTIME_OOP = """
+module.exports = {Class:function(d){
+	var C=function(){if(d.properties){d.properties.call(this)};if(d.initialize){d.initialize.apply(this,arguments)}};
+	for (var k in (d.methods||{})){C.prototype[k]=d.methods[k]}
+	for (var k in (d.operations||{})){C[k]=d.operations[k]}
+	return C;
+}};
+"""
+
+class Build:
+	"""Wraps a `Command` to build a program with the factory, run passes on
+	it and write it."""
+
+	def __init__( self ):
+		self.command     = Command("lambdafactory")
+		self.environment = self.command.environment
+		self.factory     = self.environment.getFactory()
+		self.program     = self.factory.createProgram()
+		self.environment.program = self.program
+
+	def module( self, name ):
+		module = self.factory.createModule(name)
+		module.setSourcePath(name.replace(".", "/") + ".sjs")
+		self.program.addModule(module)
+		return module
+
+	def op( self, operator, *operands ):
+		return self.factory.compute(self.factory._op(operator), *operands)
+
+	def function( self, module, name, params, *operations ):
+		function = self.factory.createFunction(name, [self.factory._param(_) for _ in params])
+		for _ in operations:
+			function.addOperation(_)
+		module.setSlot(name, function)
+		return function
+
+	def closure( self, params, *operations ):
+		return self.factory.createClosure([self.factory._param(_) for _ in params], *operations)
+
+	def write( self, language="javascript", passes=None, passOptions=(), **options ):
+		"""Runs the given passes (the default ones when `None`), with the
+		given `name=value` pass options, and returns the written program."""
+		self.environment.options.update(options)
+		self.command.setupPasses(language, passes, list(passOptions))
+		self.environment.runPasses(self.program)
+		return self.command.writeProgram(self.program, language)
+
+@pytest.fixture
+def build():
+	return Build()
+
+@pytest.fixture
+def workdir():
+	path = tempfile.mkdtemp()
+	yield path
+	shutil.rmtree(path)
+
+@pytest.fixture
+def node( workdir ):
+	"""Returns a function that writes the given `{path:code}` files, along
+	with the runtime stand-ins, and runs the given `main` script with
+	`node`, returning the JSON value it prints last."""
+	if not shutil.which("node"):
+		pytest.skip("node is not available")
+	def run( files, script, main="main.js" ):
+		files = dict(files)
+		files.setdefault("node_modules/runtime.js", RUNTIME)
+		files.setdefault("node_modules/runtime.oop.js", RUNTIME_OOP)
+		files[main] = script
+		for name, code in files.items():
+			path = os.path.join(workdir, name)
+			if not os.path.exists(os.path.dirname(path)):
+				os.makedirs(os.path.dirname(path))
+			with open(path, "w") as f:
+				f.write(code)
+		output = subprocess.check_output(["node", main], cwd=workdir)
+		return json.loads(output.decode("utf8").strip().split("\n")[-1])
+	return run
+
+@pytest.fixture
+def python( workdir ):
+	"""Returns a function that writes the given Python code as a module of
+	the given name, and imports it."""
+	sys.path.insert(0, workdir)
+	modules = []
+	def load( name, code ):
+		with open(os.path.join(workdir, name + ".py"), "w") as f:
+			f.write(code)
+		modules.append(name)
+		importlib.invalidate_caches()
+		return importlib.import_module(name)
+	yield load
+	sys.path.remove(workdir)
+	for _ in modules:
+		sys.modules.pop(_, None)
+
+# EOF - vim: ts=4 sw=4 noet
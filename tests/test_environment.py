@@ -0,0 +1,52 @@
+# encoding: utf8
+# -----------------------------------------------------------------------------
+# Project   : LambdaFactory
+# -----------------------------------------------------------------------------
+# Author    : Sebastien Pierre                               <sebastien@ffctn.com>
+# License   : Revised BSD License
+# -----------------------------------------------------------------------------
+# Creation  : 2026-10-19
+# Last mod  : 2026-10-19
+# -----------------------------------------------------------------------------
+
+"""Tests the graph of the imports between the modules of a program, and the
+order in which the modules are written."""
+
+def modules( build, imports ):
+	"""Adds a module for each `(name, imported)` of the given list, in order,
+	where each module imports the given modules."""
+	F = build.factory
+	for name, imported in imports:
+		module = build.module(name)
+		for _ in imported:
+			module.addImportOperation(F.importModule(_, None))
+		build.function(module, "f", [], F.returns(F._number(1)))
+
+def names( modules ):
+	return [_.getName() for _ in modules]
+
+def test_imported_modules_come_first( build ):
+	modules(build, [("c", ["b"]), ("b", ["a"]), ("a", [])])
+	graph = build.environment.getModuleGraph(build.program)
+	assert names(graph.getOrder()) == ["a", "b", "c"]
+	assert graph.getCycles() == []
+	writer = build.command.getWriter("javascript")
+	assert names(writer.getWrittenModules(build.program)) == ["a", "b", "c"]
+	text = build.write("javascript")
+	assert [_.split("|")[-1].split("]")[0] for _ in text.split("\n") if "8< ---[" in _] == ["a", "b", "c"]
+
+def test_import_cycles_are_reported( build ):
+	modules(build, [("a", ["c"]), ("b", []), ("c", ["a"])])
+	graph = build.environment.getModuleGraph(build.program)
+	assert graph.getCycles() == [["a", "c", "a"]]
+	assert [names(_) for _ in graph.getComponents()] == [["a", "c"], ["b"]]
+	build.command.transformProgram(build.program)
+	assert "Import cycle between modules: a -> c -> a" in build.environment.report.warnings
+
+def test_modules_outside_cycles_keep_program_order( build ):
+	modules(build, [("x", []), ("a", ["b"]), ("b", ["a"]), ("z", []), ("y", [])])
+	graph = build.environment.getModuleGraph(build.program)
+	assert names(graph.getOrder()) == ["x", "a", "b", "z", "y"]
+	assert graph.getCycles() == [["a", "b", "a"]]
+
+# EOF - vim: ts=4 sw=4 noet
@@ -0,0 +1,158 @@
+# encoding: utf8
+# -----------------------------------------------------------------------------
+# Project   : LambdaFactory
+# -----------------------------------------------------------------------------
+# Author    : Sebastien Pierre                               <sebastien@ffctn.com>
+# License   : Revised BSD License
+# -----------------------------------------------------------------------------
+# Creation  : 2026-10-19
+# Last mod  : 2026-10-19
+# -----------------------------------------------------------------------------
+
+"""Tests the output options of the JavaScript writer, running the written
+code with `node`."""
+
+import os, json
+from conftest import RUNTIME, RUNTIME_OOP
+from lambdafactory.languages.javascript import writer
+from lambdafactory.splitter import FileSplitter
+from lambdafactory import interfaces
+
+def split( text ):
+	"""Returns the `{module:code}` files of the given written program."""
+	files = {}
+	for line in text.split("\n"):
+		if "8< ---[" in line:
+			name = line.split("|")[-1].split("]---")[0]
+			files[name] = []
+		else:
+			files[name].append(line)
+	return dict((k, "\n".join(v)) for k, v in files.items())
+
+def packages( modules, type="module" ):
+	"""Returns the files of the node packages for the given `{name:code}`
+	modules and the runtime stand-ins, as imported by ES modules."""
+	files = {}
+	for name, code in list(modules.items()) + [("runtime", RUNTIME), ("runtime.oop", RUNTIME_OOP)]:
+		files["node_modules/%s/package.json" % (name)] = json.dumps({"type":type if name in modules else "commonjs", "main":"index.js"})
+		files["node_modules/%s/index.js" % (name)] = code
+	return files
+
+def test_esm_imports_within_functions( build, node ):
+	F     = build.factory
+	other = build.module("other")
+	build.function(other, "add", ["a", "b"], F.returns(build.op("+", F._ref("a"), F._ref("b"))))
+	other.setSlot("K", F._moduleattr("K", None, F._number(10)))
+	calc  = build.module("calc")
+	build.function(calc, "h", [], F.importSymbol("add", "other", None), F.returns(F.invoke(F._ref("add"), F._number(1), F._number(2))))
+	build.function(calc, "k", [], F.importModule("other", "o"), F.returns(F.resolve(F._ref("K"), F._ref("o"))))
+	build.function(calc, "l", [], F.importModule("other", None), F.returns(F.resolve(F._ref("K"), F._ref("other"))))
+	text = build.write("javascript", esm=True)
+	assert "import(" not in text
+	script = "import * as calc from 'calc';\nconsole.log(JSON.stringify([calc.h(), calc.k(), calc.l()]))"
+	assert node(packages(split(text)), script, "main.mjs") == [3, 10, 10]
+
+def test_native_iterations_bind_like_runtime( build, node ):
+	F     = build.factory
+	loops = build.module("loops")
+	items = lambda: F._list(F._number(1), F._number(2), F._number(3))
+	build.function(loops, "mapped", [], F.returns(F.map(items(), build.closure(["x"], F.returns(build.op("*", F._ref("x"), F._number(2)))))))
+	build.function(loops, "filtered", [], F.returns(F.filter(items(), build.closure(["x"], F.returns(build.op(">", F._ref("x"), F._number(1)))))))
+	build.function(loops, "summed", [], F.returns(F.reduce(items(), build.closure(["a", "x"], F.returns(build.op("+", F._ref("a"), F._ref("x")))))))
+	# The accumulator is kept when the expression is undefined
+	build.function(loops, "kept", [], F.returns(F.reduce(items(), build.closure(["a", "x", "i", "z"], F.returns(F._ref("z"))), F._number(5))))
+	# The parameters that are not bound are undefined for every item
+	build.function(loops, "reset", [], F.allocate(F._slot("out"), F._list()),
+		F.evaluate(F.iterate(items(), build.closure(["x", "i", "z"],
+			F.invoke(F.resolve(F._ref("push"), F._ref("out")), F._ref("z")),
+			F.assign("z", F._ref("x"))
+		))),
+		F.returns(F._ref("out"))
+	)
+	text = build.write("javascript", umd=True)
+	assert "__map__" not in text and "__reduce__" not in text and "=>" not in text
+	script = "const l=require('loops');console.log(JSON.stringify([l.mapped(), l.filtered(), l.summed(), l.kept(), l.reset()]))"
+	assert node({"node_modules/loops.js":split(text)["loops"]}, script) == [[2, 4, 6], [2, 3], 6, 5, [None, None, None]]
+
+def test_enumerations_iterated_with_functions( build, node ):
+	F     = build.factory
+	loops = build.module("loops")
+	loops.setSlot("seen", F._moduleattr("seen", None, F._list()))
+	build.function(loops, "show", ["v", "i", "l"], F.invoke(F.resolve(F._ref("push"), F._ref("seen")), F._list(F._ref("v"), F._ref("i"), F._ref("l"))))
+	# The bound is a local that the typer knows to be an index
+	build.function(loops, "run", [], F.allocate(F._slot("n"), F._number(2)),
+		F.iterate(F.enumerate(F._number(0), F._ref("n")), F._ref("show")),
+		F.returns(F._ref("seen"))
+	)
+	text = build.write("javascript", ["std", "Typer"], umd=True)
+	script = "console.log(JSON.stringify(require('loops').run()))"
+	assert node({"node_modules/loops.js":split(text)["loops"]}, script) == [[0, 0, [0, 1]], [1, 1, [0, 1]]]
+
+def handler( build ):
+	"""Builds a `methods` module with a `Handler` class whose `callback`
+	method returns its `handle` method."""
+	F       = build.factory
+	methods = build.module("methods")
+	c       = F.createClass("Handler")
+	handle  = F.createMethod("handle", [F._param("x")])
+	handle.addOperation(F.returns(F._ref("x")))
+	c.setSlot("handle", handle)
+	callback = F.createMethod("callback", [])
+	callback.addOperation(F.returns(F._ref("handle")))
+	c.setSlot("callback", callback)
+	methods.setSlot("Handler", c)
+	return methods
+
+def test_bound_methods_not_cached_by_default( build ):
+	handler(build)
+	text = build.write("javascript", umd=True)
+	assert "__bound" not in text and ".handle.bind(" in text
+
+def test_bound_methods_cached_when_enabled( build, node, monkeypatch ):
+	monkeypatch.setitem(writer.OPTIONS, "CACHE_METHODS", True)
+	handler(build)
+	text = build.write("javascript", umd=True)
+	assert "__bound(" in text
+	script = "const m=require('methods');const o=new m.Handler();console.log(JSON.stringify([o.callback()===o.callback(), o.callback()(1)]))"
+	assert node({"node_modules/methods.js":split(text)["methods"]}, script) == [True, 1]
+
+def bundled( build ):
+	"""Builds an `app` module with a `SIZE` attribute and an `other` module
+	that imports it."""
+	F   = build.factory
+	app = build.module("app")
+	app.setSlot("SIZE", F._moduleattr("SIZE", None, F._number(3)))
+	build.function(app, "size", [], F.returns(F.resolve(F._ref("SIZE"), F._ref("app"))))
+	other = build.module("other")
+	other.addImportOperation(F.importModule("app", None))
+	build.function(other, "twice", [], F.returns(build.op("*", F.invoke(F.resolve(F._ref("size"), F._ref("app"))), F._number(2))))
+	return app, other
+
+def test_bundle_is_a_single_file( build, node, workdir ):
+	bundled(build)
+	text = build.write("javascript", bundle=True)
+	# The module's own qualified references use the bundle's variables too
+	assert "app.SIZE" not in text and "return app$SIZE" in text
+	FileSplitter(workdir).fromString(text)
+	assert os.listdir(workdir) == ["bundle.js"]
+	script = "global.window=global;require('./bundle.js');app.SIZE=5;console.log(JSON.stringify([app.size(), other.twice()]))"
+	assert node({}, script) == [5, 10]
+
+def test_lazy_bundle_declares_helper_once( build, node ):
+	F          = build.factory
+	app, other = bundled(build)
+	build.function(app, interfaces.Constants.ModuleInit, [], F.assign(F._ref("SIZE"), F._number(4)))
+	build.function(other, interfaces.Constants.ModuleInit, [], F.assign(F._ref("inits"), build.op("+", F._ref("inits"), F._number(1))))
+	text = build.write("javascript", bundle=True, lazy=True)
+	assert text.count("function __lazy(") == 1
+	script = "global.window=global;global.inits=0;require('./bundle.js');const before=inits;console.log(JSON.stringify([before, other.twice(), app.size(), inits]))"
+	assert node({"bundle.js":text}, script) == [0, 8, 4, 1]
+
+def test_lazy_modules_declare_helper( build ):
+	F          = build.factory
+	app, other = bundled(build)
+	build.function(app, interfaces.Constants.ModuleInit, [], F.assign(F._ref("SIZE"), F._number(4)))
+	files = split(build.write("javascript", umd=True, lazy=True))
+	assert [files[_].count("function __lazy(") for _ in ("app", "other")] == [1, 1]
+
+# EOF - vim: ts=4 sw=4 noet
@@ -0,0 +1,56 @@
+# encoding: utf8
+# -----------------------------------------------------------------------------
+# Project   : LambdaFactory
+# -----------------------------------------------------------------------------
+# Author    : Sebastien Pierre                               <sebastien@ffctn.com>
+# License   : Revised BSD License
+# -----------------------------------------------------------------------------
+# Creation  : 2026-10-19
+# Last mod  : 2026-10-19
+# -----------------------------------------------------------------------------
+
+"""Tests the program model built by the factory."""
+
+from lambdafactory import model
+
+def test_elements_have_no_dict( build ):
+	F = build.factory
+	for element in (F.createModule("m"), F.createFunction("f", [F._param("a")]), F._number(1), F._ref("a")):
+		assert not hasattr(element, "__dict__")
+
+def test_source_locations_are_shared( build ):
+	F = build.factory
+	a, b = F._number(1), F._number(2)
+	assert a.sourceLocation is model.NO_LOCATION
+	assert b.sourceLocation is model.NO_LOCATION
+
+def test_annotations_keep_insertion_order( build ):
+	F = build.factory
+	f = F.createFunction("f", [])
+	for name, content in (("a", 1), ("b", 2), ("a", 3), ("c", 4)):
+		f.addAnnotation(F.annotation(name, content))
+	assert [(_.getName(), _.getContent()) for _ in f.getAnnotations()] == [("a", 1), ("b", 2), ("a", 3), ("c", 4)]
+	assert [_.getContent() for _ in f.getAnnotations("a")] == [1, 3]
+	assert f.getAnnotation("a").getContent() == 1
+	assert f.hasAnnotation("b") and not f.hasAnnotation("d")
+	f.removeAnnotation("a")
+	assert [_.getName() for _ in f.getAnnotations()] == ["b", "c"]
+	assert not f.hasAnnotation("a") and f.getAnnotation("a") is None
+
+def test_copies_keep_annotations_order( build ):
+	F = build.factory
+	e = F.compute(F._op("+"), F._ref("a"), F._ref("b"))
+	for name in ("b", "a", "b"):
+		e.addAnnotation(F.annotation(name))
+	assert [_.getName() for _ in e.copy().getAnnotations()] == ["b", "a", "b"]
+
+def test_merged_modules_keep_annotations_order( build ):
+	F = build.factory
+	a, b = F.createModule("a"), F.createModule("b")
+	a.addAnnotation(F.annotation("x", 1))
+	b.addAnnotation(F.annotation("y", 2))
+	b.addAnnotation(F.annotation("x", 3))
+	a.mergeWith(b)
+	assert [(_.getName(), _.getContent()) for _ in a.getAnnotations()] == [("x", 1), ("y", 2), ("x", 3)]
+
+# EOF - vim: ts=4 sw=4 noet
@@ -0,0 +1,165 @@
+# encoding: utf8
+# -----------------------------------------------------------------------------
+# Project   : LambdaFactory
+# -----------------------------------------------------------------------------
+# Author    : Sebastien Pierre                               <sebastien@ffctn.com>
+# License   : Revised BSD License
+# -----------------------------------------------------------------------------
+# Creation  : 2026-10-19
+# Last mod  : 2026-10-19
+# -----------------------------------------------------------------------------
+
+"""Tests the optimization passes, running the code written for the
+optimized programs with Python."""
+
+import os
+import pytest
+
+def test_folding_keeps_literal_predicates( build, python ):
+	F    = build.factory
+	m    = build.module("folded")
+	rule = lambda predicate, value: F.matchProcess(predicate, F.createBlock(F.returns(value)))
+	build.function(m, "f", ["x"], F.select(
+		rule(F._ref("x"), F._number(1)),
+		rule(F._number(1), F._number(2)),
+		rule(F._ref("x"), F._number(3)),
+	))
+	text = build.write("python", ["std", "ConstantFolding"])
+	assert "elif 1:" in text and "elif True:" not in text
+	assert python("folded", text).f(0) == 2
+
+def test_splitting_writes_live_code_per_chunk( build, python, workdir ):
+	F      = build.factory
+	common = build.module("common")
+	build.function(common, "f", ["x"], F.returns(F._ref("x")))
+	build.function(common, "g", ["x"], F.returns(F._number(0)))
+	for name in ("a", "b"):
+		m = build.module(name)
+		m.addImportOperation(F.importModule("common", None))
+		build.function(m, "main", [], F.returns(F.invoke(F.resolve(F._ref("f"), F._ref("common")), F._number(1))))
+	entries = os.path.join(workdir, "entries")
+	with open(entries, "w") as f:
+		f.write("a.main\nb.main\n")
+	build.write("python", ["std", "CodeSplitting", "RemoveDeadCode"], ["entryPoints=" + entries])
+	manifest = build.command.splitProgram(build.program, "python", workdir)
+	assert manifest["entries"] == {"a.main":["shared0", "a.main"], "b.main":["shared0", "b.main"]}
+	chunks = {}
+	for name in manifest["chunks"]:
+		with open(os.path.join(workdir, manifest["chunks"][name]["path"])) as f:
+			chunks[name] = f.read()
+	# Each chunk only has its own modules, without the unreachable slots
+	assert "def f" in chunks["shared0"] and "def g" not in chunks["shared0"]
+	assert "def main" not in chunks["shared0"] and "def f" not in chunks["a.main"]
+	assert python("common", chunks["shared0"]).f(2) == 2
+
+def test_splitting_without_entry_points_writes_modules( build, workdir ):
+	F = build.factory
+	for name in ("a", "b"):
+		build.function(build.module(name), "main", [], F.returns(F._number(1)))
+	build.write("python", ["std", "CodeSplitting"])
+	assert build.command.splitProgram(build.program, "python", workdir) is None
+	assert [_ for _ in build.environment.report.warnings if "No entry point" in _]
+	assert sorted(_ for _ in os.listdir(workdir) if _.endswith(".py")) == ["a.py", "b.py"]
+	with open(os.path.join(workdir, "a.py")) as f:
+		assert "def main" in f.read()
+
+def test_hoisting_keeps_loops_that_do_not_run( build, python ):
+	F   = build.factory
+	m   = build.module("hoisted")
+	chain = lambda *names: F.resolve(F._ref(names[-1]), chain(*names[:-1])) if len(names) > 1 else F._ref(names[0])
+	add   = lambda value: F.assign(F._ref("t"), build.op("+", F._ref("t"), value))
+	build.function(m, "f", ["p", "xs"], F.allocate(F._slot("t"), F._number(0)),
+		F.iterate(F._ref("xs"), build.closure(["x"], add(chain("p", "a", "b")))),
+		F.returns(F._ref("t"))
+	)
+	# The condition of a repetition is evaluated at least once
+	build.function(m, "g", ["p", "n"], F.allocate(F._slot("t"), F._number(0)),
+		F.repeat(build.op("<", F._ref("t"), chain("p", "a", "b")), F.createBlock(add(F._ref("n")))),
+		F.returns(F._ref("t"))
+	)
+	text = build.write("python", ["std", "HoistLoopInvariants"])
+	assert "_invariant_0=p.a.b" in text and text.count("_invariant_") == 2
+	module = python("hoisted", text)
+	class P: pass
+	p, p.a, p.a.b = P(), P(), 2
+	assert [module.f(None, []), module.f(p, [1, 2]), module.g(p, 1)] == [0, 4, 2]
+
+def test_inlining_keeps_the_evaluation_of_arguments( build, python ):
+	F   = build.factory
+	m   = build.module("inlined")
+	ref = F._ref
+	build.function(m, "add",   ["a", "b"], F.returns(build.op("+", ref("a"), ref("b"))))
+	build.function(m, "neg",   ["a"], F.returns(build.op("-", F._number(0), ref("a"))))
+	build.function(m, "twice", ["a"], F.returns(build.op("*", ref("a"), ref("a"))))
+	build.function(m, "loop",  ["k"], F.returns(F.invoke(ref("loop"), ref("k"))))
+	build.function(m, "zero",  ["a"], F.returns(F._number(0)))
+	build.function(m, "useAdd",    ["x", "y"], F.returns(build.op("*", F.invoke(ref("add"), ref("x"), ref("y")), F._number(2))))
+	build.function(m, "useNeg",    ["x"], F.returns(F.invoke(ref("neg"), build.op("+", ref("x"), F._number(1)))))
+	build.function(m, "useTwice",  ["x"], F.returns(F.invoke(ref("twice"), build.op("+", ref("x"), F._number(1)))))
+	build.function(m, "useNested", ["x"], F.returns(F.invoke(ref("add"), F.invoke(ref("add"), ref("x"), F._number(1)), F._number(2))))
+	build.function(m, "useLoop",   ["x"], F.returns(F.invoke(ref("loop"), ref("x"))))
+	build.function(m, "useZero",   ["x"], F.returns(F.invoke(ref("zero"), build.op("/", ref("x"), F._number(0)))))
+	text = build.write("python", ["std", "Inlining"])
+	assert "return ((x + y) * 2)" in text and "return (0 - (x + 1))" in text
+	assert "return ((x + 1) + 2)" in text
+	# Arguments used more than once or not at all (as they may raise errors)
+	# and recursive functions are not inlined
+	assert "return twice((x + 1))" in text and "return loop(x)" in text
+	assert "return zero((x / 0))" in text
+	module = python("inlined", text)
+	assert [module.useAdd(1, 2), module.useNeg(1), module.useTwice(2), module.useNested(1)] == [6, -2, 9, 4]
+	with pytest.raises(ZeroDivisionError):
+		module.useZero(1)
+
+def test_inlining_replaces_accessors_in_methods( build ):
+	F   = build.factory
+	m   = build.module("boxes")
+	box = F.createClass("Box")
+	box.setSlot("_v", F._attr("_v", None, F._number(5)))
+	get = F.createAccessor("v", [])
+	get.addOperation(F.returns(F.resolve(F._ref("_v"), F._ref("self"))))
+	box.setAccessor("v", get)
+	get.setParent(box)
+	method = F.createMethod("get", [])
+	method.addOperation(F.returns(F.resolve(F._ref("v"), F._ref("self"))))
+	box.setSlot("get", method)
+	m.setSlot("Box", box)
+	text = build.write("python", ["std", "Inlining"])
+	assert "return self._v" in text and "return self.v" not in text
+
+def test_tail_calls_run_in_constant_stack( build, python ):
+	F   = build.factory
+	m   = build.module("tails")
+	ref = F._ref
+	acc = F._param("acc")
+	acc.setDefaultValue(F._number(1))
+	fact = F.createFunction("fact", [F._param("k"), acc])
+	fact.addOperation(F.select(
+		F.rule(build.op("<=", ref("k"), F._number(1)), F.createBlock(F.returns(ref("acc")))),
+		F.rule(ref("True"), F.createBlock(F.returns(F.invoke(ref("fact"), build.op("-", ref("k"), F._number(1)), build.op("*", ref("acc"), ref("k"))))))
+	))
+	m.setSlot("fact", fact)
+	# The parameters are assigned at once, as each depends on the other
+	build.function(m, "gcd", ["a", "b"],
+		F.select(F.rule(build.op("==", ref("b"), F._number(0)), F.createBlock(F.returns(ref("a"))))),
+		F.returns(F.invoke(ref("gcd"), ref("b"), build.op("%", ref("a"), ref("b"))))
+	)
+	build.function(m, "count", ["k"],
+		F.select(F.rule(build.op("==", ref("k"), F._number(0)), F.createBlock(F.returns(F._number(0))))),
+		F.returns(build.op("+", F._number(1), F.invoke(ref("count"), build.op("-", ref("k"), F._number(1)))))
+	)
+	walker = F.createClass("Walker")
+	walk   = F.createMethod("walk", [F._param("k"), F._param("t")])
+	walk.addOperation(F.select(F.rule(build.op("==", ref("k"), F._number(0)), F.createBlock(F.returns(ref("t"))))))
+	walk.addOperation(F.returns(F.invoke(F.resolve(ref("walk"), ref("self")), build.op("-", ref("k"), F._number(1)), build.op("+", ref("t"), ref("k")))))
+	walker.setSlot("walk", walk)
+	m.setSlot("Walker", walker)
+	text = build.write("python", ["std", "RemoveTailRecursion"])
+	# Calls that are not in tail position are left as they are
+	assert text.count("while True:") == 3 and "return (1 + count((k - 1)))" in text
+	module = python("tails", text)
+	assert module.fact(5) == 120 and module.gcd(84, 36) == 12
+	assert module.Walker().walk(5000, 0) == 5000 * 5001 // 2
+	assert module.fact(3000) % 10 ** 100 == 0
+
+# EOF - vim: ts=4 sw=4 noet
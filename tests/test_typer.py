@@ -0,0 +1,49 @@
+# encoding: utf8
+# -----------------------------------------------------------------------------
+# Project   : LambdaFactory
+# -----------------------------------------------------------------------------
+# Author    : Sebastien Pierre                               <sebastien@ffctn.com>
+# License   : Revised BSD License
+# -----------------------------------------------------------------------------
+# Creation  : 2026-10-19
+# Last mod  : 2026-10-19
+# -----------------------------------------------------------------------------
+
+"""Tests the types inferred by the `Typer` pass, and the code that the
+JavaScript writer chooses for them."""
+
+from test_javascript import split
+
+def pick( build, name, *operations ):
+	"""Adds a function that gives the `values` at the `offsets`, which are
+	bound to a list literal and then changed by the given operations."""
+	F = build.factory
+	return build.function(build.module(name), "pick", ["values"],
+		F.allocate(F._slot("offsets"), F._list(F._number(0), F._number(1))),
+		*(list(operations) + [
+			F.allocate(F._slot("r"), F._list()),
+			F.iterate(F._ref("offsets"), build.closure(["o"], F.invoke(F.resolve(F._ref("push"), F._ref("r")), F.access(F._ref("values"), F._ref("o"))))),
+			F.returns(F._ref("r")),
+		])
+	)
+
+def test_items_of_read_arrays_are_typed( build ):
+	pick(build, "typed")
+	text = build.write("javascript", ["std", "Typer"], umd=True)
+	assert "values[o]" in text and "__access__" not in text
+
+def test_items_of_changed_arrays_are_not_typed( build, node ):
+	F = build.factory
+	pick(build, "typed", F.invoke(F.resolve(F._ref("push"), F._ref("offsets")), F._number(-1)))
+	text = build.write("javascript", ["std", "Typer"], umd=True)
+	assert "runtime.__access__(values,o)" in text
+	script = "console.log(JSON.stringify(require('typed').pick([10, 20, 30])))"
+	assert node({"node_modules/typed.js":split(text)["typed"]}, script) == [10, 20, 30]
+
+def test_items_of_aliased_arrays_are_not_typed( build ):
+	F = build.factory
+	pick(build, "typed", F.allocate(F._slot("other"), F._ref("offsets")))
+	text = build.write("javascript", ["std", "Typer"], umd=True)
+	assert "runtime.__access__(values,o)" in text
+
+# EOF - vim: ts=4 sw=4 noet
@@ -0,0 +1,63 @@
+# encoding: utf8
+# -----------------------------------------------------------------------------
+# Project   : LambdaFactory
+# -----------------------------------------------------------------------------
+# Author    : Sebastien Pierre                               <sebastien@ffctn.com>
+# License   : Revised BSD License
+# -----------------------------------------------------------------------------
+# Creation  : 2026-10-19
+# Last mod  : 2026-10-19
+# -----------------------------------------------------------------------------
+
+"""Tests the interning of `typecast` types and the types that
+`modeltypes.typeForValue` gives to program elements."""
+
+from lambdafactory import typecast, modeltypes
+from lambdafactory.modeltypes import Behaviour, Data, Any, typeForValue
+
+def test_behaviours_are_distinct():
+	assert Behaviour.Closure is not Behaviour.Function
+	assert Behaviour.Function is not Behaviour.Method
+	assert Behaviour.Method.isSubtypeOf(Behaviour.Function)
+	assert Behaviour.Function.isSubtypeOf(Behaviour.Closure)
+	assert Behaviour.Method.isSubtypeOf(Behaviour.Closure)
+
+def test_structural_types_are_interned():
+	a = typecast.intern(typecast.Array(typecast.Array(Data.Number)))
+	b = typecast.intern(typecast.Array(typecast.Array(Data.Number)))
+	assert a is b
+	assert typecast.intern(typecast.Array(Data.Char)) is not a
+
+def test_types_with_a_concrete_type_are_not_interned():
+	a = typecast.Process(Data.Number, Any)
+	b = typecast.Process(Data.Number, Any)
+	a.setConcreteType(object())
+	assert typecast.intern(a) is a
+	assert typecast.intern(b) is not a
+
+def test_closures_are_typed_with_their_behaviour( build ):
+	F      = build.factory
+	module = build.module("app")
+	f      = build.function(module, "f", ["a", "b"], F.returns(F._ref("a")))
+	g      = build.function(module, "g", ["a", "b"], F.returns(F._ref("b")))
+	c      = F.createClass("C")
+	m      = F.createMethod("m", [F._param("a")])
+	c.setSlot("m", m)
+	module.setSlot("C", c)
+	closure = build.closure(["a"], F.returns(F._ref("a")))
+	tf, tg, tm, tc = [typeForValue(_) for _ in (f, g, m, closure)]
+	assert tf.concreteType() is f
+	assert tm.concreteType() is m
+	assert tf is not tg
+	assert tf.isSubtypeOf(Behaviour.Function) and not tf.isSubtypeOf(Behaviour.Method)
+	assert tm.isSubtypeOf(Behaviour.Method) and tm.isSubtypeOf(Behaviour.Function)
+	assert tc.isSubtypeOf(Behaviour.Closure) and not tc.isSubtypeOf(Behaviour.Function)
+	assert typeForValue(module).get("f") is tf
+
+def test_data_values_share_their_type( build ):
+	F = build.factory
+	assert typeForValue(F._list()) is typeForValue(F._list(F._number(1)))
+	assert typeForValue(F._string("a")) is typeForValue(F._string("b")) is Data.String
+	assert typeForValue(F._number(1)) is Data.Number
+
+# EOF - vim: ts=4 sw=4 noet
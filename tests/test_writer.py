@@ -0,0 +1,72 @@
+# encoding: utf8
+# -----------------------------------------------------------------------------
+# Project   : LambdaFactory
+# -----------------------------------------------------------------------------
+# Author    : Sebastien Pierre                               <sebastien@ffctn.com>
+# License   : Revised BSD License
+# -----------------------------------------------------------------------------
+# Creation  : 2026-10-19
+# Last mod  : 2026-10-19
+# -----------------------------------------------------------------------------
+
+"""Tests the writers' streaming and parallel output."""
+
+import multiprocessing
+import pytest
+
+def modules( build, count ):
+	F = build.factory
+	for i in range(count):
+		module = build.module("m%d" % (i))
+		build.function(module, "f", ["a"], F.returns(build.op("+", F._ref("a"), F._number(i))))
+		build.function(module, "g", [], F.embed("cobol", "DISPLAY %d" % (i)))
+
+def test_stream_joins_like_run( build ):
+	modules(build, 3)
+	text = build.write("javascript")
+	assert "\n".join(build.command.streamProgram(build.program, "javascript")) == text
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="requires fork")
+def test_parallel_reports_worker_errors( build ):
+	modules(build, 3)
+	serial = build.write("javascript")
+	report = build.environment.report
+	errors = len(report.errors)
+	text   = build.command.writeProgram(build.program, "javascript", processes=2)
+	assert text == serial
+	assert [_ for _ in report.errors[errors:] if "cobol" in _] == [("JavaScript writer cannot embed language:", "cobol")] * 3
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="requires fork")
+def test_parallel_gives_the_same_variables( build ):
+	F = build.factory
+	for i in range(3):
+		module = build.module("loops%d" % (i))
+		build.function(module, "f", ["xs"], F.allocate(F._slot("t"), F._number(0)),
+			F.iterate(F._ref("xs"), build.closure(["x", "i"], F.assign(F._ref("t"), F._ref("x")))),
+			F.returns(F._ref("t"))
+		)
+	serial = build.write("javascript")
+	# Each module generates the same variables as the first one
+	assert serial.count("var __i=xs;") == 3
+	assert "\n".join(build.command.streamProgram(build.program, "javascript", processes=0)) == serial
+	assert build.command.writeProgram(build.program, "javascript", processes=2) == serial
+
+def test_minify_keeps_embedded_code( build, node ):
+	F      = build.factory
+	module = build.module("m")
+	code   = "var t = `a\n\t// b\n\t\tc`;\n// comment\nreturn t"
+	build.function(module, "f", [], F.embed("javascript", code))
+	text = build.write("javascript", minify=True, umd=True)
+	assert code in text
+	assert "\n\n" not in text
+	assert node({"node_modules/m.js":text}, "console.log(JSON.stringify(require('m').f()))") == "a\n\t// b\n\t\tc"
+
+def test_minify_keeps_snip_lines( build ):
+	F = build.factory
+	for name in ("a", "b"):
+		build.function(build.module(name), "f", [], F.returns(F._number(1)))
+	text  = build.write("javascript", minify=True)
+	snips = [_ for _ in text.split("\n") if "8< ---[" in _]
+	assert len(snips) == 2 and all(_.startswith("// 8< ---[") for _ in snips)
+
+# EOF - vim: ts=4 sw=4 noet